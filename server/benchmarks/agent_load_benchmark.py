@@ -0,0 +1,109 @@
+"""
+Time-to-all-agents-ready benchmark for MultiAgentManager.
+
+Builds N copies of an agent definition (unique names) and measures, in a
+fresh interpreter per run, how long it takes until every agent and its
+ConnectionManager is constructed:
+
+    sequential  one ZerePyAgent.from_dict after another
+    parallel    MultiAgentManager.load_agents (constructs on the shared executor)
+
+The template's example_accounts are dropped so no run depends on Twitter.
+
+Usage (from the server directory):
+    python benchmarks/agent_load_benchmark.py                       # 10, 100 and 1000 agents
+    python benchmarks/agent_load_benchmark.py --counts 10 100 --template general
+    python benchmarks/agent_load_benchmark.py --output load.json
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+SERVER_DIR = Path(__file__).resolve().parent.parent
+
+# Executed in the child interpreter; prints one JSON line with the measurements
+CHILD_SCRIPT = r"""
+import json, logging, resource, sys, time
+logging.disable(logging.CRITICAL)
+from src.agent import ZerePyAgent
+from src.multi_agent_manager import MultiAgentManager
+
+template, count, mode = json.loads(sys.argv[1]), int(sys.argv[2]), sys.argv[3]
+agents = [dict(template, name=f"{template['name']}_{i}") for i in range(count)]
+
+start = time.perf_counter()
+if mode == "parallel":
+    loaded = MultiAgentManager().load_agents(agents)
+else:
+    loaded = [ZerePyAgent.from_dict(agent).name for agent in agents]
+ready = time.perf_counter()
+
+print(json.dumps({
+    "agents": len(loaded),
+    "ready_s": ready - start,
+    "per_agent_ms": (ready - start) / max(len(loaded), 1) * 1000,
+    "max_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+}))
+"""
+
+
+def load_template(name):
+    with open(SERVER_DIR / "agents" / f"{name}.json", "r") as f:
+        data = json.load(f)
+    template = data["agents"][0] if "agents" in data else data
+    template["example_accounts"] = []
+    return template
+
+
+def run_once(template, count, mode):
+    result = subprocess.run(
+        [sys.executable, "-c", CHILD_SCRIPT, json.dumps(template), str(count), mode],
+        cwd=SERVER_DIR,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1] if result.stderr else "unknown error")
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure time until N agents are constructed")
+    parser.add_argument("--counts", type=int, nargs="+", default=[10, 100, 1000], help="Agent counts to measure")
+    parser.add_argument("--template", default="example", help="Agent config (single or multi-agent file) to copy")
+    parser.add_argument("--modes", nargs="+", default=["sequential", "parallel"], choices=["sequential", "parallel"])
+    parser.add_argument("--repeat", type=int, default=1, help="Fresh interpreters per measurement (median is reported)")
+    parser.add_argument("--output", help="Write the results as JSON to this file")
+    args = parser.parse_args()
+
+    template = load_template(args.template)
+    results = []
+    for count in args.counts:
+        for mode in args.modes:
+            try:
+                runs = [run_once(template, count, mode) for _ in range(args.repeat)]
+            except Exception as e:
+                print(f"{count:>5} agents {mode:<10} failed ({e})")
+                continue
+            r = {
+                "count": count,
+                "mode": mode,
+                "agents": runs[-1]["agents"],
+                **{key: statistics.median(run[key] for run in runs) for key in ("ready_s", "per_agent_ms", "max_rss_mb")},
+            }
+            results.append(r)
+            print(
+                f"{count:>5} agents {mode:<10} ready={r['ready_s'] * 1000:9.1f} ms "
+                f"per_agent={r['per_agent_ms']:7.2f} ms rss={r['max_rss_mb']:7.1f} MB"
+            )
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Cast routing micro-benchmark.
+
+Routes a corpus of casts to (agent, intent) with:
+
+    legacy   split on "!!" + dict lookup, then a separate "sonic" substring check
+    index    RoutingIndex (name/alias table + compiled keyword expression)
+
+for different numbers of registered agents, and reports the mean time per
+cast. The corpus is either a file with one cast per line (or a JSON list of
+casts / of webhook bodies with data.text) or a built-in sample.
+
+Usage (from the server directory):
+    python benchmarks/routing_benchmark.py                     # 10, 100 and 1000 agents
+    python benchmarks/routing_benchmark.py --corpus casts.txt --agents 50 500
+    python benchmarks/routing_benchmark.py --output routing.json
+"""
+import argparse
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+SERVER_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(SERVER_DIR))
+
+from routing import DEFAULT_AGENT, RoutingIndex  # noqa: E402
+
+SAMPLE_CASTS = [
+    "MemeForge!! Create a meme about web3",
+    "gm farcaster, who's shipping this weekend?",
+    "{agent}!! roast my portfolio please",
+    "{agent}!! sonic get balance of 0x8ba1f109551bD432803012645Ac136ddd64DBA72",
+    "swap 10 S for USDC on sonic with 1% slippage",
+    "sonic transfer 5 S to 0x8ba1f109551bD432803012645Ac136ddd64DBA72",
+    "Can someone explain why everyone is talking about supersonic rollups",
+    "{agent}!! write a haiku about gas fees",
+    "this thread is going viral, tagging the bots: MemeForge!! thoughts?",
+    "What's the ticker for the new dog coin on sonic? get token by ticker WOOF",
+]
+
+
+def load_corpus(path, agent_names, size):
+    if path:
+        text = Path(path).read_text()
+        try:
+            items = json.loads(text)
+            casts = [item["data"]["text"] if isinstance(item, dict) else item for item in items]
+        except json.JSONDecodeError:
+            casts = [line for line in text.splitlines() if line.strip()]
+        return casts
+    rng = random.Random(0)
+    return [rng.choice(SAMPLE_CASTS).format(agent=rng.choice(agent_names)) for _ in range(size)]
+
+
+def legacy_route(agents, cast_text):
+    if "!!" not in cast_text:
+        agent = agents.get(DEFAULT_AGENT)
+    else:
+        parts = cast_text.split("!!")
+        agent = agents.get(parts[0].strip()) or agents.get(DEFAULT_AGENT)
+    return agent, "sonic" if "sonic" in cast_text.lower() else "chat"
+
+
+def time_per_cast(route, casts, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for cast in casts:
+            route(cast)
+        best = min(best, time.perf_counter() - start)
+    return best / len(casts) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure cast routing cost")
+    parser.add_argument("--agents", type=int, nargs="+", default=[10, 100, 1000], help="Registered agent counts")
+    parser.add_argument("--corpus", help="Casts file (one per line, or a JSON list)")
+    parser.add_argument("--size", type=int, default=10000, help="Casts in the built-in corpus")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed passes (best is reported)")
+    parser.add_argument("--output", help="Write the results as JSON to this file")
+    args = parser.parse_args()
+
+    results = []
+    for count in args.agents:
+        agent_names = [DEFAULT_AGENT] + [f"agent_{i}" for i in range(count - 1)]
+        casts = load_corpus(args.corpus, agent_names, args.size)
+
+        agents = {name: name for name in agent_names}
+        index = RoutingIndex()
+        start = time.perf_counter()
+        for name in agent_names:
+            index.add_agent(name, [f"{name}_alias"])
+        build_ms = (time.perf_counter() - start) * 1000
+
+        legacy_us = time_per_cast(lambda cast: legacy_route(agents, cast), casts, args.repeat)
+        index_us = time_per_cast(index.route, casts, args.repeat)
+        r = {"agents": count, "casts": len(casts), "build_ms": build_ms, "legacy_us": legacy_us, "index_us": index_us}
+        results.append(r)
+        print(
+            f"{count:>5} agents build={build_ms:8.1f} ms "
+            f"legacy={legacy_us:6.2f} us/cast index={index_us:6.2f} us/cast"
+        )
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Per-call latency of SolanaConnection read actions.
+
+Compares the old call pattern (a fresh AsyncClient driven by a fresh
+asyncio.run() on every call) against the connection's persistent background
+loop with its reused AsyncClient, for get-balance and get-tps.
+
+If SOLANA_PRIVATE_KEY is not set a throwaway keypair is generated; balance
+reads on an empty wallet still cost a full RPC round trip.
+
+Usage (from the server directory):
+    python benchmarks/solana_rpc_benchmark.py
+    python benchmarks/solana_rpc_benchmark.py --rpc https://api.devnet.solana.com --calls 50
+    python benchmarks/solana_rpc_benchmark.py --output solana.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+SERVER_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(SERVER_DIR))
+
+from solana.rpc.async_api import AsyncClient  # noqa: E402
+from solders.keypair import Keypair  # noqa: E402
+
+from src.connections.solana_connection import SolanaConnection  # noqa: E402
+from src.helpers.solana.performance import SolanaPerformanceTracker  # noqa: E402
+from src.helpers.solana.read import SolanaReadHelper  # noqa: E402
+
+
+def fresh_client_call(rpc, make_coro):
+    """Previous behaviour: new client, new loop, client never closed"""
+    return asyncio.run(make_coro(AsyncClient(rpc)))
+
+
+def measure(fn, calls):
+    latencies = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        fn()
+        latencies.append(time.perf_counter() - start)
+    ordered = sorted(latencies)
+    return {
+        "calls": calls,
+        "first_ms": latencies[0] * 1000,
+        "mean_ms": statistics.mean(latencies) * 1000,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p95_ms": ordered[max(int(len(ordered) * 0.95) - 1, 0)] * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure SolanaConnection per-call latency")
+    parser.add_argument("--rpc", default="https://api.devnet.solana.com", help="Solana RPC endpoint")
+    parser.add_argument("--calls", type=int, default=20, help="Calls per action and mode")
+    parser.add_argument("--output", help="Write the results as JSON to this file")
+    args = parser.parse_args()
+
+    if not os.getenv("SOLANA_PRIVATE_KEY"):
+        os.environ["SOLANA_PRIVATE_KEY"] = str(Keypair())
+
+    connection = SolanaConnection({"rpc": args.rpc})
+    wallet = connection._get_wallet()
+
+    scenarios = {
+        "get-balance": {
+            "before": lambda: fresh_client_call(
+                args.rpc, lambda client: SolanaReadHelper.get_balance(client, wallet)
+            ),
+            "after": lambda: connection.get_balance(),
+        },
+        "get-tps": {
+            "before": lambda: fresh_client_call(
+                args.rpc, SolanaPerformanceTracker.fetch_current_tps
+            ),
+            "after": lambda: connection.get_tps(),
+        },
+    }
+
+    results = {}
+    try:
+        for action, modes in scenarios.items():
+            results[action] = {}
+            for mode, fn in modes.items():
+                try:
+                    r = measure(fn, args.calls)
+                except Exception as e:
+                    print(f"{action:<12} {mode:<7} failed ({e})")
+                    continue
+                results[action][mode] = r
+                print(
+                    f"{action:<12} {mode:<7} first={r['first_ms']:8.1f} ms mean={r['mean_ms']:8.1f} ms "
+                    f"p50={r['p50_ms']:8.1f} ms p95={r['p95_ms']:8.1f} ms"
+                )
+    finally:
+        connection.close()
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
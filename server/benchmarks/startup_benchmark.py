@@ -0,0 +1,125 @@
+"""
+Cold-start benchmark for agent configs.
+
+Every measurement runs in a fresh interpreter so import costs are not shared
+between runs. For each agent config it records the time to import the agent
+machinery, the time to construct the agent(s) (including their connections),
+the per-connection import times reported by the ConnectionManager registry,
+peak RSS, and whether the Solana / EVM stacks ended up imported.
+
+Usage (from the server directory):
+    python benchmarks/startup_benchmark.py                 # every config in agents/
+    python benchmarks/startup_benchmark.py meme_agents general --repeat 5
+    python benchmarks/startup_benchmark.py --output startup.json
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+SERVER_DIR = Path(__file__).resolve().parent.parent
+
+# Executed in the child interpreter; prints one JSON line with the measurements
+CHILD_SCRIPT = r"""
+import json, resource, sys, time
+start = time.perf_counter()
+from src.agent import ZerePyAgent
+from src.multi_agent_manager import MultiAgentManager
+from src.connection_manager import ConnectionManager
+imported = time.perf_counter()
+
+name, is_multi = sys.argv[1], sys.argv[2] == "1"
+if is_multi:
+    loaded = MultiAgentManager().load_agents_from_file(name)
+else:
+    loaded = [ZerePyAgent(name).name]
+ready = time.perf_counter()
+
+print(json.dumps({
+    "agents": len(loaded),
+    "import_s": imported - start,
+    "construct_s": ready - imported,
+    "total_s": ready - start,
+    "max_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    "connection_import_s": ConnectionManager.get_import_times(),
+    "solana_loaded": "solana" in sys.modules or "solders" in sys.modules,
+    "web3_loaded": "web3" in sys.modules,
+}))
+"""
+
+
+def discover_configs():
+    return sorted(
+        path.stem for path in (SERVER_DIR / "agents").glob("*.json")
+        if not path.stem.startswith("temp_")
+    )
+
+
+def is_multi_agent_file(name):
+    with open(SERVER_DIR / "agents" / f"{name}.json", "r") as f:
+        return "agents" in json.load(f)
+
+
+def run_once(name, is_multi):
+    result = subprocess.run(
+        [sys.executable, "-c", CHILD_SCRIPT, name, "1" if is_multi else "0"],
+        cwd=SERVER_DIR,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1] if result.stderr else "unknown error")
+    # Agent construction logs to stdout/stderr as well, the measurement is the last line
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def benchmark(name, repeat):
+    is_multi = is_multi_agent_file(name)
+    runs = [run_once(name, is_multi) for _ in range(repeat)]
+    summary = {
+        key: statistics.median(run[key] for run in runs)
+        for key in ("import_s", "construct_s", "total_s", "max_rss_mb")
+    }
+    summary.update({
+        "config": name,
+        "agents": runs[-1]["agents"],
+        "connection_import_s": runs[-1]["connection_import_s"],
+        "solana_loaded": runs[-1]["solana_loaded"],
+        "web3_loaded": runs[-1]["web3_loaded"],
+    })
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure agent cold-start time and RSS")
+    parser.add_argument("configs", nargs="*", help="Agent config names (defaults to every file in agents/)")
+    parser.add_argument("--repeat", type=int, default=3, help="Fresh interpreters per config (median is reported)")
+    parser.add_argument("--output", help="Write the results as JSON to this file")
+    args = parser.parse_args()
+
+    results = []
+    for name in args.configs or discover_configs():
+        try:
+            results.append(benchmark(name, args.repeat))
+        except Exception as e:
+            print(f"{name}: failed ({e})")
+            continue
+        r = results[-1]
+        print(
+            f"{name:<24} agents={r['agents']:<4} import={r['import_s'] * 1000:8.1f} ms "
+            f"construct={r['construct_s'] * 1000:8.1f} ms total={r['total_s'] * 1000:8.1f} ms "
+            f"rss={r['max_rss_mb']:7.1f} MB solana={'yes' if r['solana_loaded'] else 'no'} "
+            f"web3={'yes' if r['web3_loaded'] else 'no'}"
+        )
+        for connection, seconds in sorted(r["connection_import_s"].items(), key=lambda item: -item[1]):
+            print(f"    {connection:<14} {seconds * 1000:8.1f} ms")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Transaction throughput of one wallet against a local EVM node.
+
+Compares the old send pattern (read the nonce from the node, send, block on
+wait_for_transaction_receipt, repeat) with the TransactionPipeline from
+src/helpers/nonce_manager.py, which allocates nonces locally, sends every
+transaction back-to-back and collects the receipts in the background.
+
+Start a local node first, either of:
+    anvil
+    cd ../backend && npx hardhat node
+
+Both fund the well-known test account used by default below.
+
+Usage (from the server directory):
+    python benchmarks/tx_pipeline_benchmark.py
+    python benchmarks/tx_pipeline_benchmark.py --txs 500 --rpc http://127.0.0.1:8545
+    python benchmarks/tx_pipeline_benchmark.py --output pipeline.json
+"""
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+SERVER_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(SERVER_DIR))
+
+from web3 import Web3  # noqa: E402
+
+from src.helpers.nonce_manager import TransactionPipeline  # noqa: E402
+
+# Account #0 of anvil and `hardhat node` (public test key, never use on a real chain)
+TEST_PRIVATE_KEY = "0xac0974bec39a17e36ba4a6b4d238ff944bacb478cbed5efcae784d7bf4f2ff80"
+RECIPIENT = "0x70997970C51812dc3A010C7d01b50e0d17dc79C8"
+
+
+def transfer_tx(web3, account, chain_id):
+    return {
+        "from": account.address,
+        "to": RECIPIENT,
+        "value": 1,
+        "gas": 21000,
+        "gasPrice": web3.eth.gas_price,
+        "chainId": chain_id,
+    }
+
+
+def run_sequential(web3, account, chain_id, txs):
+    """Previous behaviour: one transaction in flight per wallet"""
+    start = time.perf_counter()
+    for _ in range(txs):
+        tx = transfer_tx(web3, account, chain_id)
+        tx["nonce"] = web3.eth.get_transaction_count(account.address)
+        signed = account.sign_transaction(tx)
+        raw = getattr(signed, "raw_transaction", None) or signed.rawTransaction
+        web3.eth.wait_for_transaction_receipt(web3.eth.send_raw_transaction(raw))
+    return time.perf_counter() - start, None
+
+
+def run_pipeline(web3, account, chain_id, txs):
+    pipeline = TransactionPipeline(web3, account, poll_interval=0.05)
+    start = time.perf_counter()
+    pending = [pipeline.submit(transfer_tx(web3, account, chain_id)) for _ in range(txs)]
+    sent = time.perf_counter() - start
+    for tx in pending:
+        tx.receipt(timeout=120)
+    return time.perf_counter() - start, {"send_seconds": sent, **pipeline.stats()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure single-wallet transaction throughput")
+    parser.add_argument("--rpc", default="http://127.0.0.1:8545", help="Local EVM node (anvil / hardhat node)")
+    parser.add_argument("--private-key", default=TEST_PRIVATE_KEY, help="Funded sender key")
+    parser.add_argument("--txs", type=int, default=200, help="Transactions per mode")
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    args = parser.parse_args()
+
+    web3 = Web3(Web3.HTTPProvider(args.rpc))
+    if not web3.is_connected():
+        sys.exit(f"No EVM node at {args.rpc}; start anvil or `npx hardhat node` first")
+    account = web3.eth.account.from_key(args.private_key)
+    chain_id = web3.eth.chain_id
+
+    results = {"rpc": args.rpc, "txs": args.txs}
+    for mode, run in (("sequential", run_sequential), ("pipeline", run_pipeline)):
+        seconds, extra = run(web3, account, chain_id, args.txs)
+        results[mode] = {"seconds": seconds, "tx_per_second": args.txs / seconds, **(extra or {})}
+        print(f"{mode:>10}: {args.txs} txs in {seconds:.2f}s ({args.txs / seconds:.1f} tx/s)")
+
+    print(f"   speedup: {results['pipeline']['tx_per_second'] / results['sequential']['tx_per_second']:.1f}x")
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
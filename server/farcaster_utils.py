@@ -1,6 +1,8 @@
 
 
+import aiohttp
 import requests
+from src.helpers.http_transport import http_transport, async_http_transport
 from constants import NEYNAR_API_KEY, SIGNER_UUID, NEYNAR_BASE_URL, OPENAI_API_KEY
 import logging
 logging.basicConfig(level=logging.INFO, format='%(message)s')
@@ -21,18 +23,7 @@ class FarcasterBot:
             "x-api-key": self.api_key
         }
 
-    def post_cast(self, text, parent_hash=None, embeds=None, channel_id=None):
-        """
-        Post a cast to Farcaster
-        
-        Args:
-            text (str): The text content of the cast
-            parent_hash (str, optional): Hash of the parent cast for replies
-            embeds (list, optional): List of embed objects
-            channel_id (str, optional): Channel ID to post to
-        """
-        url = f"{self.base_url}/cast"
-        
+    def _cast_payload(self, text, parent_hash=None, embeds=None, channel_id=None):
         payload = {
             "signer_uuid": self.signer_uuid,
             "text": text
@@ -44,11 +35,36 @@ class FarcasterBot:
             payload["embeds"] = embeds
         if channel_id:
             payload["channel_id"] = channel_id
+        return payload
+
+    def post_cast(self, text, parent_hash=None, embeds=None, channel_id=None):
+        """
+        Post a cast to Farcaster
+        
+        Args:
+            text (str): The text content of the cast
+            parent_hash (str, optional): Hash of the parent cast for replies
+            embeds (list, optional): List of embed objects
+            channel_id (str, optional): Channel ID to post to
+        """
+        url = f"{self.base_url}/cast"
+        payload = self._cast_payload(text, parent_hash, embeds, channel_id)
 
         try:
-            response = requests.post(url, headers=self.headers, json=payload)
+            response = http_transport.post(url, headers=self.headers, json=payload)
             response.raise_for_status()
             return response.json()
         except requests.exceptions.RequestException as e:
             logger.error(f"Error posting cast: {e}")
             raise
+
+    async def apost_cast(self, text, parent_hash=None, embeds=None, channel_id=None):
+        """Async variant of post_cast for use from the webhook handlers"""
+        url = f"{self.base_url}/cast"
+        payload = self._cast_payload(text, parent_hash, embeds, channel_id)
+
+        try:
+            return await async_http_transport.request_json("POST", url, headers=self.headers, json=payload)
+        except aiohttp.ClientError as e:
+            logger.error(f"Error posting cast: {e}")
+            raise
@@ -5,6 +5,7 @@ from constants import OPENAI_API_KEY
 from src.prompts import SONIC_ACTION_PROMPT, RESPONSE_PROMPT
 from models import AgentManager, convert_zeropy_to_agent_config
 from farcaster_utils import FarcasterBot
+from sonic_parser import MIN_CONFIDENCE, SONIC_ACTIONS, SonicCommand, get_intent_cache, normalize_command, parse_sonic_command
 from src.multi_agent_manager import MultiAgentManager
 import traceback
 
@@ -30,52 +31,119 @@ for agent_name in loaded_agents:
 
 logger.info(f"Loaded agents: {loaded_agents}")
 
-async def handle_webhook(request_body):
-    """Handle incoming webhook requests"""
+_openai_client = None
+
+
+def get_openai_client():
+    """Shared async OpenAI client used to parse Sonic commands"""
+    global _openai_client
+    if _openai_client is None:
+        _openai_client = openai.AsyncOpenAI(api_key=OPENAI_API_KEY)
+    return _openai_client
+
+_bot = None
+
+
+def get_bot():
+    """Shared Farcaster client used to post replies"""
+    global _bot
+    if _bot is None:
+        _bot = FarcasterBot()
+    return _bot
+
+
+def resolve_event_agent(hook_data):
+    """Name of the agent a webhook event is routed to"""
+    resolved_agent = AgentManager.parse_agent_from_cast(hook_data["data"]["text"])
+    return resolved_agent.name if resolved_agent else None
+
+
+async def process_event(hook_data):
+    """Handle a parsed webhook event"""
     try:
-        hook_data = json.loads(request_body)
-        bot = FarcasterBot()
+        bot = get_bot()
         cast_text = hook_data["data"]["text"]
+        route = AgentManager.route(cast_text)
         
         # Handle Sonic commands
-        if "sonic" in cast_text.lower():
-            return await handle_sonic_command(cast_text, hook_data, bot)
+        if route.intent == "sonic":
+            return await handle_sonic_command(cast_text, hook_data, bot, route)
             
         # Handle regular agent commands
-        return await handle_agent_command(cast_text, hook_data, bot)
+        return await handle_agent_command(cast_text, hook_data, bot, route)
         
     except Exception as e:
         logger.error(f"Error processing webhook: {e}")
         logger.info(f">>> traceback: {traceback.format_exc()}")
         raise
 
-async def handle_sonic_command(cast_text, hook_data, bot):
+
+async def handle_webhook(request_body):
+    """Handle incoming webhook requests"""
+    return await process_event(json.loads(request_body))
+
+async def parse_command_with_llm(cast_text):
+    """Parse a Sonic command with GPT"""
+    client = get_openai_client()
+    response = await client.chat.completions.create(
+        model="gpt-3.5-turbo",
+        messages=[
+            {"role": "system", "content": SONIC_ACTION_PROMPT.format(command=cast_text)},
+            {"role": "user", "content": "Parse this command and return the JSON response"}
+        ],
+        temperature=0,
+        response_format={"type": "json_object"}
+    )
+    
+    content = response.choices[0].message.content
+    if not content:
+        return None
+        
+    logger.info(f"Sonic response: {content}")
+    parsed = json.loads(content)
+    return SonicCommand(
+        action=parsed["action"],
+        params=parsed["params"],
+        explanation=parsed["explanation"],
+        source="llm",
+    )
+
+async def parse_command(cast_text):
+    """
+    Parse a Sonic command: cached intent first, then the local parser, and
+    GPT only when the local parse is missing or not confident enough
+    """
+    cache = get_intent_cache()
+    key = normalize_command(cast_text)
+    cached = cache.get(key)
+    if cached is not None:
+        return SonicCommand.from_json(cached)
+    
+    command = parse_sonic_command(cast_text)
+    if command is None or command.confidence < MIN_CONFIDENCE:
+        command = await parse_command_with_llm(cast_text)
+        if command is None:
+            return None
+    
+    logger.info(f"Parsed Sonic command ({command.source}): {command.action} {command.params}")
+    if command.action in SONIC_ACTIONS:
+        cache.set(key, command.to_json())
+    return command
+
+async def handle_sonic_command(cast_text, hook_data, bot, route=None):
     """Handle Sonic-specific commands"""
     try:
-        # Parse command with GPT
-        client = openai.OpenAI(api_key=OPENAI_API_KEY)
-        response = client.chat.completions.create(
-            model="gpt-3.5-turbo",
-            messages=[
-                {"role": "system", "content": SONIC_ACTION_PROMPT.format(command=cast_text)},
-                {"role": "user", "content": "Parse this command and return the JSON response"}
-            ],
-            temperature=0,
-            response_format={"type": "json_object"}
-        )
-        
-        content = response.choices[0].message.content
-        if not content:
+        command = await parse_command(cast_text)
+        if command is None:
             return {"error": "Failed to get response from GPT"}
             
-        logger.info(f"Sonic response: {content}")
-        parsed = json.loads(content)
-        action = parsed["action"]
-        params = parsed["params"]
-        explanation = parsed["explanation"]
+        action = command.action
+        params = command.params
+        explanation = command.explanation
         
         # Get action definition and validate parameters
-        resolved_agent = AgentManager.parse_agent_from_cast(cast_text)
+        route = route or AgentManager.route(cast_text)
+        resolved_agent = AgentManager.get_agent(route.agent)
         if not resolved_agent:
             raise ValueError("No suitable agent found")
             
@@ -94,7 +162,7 @@ async def handle_sonic_command(cast_text, hook_data, bot):
         logger.info(f"Executing action {action} with params: {param_list}")
         
         # Execute action
-        result = agent.connection_manager.perform_action(
+        result = await agent.connection_manager.aperform_action(
             connection_name="sonic",
             action_name=action, 
             params=param_list
@@ -102,7 +170,7 @@ async def handle_sonic_command(cast_text, hook_data, bot):
         
         # Post response
         response_text = f"{explanation}\n\nResult: {str(result) if result else 'Command executed successfully'}"
-        bot.post_cast(
+        await bot.apost_cast(
             text=response_text,
             parent_hash=hook_data["data"]["hash"]
         )
@@ -118,30 +186,26 @@ async def handle_sonic_command(cast_text, hook_data, bot):
     except (json.JSONDecodeError, KeyError) as e:
         return {"error": f"Failed to parse command: {str(e)}"}
 
-async def handle_agent_command(cast_text, hook_data, bot):
+async def handle_agent_command(cast_text, hook_data, bot, route=None):
     """Handle regular agent commands"""
-    resolved_agent = AgentManager.parse_agent_from_cast(cast_text)
+    route = route or AgentManager.route(cast_text)
+    resolved_agent = AgentManager.get_agent(route.agent)
     if not resolved_agent:
         raise ValueError("No suitable agent found")
     
     logger.info(f"Resolved agent: {resolved_agent}")
     
-    # Clean prompt text
-    if "!!" in cast_text:
-        _, clean_text = cast_text.split("!!", 1)
-        cast_text = clean_text.strip()
-    
-    # Generate response
-    prompt = RESPONSE_PROMPT.format(message=cast_text)
+    # Generate response from the prompt text after "<agent_name>!!"
+    prompt = RESPONSE_PROMPT.format(message=route.text)
     agent = manager.agents[resolved_agent.name]
-    response_text = agent.prompt_llm(prompt)
+    response_text = await agent.aprompt_llm(prompt)
     
     logger.info(f"Response text: {response_text}")
     if not response_text:
         raise ValueError("Failed to generate response")
     
     # Post response
-    result = bot.post_cast(
+    result = await bot.apost_cast(
         text=response_text,
         parent_hash=hook_data["data"]["hash"]
     )
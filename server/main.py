@@ -28,61 +28,102 @@ else:
     logger.error("SUPABASE_KEY environment variable is not set")
 
 
+LOCAL_AGENTS_FILE = "agents/meme_agents.json"
+
+
+def format_agent_record(agent: dict) -> dict:
+    """Turn an agents table row into the agent definition used by meme_agents.json"""
+    if "config" in agent and isinstance(agent["config"], dict):
+        # Create a new agent object with config fields at the top level
+        new_agent = {**agent}
+        for key, value in agent["config"].items():
+            new_agent[key] = value
+        # Remove the original config dictionary
+        del new_agent["config"]
+    else:
+        new_agent = {**agent}
+    new_agent["time_based_multipliers"] = {
+        "tweet_night_multiplier": 0.4,
+        "engagement_day_multiplier": 1.5
+    }
+    new_agent["config"] = [
+        {
+            "name": "farcaster",
+            "cast_interval": 900,
+            "own_cast_replies_count": 2,
+            "timeline_read_count": 20,
+            "mention_check_interval": 60,
+        },
+        {
+            "name": "openai",
+            "model": "gpt-3.5-turbo",
+            "max_tokens": 1024,
+            "temperature": 0.7,
+        },
+        {"name": "sonic", "network": "mainnet"},
+    ]
+    return new_agent
+
+
+def _read_local_agents() -> list:
+    try:
+        with open(LOCAL_AGENTS_FILE, "r") as f:
+            return json.load(f).get("agents", [])
+    except FileNotFoundError:
+        return []
+
+
+def _write_local_agents(agents: list) -> None:
+    # Write to a temp file first so readers never see a half-written file
+    tmp_path = f"{LOCAL_AGENTS_FILE}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump({"agents": agents}, f, indent=4)
+    os.replace(tmp_path, LOCAL_AGENTS_FILE)
+
+
 def update_agent_local_file():
-    # with open("agents/meme_agents.json", "r") as f:
-    # get all agents from supabase
+    """Rewrite the local agents file from every agent in Supabase"""
     if supabase:
         result = supabase.table("agents").select("*").execute()
-        with open("agents/meme_agents.json", "w") as f:
-            logger.info(f"Writing {len(result.data)} agents to file")
-            # Deconstruct config into outside keys for each agent
-            formatted_agents = []
-            for agent in result.data:
-                if "config" in agent and isinstance(agent["config"], dict):
-                    # Create a new agent object with config fields at the top level
-                    new_agent = {**agent}
-                    for key, value in agent["config"].items():
-                        new_agent[key] = value
-                    # Remove the original config dictionary
-                    del new_agent["config"]
-                    formatted_agents.append(new_agent)
-                else:
-                    formatted_agents.append(agent)
-            for agent in formatted_agents:
-                agent["time_based_multipliers"] = {
-                    "tweet_night_multiplier": 0.4,
-                    "engagement_day_multiplier": 1.5
-                }
-                agent["config"] = [
-                    {
-                        "name": "farcaster",
-                        "cast_interval": 900,
-                        "own_cast_replies_count": 2,
-                        "timeline_read_count": 20,
-                        "mention_check_interval": 60,
-                    },
-                    {
-                        "name": "openai",
-                        "model": "gpt-3.5-turbo",
-                        "max_tokens": 1024,
-                        "temperature": 0.7,
-                    },
-                    {"name": "sonic", "network": "mainnet"},
-                ]
-            formatted_data = {"agents": formatted_agents}
-            json.dump(formatted_data, f, indent=4)
+        logger.info(f"Writing {len(result.data)} agents to file")
+        _write_local_agents([format_agent_record(agent) for agent in result.data])
     else:
         logging.error("Cannot update agent file: Supabase connection not available")
 
 
+def upsert_agent_local_file(agent_record: dict) -> None:
+    """Add or replace a single agent in the local agents file, leaving the others as they are"""
+    agents = _read_local_agents()
+    for i, agent in enumerate(agents):
+        if agent.get("name") == agent_record["name"]:
+            agents[i] = agent_record
+            break
+    else:
+        agents.append(agent_record)
+    _write_local_agents(agents)
+
+
+def remove_agent_local_file(agent_name: str) -> None:
+    """Drop a single agent from the local agents file"""
+    agents = _read_local_agents()
+    remaining = [agent for agent in agents if agent.get("name") != agent_name]
+    if len(remaining) != len(agents):
+        _write_local_agents(remaining)
+
+
 update_agent_local_file()
 
 import traceback
 import uvicorn
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request, HTTPException
-from handlers import handle_webhook, manager
+from handlers import manager, process_event, resolve_event_agent
 from models import AgentConfig, AgentManager, convert_zeropy_to_agent_config
+from src.helpers.async_executor import run_blocking
 from fastapi.middleware.cors import CORSMiddleware
+from webhook_queue import QueueFullError, WebhookQueue
+from sonic_parser import get_intent_cache
+from src.helpers.rpc_pool import rpc_pool_stats
 
 
 async def migrate_existing_agents():
@@ -131,8 +172,19 @@ async def migrate_existing_agents():
         logger.error(f"Error during agent migration: {e}")
 
 
+# Webhook events are acknowledged at once and processed by a worker pool
+webhook_queue = WebhookQueue(process_event, resolve_event_agent)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await webhook_queue.start()
+    yield
+    await webhook_queue.stop()
+
+
 # Initialize FastAPI app
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
 
 # Add CORS middleware
 app.add_middleware(
@@ -148,12 +200,30 @@ app.add_middleware(
 async def webhook(request: Request):
     """Webhook endpoint to handle incoming Farcaster events"""
     try:
-        body = await request.body()
-        result = await handle_webhook(body)
-        return result
-    except Exception as e:
-        logger.error(f"Error processing webhook: {e}")
-        return {"error": str(e)}, 500
+        hook_data = json.loads(await request.body())
+    except json.JSONDecodeError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid webhook body: {e}")
+
+    try:
+        queued = webhook_queue.submit(hook_data)
+    except QueueFullError as e:
+        logger.warning(f"Rejecting webhook: {e}")
+        # Neynar retries the delivery later
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "5"})
+
+    return {"status": "queued" if queued else "duplicate"}
+
+
+@app.get("/webhook/stats")
+async def webhook_stats():
+    """Queue depth, dedup and latency metrics of webhook processing"""
+    return {**webhook_queue.stats(), "sonic_intent_cache": get_intent_cache().stats()}
+
+
+@app.get("/rpc/stats")
+async def rpc_stats():
+    """Latency, error rate and cooldown of every RPC endpoint in use"""
+    return rpc_pool_stats()
 
 
 @app.get("/")
@@ -161,107 +231,140 @@ async def root():
     return {"message": "Hello World"}
 
 
+def agent_config_to_row(agent_config: AgentConfig) -> dict:
+    """Convert an agent config to an agents table row"""
+    return {
+        "name": agent_config.name,
+        "config": {
+            "aliases": agent_config.aliases or [],
+            "bio": agent_config.bio,
+            "traits": agent_config.traits,
+            "examples": agent_config.examples,
+            "example_accounts": agent_config.example_accounts,
+            "loop_delay": agent_config.loop_delay,
+            "use_time_based_weights": agent_config.use_time_based_weights,
+            "config": [config.model_dump() for config in agent_config.config]
+            if agent_config.config
+            else [],
+            "tasks": [task.model_dump() for task in agent_config.tasks],
+        },
+    }
+
+
+def _setup_loaded_agent(zeropy_agent) -> None:
+    # list all supported actions
+    logger.info(f"Supported actions: {zeropy_agent}")
+    # Ensure LLM is set up
+    if not zeropy_agent.is_llm_set:
+        zeropy_agent._setup_llm_provider()
+
+
 @app.post("/agents")
 async def add_agent(agent_config: AgentConfig):
     """Add a new agent to the system"""
-    try:
-        if not supabase:
-            raise HTTPException(
-                status_code=500, detail="Supabase connection not available"
-            )
-
-        # Validate the agent configuration
-        if not agent_config.name:
-            raise HTTPException(status_code=400, detail="Agent name is required")
-
-        # Convert agent config to dictionary for storage
-        agent_data = {
-            "name": agent_config.name,
-            "config": {
-                "bio": agent_config.bio,
-                "traits": agent_config.traits,
-                "examples": agent_config.examples,
-                "example_accounts": agent_config.example_accounts,
-                "loop_delay": agent_config.loop_delay,
-                "use_time_based_weights": agent_config.use_time_based_weights,
-                "config": [config.model_dump() for config in agent_config.config]
-                if agent_config.config
-                else [],
-                "tasks": [task.model_dump() for task in agent_config.tasks],
-            },
-        }
+    if not supabase:
+        raise HTTPException(
+            status_code=500, detail="Supabase connection not available"
+        )
 
-        # Check if agent already exists
-        existing_agent = (
-            supabase.table("agents").select("*").eq("name", agent_config.name).execute()
+    # Validate the agent configuration
+    if not agent_config.name:
+        raise HTTPException(status_code=400, detail="Agent name is required")
+
+    # Check if agent already exists
+    existing_agent = (
+        supabase.table("agents").select("*").eq("name", agent_config.name).execute()
+    )
+    if existing_agent.data:
+        raise HTTPException(
+            status_code=409,
+            detail=f"Agent with name {agent_config.name} already exists",
         )
-        if existing_agent.data:
-            raise HTTPException(
-                status_code=409,
-                detail=f"Agent with name {agent_config.name} already exists",
-            )
 
+    try:
         # Store in Supabase
-        result = supabase.table("agents").insert(agent_data).execute()
+        result = supabase.table("agents").insert(agent_config_to_row(agent_config)).execute()
         if not result.data:
             raise HTTPException(
                 status_code=500, detail="Failed to store agent in database"
             )
 
-        # Try to add the agent to AgentManager
-        success = AgentManager.add_agent(agent_config)
-        if not success:
-            # Rollback Supabase insert if agent manager fails
-            supabase.table("agents").delete().eq("name", agent_config.name).execute()
+        # Build only the new agent; the rest of the fleet is left alone
+        agent_record = format_agent_record(result.data[0])
+        zeropy_agent = await run_blocking(manager.add_agent, agent_record)
+        try:
+            _setup_loaded_agent(zeropy_agent)
+            upsert_agent_local_file(agent_record)
+        except Exception:
+            manager.remove_agent(agent_config.name)
+            raise
+
+        AgentManager.add_agent(convert_zeropy_to_agent_config(zeropy_agent))
+        return {"message": f"Successfully added agent: {agent_config.name}"}
+
+    except Exception as e:
+        logger.error(f"Error adding agent: {e}, traceback: {traceback.format_exc()}")
+        supabase.table("agents").delete().eq("name", agent_config.name).execute()
+        if isinstance(e, HTTPException):
+            raise
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.put("/agents/{agent_name}")
+async def update_agent(agent_name: str, agent_config: AgentConfig):
+    """Replace an existing agent's configuration, rebuilding only that agent"""
+    if not supabase:
+        raise HTTPException(
+            status_code=500, detail="Supabase connection not available"
+        )
+    if agent_config.name != agent_name:
+        raise HTTPException(status_code=400, detail="Agent name cannot be changed")
+    if agent_name not in manager.agents:
+        raise HTTPException(status_code=404, detail=f"Agent {agent_name} not found")
+
+    try:
+        row = agent_config_to_row(agent_config)
+        result = (
+            supabase.table("agents").update({"config": row["config"]}).eq("name", agent_name).execute()
+        )
+        if not result.data:
             raise HTTPException(
-                status_code=500, detail="Failed to initialize agent in manager"
+                status_code=500, detail="Failed to update agent in database"
             )
-        update_agent_local_file()
-
-        loaded_agents = manager.load_agents_from_file("meme_agents")
-        if not loaded_agents:
-            raise ValueError("No agents were loaded")
-
-        # Initialize AgentManager with loaded agents
-        for agent_name in loaded_agents:
-            zeropy_agent = manager.agents[agent_name]
-            agent_config = convert_zeropy_to_agent_config(zeropy_agent)
-            AgentManager.add_agent(agent_config)
-            # list all supported actions
-            logger.info(f"Supported actions: {zeropy_agent}")
-            # Ensure LLM is set up
-            if not zeropy_agent.is_llm_set:
-                zeropy_agent._setup_llm_provider()
-
-        # Set up agent with MultiAgentManager
-        # try:
-        #     # Fix: The load_agents_from_dict method expects a different format
-        #     # The agent_data["config"] already contains the agent configuration
-        #     # But we need to add the 'name' field to it
-        #     agent_config_for_loading = agent_data["config"]
-        #     agent_config_for_loading["name"] = agent_config.name
-
-        #     loaded_agents = manager.load_agents_from_dict({"agents": [agent_config_for_loading]})
-        #     if not loaded_agents or agent_config.name not in loaded_agents:
-        #         raise Exception("Failed to load newly added agent")
-
-        #     # Set up LLM for the new agent
-        #     new_agent = manager.agents[agent_config.name]
-        #     if not new_agent.is_llm_set:
-        #         new_agent._setup_llm_provider()
-
-        # except Exception as e:
-        #     # If agent creation fails, clean up
-        #     AgentManager._agents.pop(agent_config.name, None)
-        #     supabase.table("agents").delete().eq("name", agent_config.name).execute()
-        #     logger.error(f"Failed to create agent: {str(e)}, traceback: {traceback.format_exc()}")
-        #     raise HTTPException(status_code=500, detail=f"Failed to create agent: {str(e)}")
 
-        return {"message": f"Successfully added agent: {agent_config.name}"}
+        agent_record = format_agent_record(result.data[0])
+        zeropy_agent = await run_blocking(manager.update_agent, agent_record)
+        _setup_loaded_agent(zeropy_agent)
+        upsert_agent_local_file(agent_record)
+        AgentManager.update_agent(convert_zeropy_to_agent_config(zeropy_agent))
+        return {"message": f"Successfully updated agent: {agent_name}"}
 
+    except HTTPException:
+        raise
     except Exception as e:
-        logger.error(f"Error adding agent: {e}")
-        supabase.table("agents").delete().eq("name", agent_config.name).execute()
+        logger.error(f"Error updating agent: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.delete("/agents/{agent_name}")
+async def remove_agent(agent_name: str):
+    """Remove an agent, stopping it and releasing its connections"""
+    if not supabase:
+        raise HTTPException(
+            status_code=500, detail="Supabase connection not available"
+        )
+    if agent_name not in manager.agents:
+        raise HTTPException(status_code=404, detail=f"Agent {agent_name} not found")
+
+    try:
+        supabase.table("agents").delete().eq("name", agent_name).execute()
+        await run_blocking(manager.remove_agent, agent_name)
+        remove_agent_local_file(agent_name)
+        AgentManager.remove_agent(agent_name)
+        return {"message": f"Successfully removed agent: {agent_name}"}
+
+    except Exception as e:
+        logger.error(f"Error removing agent: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -1,5 +1,6 @@
 from typing import List, Optional
 from pydantic import BaseModel, Field
+from routing import Route, RoutingIndex
 
 class TimeBasedMultipliers(BaseModel):
     tweet_night_multiplier: float = 0.4
@@ -25,6 +26,7 @@ class Task(BaseModel):
 
 class AgentConfig(BaseModel):
     name: str
+    aliases: Optional[List[str]] = Field(default_factory=list)
     bio: List[str]
     traits: List[str]
     examples: Optional[List[str]] = Field(default_factory=list)
@@ -44,6 +46,7 @@ def convert_zeropy_to_agent_config(zeropy_agent) -> AgentConfig:
     """Convert a ZerePyAgent to AgentConfig"""
     agent = AgentConfig(
         name=zeropy_agent.name,
+        aliases=zeropy_agent.aliases,
         bio=zeropy_agent.bio,
         traits=zeropy_agent.traits,
         examples=zeropy_agent.examples,
@@ -67,6 +70,8 @@ def convert_zeropy_to_agent_config(zeropy_agent) -> AgentConfig:
 
 class AgentManager:
     _agents: dict = {}
+    # Agent names, aliases and command keywords compiled into one matcher
+    _routes: RoutingIndex = RoutingIndex()
     
     @classmethod
     def add_agent(cls, agent_config: AgentConfig) -> bool:
@@ -74,7 +79,23 @@ class AgentManager:
         if agent_config.name in cls._agents:
             return False
         cls._agents[agent_config.name] = agent_config
+        cls._routes.add_agent(agent_config.name, agent_config.aliases or [])
         return True
+
+    @classmethod
+    def update_agent(cls, agent_config: AgentConfig) -> bool:
+        """Replace the config of a registered agent"""
+        if agent_config.name not in cls._agents:
+            return False
+        cls._agents[agent_config.name] = agent_config
+        cls._routes.add_agent(agent_config.name, agent_config.aliases or [])
+        return True
+
+    @classmethod
+    def remove_agent(cls, name: str) -> bool:
+        """Remove an agent from the manager"""
+        cls._routes.remove_agent(name)
+        return cls._agents.pop(name, None) is not None
     
     @classmethod
     def get_all_agents(cls) -> List[AgentConfig]:
@@ -86,18 +107,16 @@ class AgentManager:
         """Get a specific agent by name"""
         return cls._agents.get(name)
     
+    @classmethod
+    def route(cls, cast_text: str) -> Route:
+        """Resolve the agent and intent (e.g. "sonic") of a cast in one pass"""
+        return cls._routes.route(cast_text)
+
     @classmethod
     def parse_agent_from_cast(cls, cast_text: str) -> Optional[AgentConfig]:
         """
-        Parse agent name from cast text. Format: <agent_name>!!
+        Parse agent name (or alias) from cast text. Format: <agent_name>!!
         Example: MemeForge!! Create a meme about web3
+        Falls back to MemeForge when no known agent is named.
         """
-        if "!!" not in cast_text:
-            return cls.get_agent("MemeForge")  # Default to MemeForge
-            
-        parts = cast_text.split("!!")
-        if not parts:
-            return cls.get_agent("MemeForge")
-            
-        agent_name = parts[0].strip()
-        return cls.get_agent(agent_name) or cls.get_agent("MemeForge")
+        return cls.get_agent(cls.route(cast_text).agent)
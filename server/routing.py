@@ -0,0 +1,98 @@
+import re
+import threading
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional
+
+# Separator between the agent name and the message: "<agent_name>!! message"
+AGENT_SEPARATOR = "!!"
+# Agent used when a cast does not name a known agent
+DEFAULT_AGENT = "MemeForge"
+# Intent of a cast that matches no keyword
+DEFAULT_INTENT = "chat"
+# Keyword -> intent, matched anywhere in the cast (case-insensitive)
+DEFAULT_KEYWORDS = {
+    "sonic": "sonic",
+}
+
+
+@dataclass
+class Route:
+    """Where a cast goes: the agent that answers, what kind of request it is, and the message text"""
+    agent: Optional[str]
+    intent: str
+    text: str
+
+
+class RoutingIndex:
+    """
+    Routes a cast to an agent and an intent with one lookup each.
+
+    Agent names and aliases live in a case-insensitive table keyed by the text
+    before the first "!!", so resolving the agent costs one hash lookup no
+    matter how many agents are registered. Command keywords are compiled into a
+    single regular expression (longest keyword first) that scans the cast once.
+    Adding or removing an agent only touches its own table entries; the keyword
+    expression is recompiled only when keywords change.
+    """
+
+    def __init__(self, keywords: Optional[Dict[str, str]] = None, default_agent: str = DEFAULT_AGENT):
+        self.default_agent = default_agent
+        self._keywords: Dict[str, str] = {}
+        self._keyword_pattern: Optional[re.Pattern] = None
+        self._names: Dict[str, str] = {}
+        self._aliases: Dict[str, List[str]] = {}
+        self._lock = threading.Lock()
+        for keyword, intent in (DEFAULT_KEYWORDS if keywords is None else keywords).items():
+            self.add_keyword(keyword, intent)
+
+    @staticmethod
+    def _normalize(name: str) -> str:
+        return name.strip().lower()
+
+    def add_agent(self, agent_name: str, aliases: Iterable[str] = ()) -> None:
+        """Register an agent, or replace its aliases"""
+        with self._lock:
+            self._drop_names(agent_name)
+            self._aliases[agent_name] = list(aliases)
+            # On a clash between names/aliases of different agents the latest registration wins
+            for name in [agent_name, *self._aliases[agent_name]]:
+                self._names[self._normalize(name)] = agent_name
+
+    def remove_agent(self, agent_name: str) -> None:
+        with self._lock:
+            self._drop_names(agent_name)
+            self._aliases.pop(agent_name, None)
+
+    def _drop_names(self, agent_name: str) -> None:
+        for name in [agent_name, *self._aliases.get(agent_name, [])]:
+            key = self._normalize(name)
+            if self._names.get(key) == agent_name:
+                del self._names[key]
+
+    def add_keyword(self, keyword: str, intent: str) -> None:
+        """Route casts containing keyword to intent"""
+        with self._lock:
+            self._keywords[keyword.lower()] = intent
+            alternatives = sorted(self._keywords, key=len, reverse=True)
+            self._keyword_pattern = re.compile("|".join(map(re.escape, alternatives)))
+
+    def agents(self) -> List[str]:
+        return list(self._aliases)
+
+    def route(self, cast_text: str) -> Route:
+        """Resolve the agent and intent of a cast"""
+        lowered = cast_text.lower()
+        text = cast_text
+        agent = None
+        separator = lowered.find(AGENT_SEPARATOR)
+        if separator >= 0:
+            agent = self._names.get(lowered[:separator].strip())
+            text = cast_text[separator + len(AGENT_SEPARATOR):].strip()
+
+        intent = DEFAULT_INTENT
+        if self._keyword_pattern is not None:
+            match = self._keyword_pattern.search(lowered)
+            if match:
+                intent = self._keywords[match.group()]
+
+        return Route(agent=agent or self.default_agent, intent=intent, text=text)
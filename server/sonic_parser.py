@@ -0,0 +1,201 @@
+import json
+import re
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, Optional
+
+from src.helpers.llm_cache import MemoryResponseCache
+
+# Actions listed in SONIC_ACTION_PROMPT
+SONIC_ACTIONS = ("get-balance", "swap", "transfer", "get-token-by-ticker")
+# Parses below this confidence are handed to the LLM instead
+MIN_CONFIDENCE = 0.8
+# Parsed intents kept per normalised command text
+INTENT_CACHE_SIZE = 5000
+INTENT_CACHE_TTL = 24 * 3600
+
+_ADDRESS = r"0x[a-fA-F0-9]{40}"
+_AMOUNT = r"(?:\d+(?:\.\d+)?|\.\d+)(?![\d.])"
+# A symbol starts with a letter (or "$"), so it can never take digits off the amount before it
+_TOKEN = _ADDRESS + r"|\$?[A-Za-z][A-Za-z0-9.]{0,19}"
+# Names users give the native token
+NATIVE_TOKENS = {"s", "sonic"}
+# Address SonicConnection uses for the native token
+NATIVE_TOKEN_ADDRESS = "0xEeeeeEeeeEeEeeEeEeEeeEEEeeeeEeeeeeeeEEeE"
+
+_SWAP = re.compile(
+    rf"\b(?:swap|trade|convert|exchange)\s+(?P<amount>{_AMOUNT})\s+(?P<token_in>{_TOKEN})\s+"
+    rf"(?:to|for|into|->|→)\s+(?P<token_out>{_TOKEN})\b",
+    re.IGNORECASE,
+)
+_SLIPPAGE = re.compile(
+    rf"(?:(?P<before>{_AMOUNT})\s*%\s*(?:max\s+)?slippage|slippage\s*(?:of|at|:|=)?\s*(?P<after>{_AMOUNT})\s*%?)",
+    re.IGNORECASE,
+)
+_TRANSFER = re.compile(
+    rf"\b(?:transfer|send|pay)\s+(?P<amount>{_AMOUNT})(?:\s+(?P<token>{_TOKEN}))?\s+to\s+(?P<to_address>{_ADDRESS})\b",
+    re.IGNORECASE,
+)
+_BALANCE = re.compile(r"\b(?:balance|balances|bal|holdings)\b", re.IGNORECASE)
+_TOKEN_ADDRESS = re.compile(rf"\btoken\s*(?:address)?\s*(?P<token_address>{_ADDRESS})", re.IGNORECASE)
+_ANY_ADDRESS = re.compile(_ADDRESS)
+# A $TICKER or all-caps symbol in a balance request asks for a token we only know by name
+_SYMBOL = re.compile(r"\$(?P<dollar>[A-Za-z0-9]{1,12})\b|\b(?P<caps>[A-Z][A-Z0-9]{1,11})\b")
+_TICKER = re.compile(
+    r"(?:\bticker\s+|\b(?:address|contract)\s+(?:of|for)\s+(?:token\s+)?|"
+    r"\b(?:find|lookup|look\s+up|get)\s+(?:the\s+)?token\s+(?:by\s+ticker\s+)?)"
+    r"\$?(?P<ticker>[A-Za-z0-9]{1,12})\b",
+    re.IGNORECASE,
+)
+_AGENT_PREFIX = re.compile(r"^.*?!!")
+# A command starts with one of these verbs, after any @mentions, "sonic" and "please"
+_COMMAND = re.compile(
+    r"^(?:@[\w.-]+[\s,:]+)*(?:sonic\b[\s,:]*)?(?:please\s+)?"
+    r"(?=(?:swap|trade|convert|exchange|transfer|send|pay|check|get|show|fetch|balances?|bal|holdings|"
+    r"find|look\s*up|ticker)\b)",
+    re.IGNORECASE,
+)
+# Questions and negated requests are talk about a command, not the command itself
+_NOT_A_COMMAND = re.compile(
+    r"\?|\b(?:don['’]?t|do\s+not|doesn['’]?t|never|not|no|won['’]?t|shouldn['’]?t|can['’]?t|cannot|stop|cancel)\b",
+    re.IGNORECASE,
+)
+_WHITESPACE = re.compile(r"\s+")
+
+
+@dataclass
+class SonicCommand:
+    """A Sonic action parsed from a cast"""
+    action: str
+    params: Dict[str, Any] = field(default_factory=dict)
+    explanation: str = ""
+    confidence: float = 1.0
+    # "rules" for the local parser, "llm" for the model fallback
+    source: str = "rules"
+
+    def to_json(self) -> str:
+        return json.dumps(asdict(self))
+
+    @classmethod
+    def from_json(cls, data: str) -> "SonicCommand":
+        return cls(**json.loads(data))
+
+
+def normalize_command(text: str) -> str:
+    """Cache key for a command: agent prefix removed, lowercased, whitespace collapsed"""
+    return _WHITESPACE.sub(" ", _AGENT_PREFIX.sub("", text, count=1)).strip().lower()
+
+
+def _token(value: str) -> str:
+    return value.lstrip("$")
+
+
+def _swap_token(value: str) -> Optional[str]:
+    """Address the swap action expects for a parsed token, or None for a ticker we can't resolve offline"""
+    token = _token(value)
+    if token.lower() in NATIVE_TOKENS:
+        return NATIVE_TOKEN_ADDRESS
+    return token if _ANY_ADDRESS.fullmatch(token) else None
+
+
+def _parse_swap(text: str) -> Optional[SonicCommand]:
+    match = _SWAP.search(text)
+    if not match:
+        return None
+    token_in, token_out = _swap_token(match["token_in"]), _swap_token(match["token_out"])
+    params = {
+        "token_in": token_in or _token(match["token_in"]),
+        "token_out": token_out or _token(match["token_out"]),
+        "amount": float(match["amount"]),
+    }
+    slippage = _SLIPPAGE.search(text)
+    if slippage:
+        params["slippage"] = float(slippage["before"] or slippage["after"])
+    # The action needs token addresses; a ticker is left to the LLM
+    confidence = 1.0 if token_in and token_out else 0.5
+    explanation = f"Swapping {match['amount']} {_token(match['token_in'])} for {_token(match['token_out'])}"
+    return SonicCommand("swap", params, explanation, confidence)
+
+
+def _parse_transfer(text: str) -> Optional[SonicCommand]:
+    match = _TRANSFER.search(text)
+    if not match:
+        return None
+    params = {"to_address": match["to_address"], "amount": float(match["amount"])}
+    token = _token(match["token"] or "")
+    confidence = 1.0
+    if token and token.lower() not in NATIVE_TOKENS:
+        params["token_address"] = token
+        # The action needs a token address; a ticker is left to the LLM
+        if not _ANY_ADDRESS.fullmatch(token):
+            confidence = 0.5
+    explanation = f"Transferring {match['amount']} {token or 'S'} to {match['to_address']}"
+    return SonicCommand("transfer", params, explanation, confidence)
+
+
+def _parse_balance(text: str) -> Optional[SonicCommand]:
+    if not _BALANCE.search(text):
+        return None
+    params = {}
+    token_match = _TOKEN_ADDRESS.search(text)
+    if token_match:
+        params["token_address"] = token_match["token_address"]
+    addresses = [address for address in _ANY_ADDRESS.findall(text) if address != params.get("token_address")]
+    if len(addresses) > 1:
+        return SonicCommand("get-balance", params, confidence=0.3)
+    if addresses:
+        params["address"] = addresses[0]
+    symbols = {(m["dollar"] or m["caps"]).lower() for m in _SYMBOL.finditer(text)} - NATIVE_TOKENS
+    if symbols and "token_address" not in params:
+        return SonicCommand("get-balance", params, confidence=0.5)
+    explanation = f"Getting {'token ' if 'token_address' in params else ''}balance for {params.get('address', 'the agent wallet')}"
+    return SonicCommand("get-balance", params, explanation)
+
+
+def _parse_ticker(text: str) -> Optional[SonicCommand]:
+    for match in _TICKER.finditer(text):
+        ticker = match["ticker"]
+        if ticker.lower() in {"by", "for", "of", "the", "address", "on", "is"}:
+            continue
+        return SonicCommand("get-token-by-ticker", {"ticker": ticker}, f"Looking up the token address for {ticker}")
+    return None
+
+
+# Most specific first: a swap or transfer may also mention a balance or a token
+_PARSERS = (_parse_swap, _parse_transfer, _parse_ticker, _parse_balance)
+
+
+def parse_sonic_command(text: str) -> Optional[SonicCommand]:
+    """
+    Parse the common phrasings of the Sonic commands in SONIC_ACTION_PROMPT
+    without any network call, e.g.
+
+        sonic swap 10 S to USDC with 1% slippage
+        send 5 S to 0x...
+        sonic balance of 0x...
+        get token by ticker WOOF
+
+    Only command-shaped text is parsed: after the agent prefix, @mentions and
+    an optional "sonic", it must start with a command verb, and it must not
+    be a question or a negation ("sonic dont swap ...").
+
+    Returns None when no command is recognised; check .confidence against
+    MIN_CONFIDENCE before trusting the result.
+    """
+    body = _WHITESPACE.sub(" ", _AGENT_PREFIX.sub("", text, count=1)).strip()
+    command_start = _COMMAND.match(body)
+    if command_start is None or _NOT_A_COMMAND.search(body):
+        return None
+    body = body[command_start.end():]
+    for parser in _PARSERS:
+        command = parser(body)
+        if command is not None:
+            return command
+    return None
+
+
+_intent_cache = MemoryResponseCache(max_entries=INTENT_CACHE_SIZE, ttl=INTENT_CACHE_TTL)
+
+
+def get_intent_cache() -> MemoryResponseCache:
+    """Parsed intents keyed by normalize_command(text), shared by every agent"""
+    return _intent_cache
@@ -1,4 +1,5 @@
-import time, threading
+import asyncio
+import time
 from src.action_handler import register_action
 from src.helpers import print_h_bar
 from src.prompts import POST_CAST_PROMPT, REPLY_CAST_PROMPT
@@ -105,13 +106,14 @@ def respond_to_mentions(agent, **kwargs):
         agent.logger.error("No Farcaster FID configured or invalid FID format. Please set FARCASTER_FID in your .env file.")
         return False
 
-    agent.logger.info("\n👂 LISTENING FOR FARCASTER MENTIONS...")
-    
-    def process_mentions():
+    farcaster_config = agent.connection_manager.connections["farcaster"].config
+    check_interval = farcaster_config.get("mention_check_interval", 60)
+
+    async def listen_for_mentions():
         while True:
             try:
                 # Get recent mentions
-                mentions = agent.connection_manager.perform_action(
+                mentions = await agent.connection_manager.aperform_action(
                     connection_name="farcaster",
                     action_name="get-mentions",
                     params=[agent.fid]
@@ -119,10 +121,8 @@ def respond_to_mentions(agent, **kwargs):
                 
                 if not mentions:
                     agent.logger.debug("No new mentions found")
-                    time.sleep(60)  # Wait before checking again
-                    continue
                 
-                for mention in mentions:
+                for mention in mentions or []:
                     # Skip if we've already processed this mention
                     if "processed_mentions" not in agent.state:
                         agent.state["processed_mentions"] = set()
@@ -137,11 +137,11 @@ def respond_to_mentions(agent, **kwargs):
                     # Generate and post reply
                     base_prompt = REPLY_CAST_PROMPT.format(cast_text=mention_text)
                     system_prompt = agent._construct_system_prompt()
-                    reply_text = agent.prompt_llm(prompt=base_prompt, system_prompt=system_prompt)
+                    reply_text = await agent.aprompt_llm(prompt=base_prompt, system_prompt=system_prompt)
                     
                     if reply_text:
                         agent.logger.info(f"\n🚀 Posting reply: '{reply_text}'")
-                        agent.connection_manager.perform_action(
+                        await agent.connection_manager.aperform_action(
                             connection_name="farcaster",
                             action_name="reply-to-cast",
                             params=[mention.get('author_fid'), mention_hash, reply_text]
@@ -149,14 +149,14 @@ def respond_to_mentions(agent, **kwargs):
                         agent.state["processed_mentions"].add(mention_hash)
                         agent.logger.info("✅ Reply posted successfully!")
                 
-                time.sleep(60)  # Check for new mentions every minute
-                
             except Exception as e:
                 agent.logger.error(f"Error processing mentions: {e}")
-                time.sleep(60)  # Wait before retrying on error
 
-    # Start mention processing in background thread
-    processing_thread = threading.Thread(target=process_mentions)
-    processing_thread.daemon = True
-    processing_thread.start()
+            await asyncio.sleep(check_interval)  # Check for new mentions every interval
+
+    # One long-lived listener per agent, no matter how often this task is chosen
+    if agent.start_listener("farcaster-mentions", listen_for_mentions):
+        agent.logger.info("\n👂 LISTENING FOR FARCASTER MENTIONS...")
+    else:
+        agent.logger.debug("Already listening for Farcaster mentions")
     return True
@@ -1,4 +1,5 @@
-import time,threading
+import time
+from src.helpers.async_executor import iterate_in_thread
 from src.action_handler import register_action
 from src.helpers import print_h_bar
 from src.prompts import POST_TWEET_PROMPT, REPLY_TWEET_PROMPT
@@ -99,17 +100,23 @@ def like_tweet(agent, **kwargs):
 def respond_to_mentions(agent,**kwargs): #REQUIRES TWITTER PREMIUM PLAN
 
     filter_str = f"@{agent.username} -is:retweet"
-    stream_function = agent.connection_manager.perform_action(
-        connection_name="twitter",
-        action_name="stream-tweets",
-        params=[filter_str]
-    )
-    def process_tweets():
-        for tweet_data in stream_function:
+
+    async def listen_for_mentions():
+        stream_function = await agent.connection_manager.aperform_action(
+            connection_name="twitter",
+            action_name="stream-tweets",
+            params=[filter_str]
+        )
+        if stream_function is None:
+            return
+        # The stream is a blocking iterator that never ends: it gets its own thread
+        # and only this listener's stream is closed when it is cancelled, other
+        # agents sharing the pooled connection keep theirs
+        async for tweet_data in iterate_in_thread(stream_function, f"twitter-stream-{agent.name}", stream_function.close):
             tweet_id = tweet_data["id"]
             tweet_text = tweet_data["text"]
             agent.logger.info(f"Received a mention: {tweet_text}")
 
-    processing_thread = threading.Thread(target=process_tweets)
-    processing_thread.daemon = True
-    processing_thread.start()
\ No newline at end of file
+    # One long-lived listener per agent, no matter how often this task is chosen
+    agent.start_listener("twitter-mentions", listen_for_mentions)
+    return True
\ No newline at end of file
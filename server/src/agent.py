@@ -1,5 +1,8 @@
+import asyncio
+import hashlib
 import json
 import random
+import threading
 import time
 import logging
 import os
@@ -7,7 +10,10 @@ from pathlib import Path
 from dotenv import load_dotenv
 from src.connection_manager import ConnectionManager
 from src.helpers import print_h_bar
+from src.helpers.async_executor import run_blocking
+from src.helpers.llm_cache import get_response_cache
 from src.action_handler import execute_action
+from src.task_scheduler import TaskScheduler
 import src.actions.twitter_actions  
 import src.actions.echochamber_actions
 import src.actions.solana_actions
@@ -16,16 +22,40 @@ from datetime import datetime
 import traceback
 REQUIRED_FIELDS = ["name", "bio", "traits", "examples", "loop_delay", "config", "tasks"]
 
+# Built system prompts are persisted here so restarts don't refetch example tweets
+SYSTEM_PROMPT_CACHE_DIR = Path(".cache") / "system_prompts"
+DEFAULT_SYSTEM_PROMPT_REFRESH_INTERVAL = 6 * 60 * 60
+
 logger = logging.getLogger("agent")
 
+
+async def _wait_event(event: asyncio.Event, timeout: float) -> bool:
+    """Wait until the event is set or the timeout passes; returns whether it was set"""
+    try:
+        await asyncio.wait_for(event.wait(), timeout=timeout)
+        return True
+    except asyncio.TimeoutError:
+        return False
+
+
 class ZerePyAgent:
     def __init__(
             self,
-            agent_name: str
+            agent_name: str | None = None,
+            agent_dict: dict | None = None
     ):
+        """
+        Load an agent either by name from agents/<agent_name>.json or directly
+        from an already parsed definition (agent_dict), e.g. one entry of a
+        multi-agent file.
+        """
         try:
-            agent_path = Path("agents") / f"{agent_name}.json"
-            agent_dict = json.load(open(agent_path, "r"))
+            if agent_dict is None:
+                if agent_name is None:
+                    raise ValueError("Either agent_name or agent_dict is required")
+                agent_path = Path("agents") / f"{agent_name}.json"
+                with open(agent_path, "r") as f:
+                    agent_dict = json.load(f)
 
             missing_fields = [field for field in REQUIRED_FIELDS if field not in agent_dict]
             if missing_fields:
@@ -37,6 +67,7 @@ class ZerePyAgent:
             # Initialize basic attributes
             self.config = agent_dict["config"]
             self.name = agent_dict["name"]
+            self.aliases = agent_dict.get("aliases", [])
             self.bio = agent_dict["bio"]
             self.traits = agent_dict["traits"]
             self.examples = agent_dict["examples"]
@@ -91,6 +122,8 @@ class ZerePyAgent:
 
             # Initialize connection manager after setting up platform configs
             self.connection_manager = ConnectionManager(agent_dict["config"])
+            # Opt-in generate-text response cache, see src/helpers/llm_cache.py
+            self.connection_manager.response_cache = get_response_cache(agent_dict.get("llm_cache"))
 
             # Extract Echochambers config
             echochambers_config = next((config for config in agent_dict["config"] if config["name"] == "echochambers"), None)
@@ -99,15 +132,25 @@ class ZerePyAgent:
                 self.echochambers_history_count = echochambers_config.get("history_read_count", 50)
 
             self.is_llm_set = False
+            self.system_prompt_refresh_interval = agent_dict.get("system_prompt_refresh_interval", DEFAULT_SYSTEM_PROMPT_REFRESH_INTERVAL)
             self._system_prompt = None
+            self._system_prompt_job = None
+            self._prepare_system_prompt()
             self.logger = logging.getLogger("agent")
             self.state = {}
+            self.scheduler = TaskScheduler(self)
+            self._stop_event = threading.Event()
 
         except Exception as e:
             logger.error(f"Could not load ZerePy agent: {str(e)}")
             logger.error(traceback.format_exc())
             raise e
 
+    @classmethod
+    def from_dict(cls, agent_dict: dict) -> "ZerePyAgent":
+        """Construct an agent from its definition without touching the filesystem"""
+        return cls(agent_dict=agent_dict)
+
     def _setup_llm_provider(self):
         # Get first available LLM provider and its model
         llm_providers = self.connection_manager.get_model_providers()
@@ -129,51 +172,163 @@ class ZerePyAgent:
             if not self.fid:
                 logger.warning("Farcaster FID not found, some Farcaster functionalities may be limited")
 
+    def _system_prompt_fingerprint(self) -> str:
+        """Hash of the inputs the system prompt is built from"""
+        raw = json.dumps([self.bio, self.traits, self.examples, self.example_accounts], ensure_ascii=False)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _system_prompt_cache_path(self) -> Path:
+        return SYSTEM_PROMPT_CACHE_DIR / f"{self.name}.json"
+
+    def _load_cached_system_prompt(self) -> dict | None:
+        """Read the persisted system prompt if it was built from the current config"""
+        try:
+            with open(self._system_prompt_cache_path(), "r") as f:
+                cached = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if cached.get("fingerprint") != self._system_prompt_fingerprint():
+            return None
+        return cached
+
+    def _save_system_prompt(self, prompt: str) -> None:
+        path = self._system_prompt_cache_path()
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(".tmp")
+            with open(tmp_path, "w") as f:
+                json.dump({
+                    "fingerprint": self._system_prompt_fingerprint(),
+                    "built_at": time.time(),
+                    "prompt": prompt
+                }, f)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Could not persist system prompt for {self.name}: {e}")
+
+    def _fetch_account_tweets(self, example_account: str) -> list:
+        logger.info(f"🔍 Getting latest tweets for {example_account}")
+        return self.connection_manager.perform_action(
+            connection_name="twitter",
+            action_name="get-latest-tweets",
+            params=[example_account]
+        ) or []
+
+    def _fetch_example_tweets(self) -> list:
+        """Fetch the latest tweets of every example account, one after the other"""
+        if not self.example_accounts or "twitter" not in self.connection_manager.connections:
+            return []
+        # TODO: warpcast fetching casts is a pain in ass, fall back to casts here once it isn't
+        tweets = []
+        for account in self.example_accounts:
+            try:
+                tweets.extend(self._fetch_account_tweets(account))
+            except Exception as e:
+                logger.error(f"Failed to get example tweets: {e}")
+        return tweets
+
+    async def _afetch_example_tweets(self) -> list:
+        """
+        Fetch the latest tweets of every example account concurrently.
+
+        Each fetch is its own run_blocking call awaited from the event loop, so
+        no executor worker ever waits on another one.
+        """
+        if not self.example_accounts or "twitter" not in self.connection_manager.connections:
+            return []
+        results = await asyncio.gather(
+            *(run_blocking(self._fetch_account_tweets, account) for account in self.example_accounts),
+            return_exceptions=True,
+        )
+        tweets = []
+        for result in results:
+            if isinstance(result, Exception):
+                logger.error(f"Failed to get example tweets: {result}")
+            else:
+                tweets.extend(result)
+        return tweets
+
+    def _build_system_prompt(self, example_tweets: list) -> str:
+        """Assemble the system prompt from the agent configuration and fetched examples"""
+        prompt_parts = []
+        prompt_parts.extend(self.bio)
+
+        if self.traits:
+            prompt_parts.append("\nYour key traits are:")
+            prompt_parts.extend(f"- {trait}" for trait in self.traits)
+
+        if self.examples or self.example_accounts:
+            prompt_parts.append("\nHere are some examples of your style (Please avoid repeating any of these):")
+            if self.examples:
+                prompt_parts.extend(f"- {example}" for example in self.examples)
+            prompt_parts.extend(f"- {tweet['text']}" for tweet in example_tweets)
+
+        return "\n".join(prompt_parts)
+
+    def refresh_system_prompt(self) -> str:
+        """Rebuild the system prompt with fresh example tweets and persist it"""
+        prompt = self._build_system_prompt(self._fetch_example_tweets())
+        self._system_prompt = prompt
+        self._save_system_prompt(prompt)
+        return prompt
+
+    async def arefresh_system_prompt(self) -> str:
+        """Async counterpart of refresh_system_prompt, fetching the example accounts concurrently"""
+        prompt = self._build_system_prompt(await self._afetch_example_tweets())
+        self._system_prompt = prompt
+        await run_blocking(self._save_system_prompt, prompt)
+        return prompt
+
+    def _prepare_system_prompt(self) -> None:
+        """
+        Make a system prompt available right away at load.
+
+        The persisted prompt is used when it matches the current config; otherwise
+        the static part (bio, traits, examples) is used until example tweets have
+        been fetched in the background, so prompting never waits on Twitter.
+        """
+        cached = self._load_cached_system_prompt()
+        if cached is not None:
+            self._system_prompt = cached["prompt"]
+        else:
+            self._system_prompt = self._build_system_prompt([])
+
+        if not self.example_accounts or "twitter" not in self.connection_manager.connections:
+            return
+
+        if cached is None or time.time() - cached.get("built_at", 0) >= self.system_prompt_refresh_interval:
+            delay = 0
+        else:
+            delay = self.system_prompt_refresh_interval - (time.time() - cached["built_at"])
+        # A periodic job on the agent runtime rather than a thread per agent
+        from src.agent_runtime import get_runtime
+        self._system_prompt_job = get_runtime().schedule_periodic(
+            f"system-prompt-{self.name}",
+            self._scheduled_system_prompt_refresh,
+            self.system_prompt_refresh_interval,
+            delay,
+        )
+
+    async def _scheduled_system_prompt_refresh(self) -> None:
+        try:
+            await self.arefresh_system_prompt()
+            logger.info(f"Refreshed system prompt for {self.name}")
+        except Exception as e:
+            logger.error(f"System prompt refresh failed for {self.name}: {e}")
+
+    def stop_system_prompt_refresh(self) -> None:
+        """Stop the background system prompt refresh"""
+        if self._system_prompt_job is not None:
+            from src.agent_runtime import get_runtime
+            get_runtime().cancel(self._system_prompt_job)
+            self._system_prompt_job = None
+
     def _construct_system_prompt(self) -> str:
-        """Construct the system prompt from agent configuration"""
+        """Get the system prompt, built at load and refreshed in the background"""
         if self._system_prompt is None:
-            prompt_parts = []
-            prompt_parts.extend(self.bio)
-
-            if self.traits:
-                prompt_parts.append("\nYour key traits are:")
-                prompt_parts.extend(f"- {trait}" for trait in self.traits)
-
-            if self.examples or self.example_accounts:
-                prompt_parts.append("\nHere are some examples of your style (Please avoid repeating any of these):")
-                if self.examples:
-                    prompt_parts.extend(f"- {example}" for example in self.examples)
-
-                if self.example_accounts:
-                    for example_account in self.example_accounts:
-                        logger.info(f"🔍 Getting latest tweets for {example_account}")
-                        tweets = self.connection_manager.perform_action(
-                            connection_name="twitter",
-                            action_name="get-latest-tweets",
-                            params=[example_account]
-                        )
-                        if tweets:
-                            prompt_parts.extend(f"- {tweet['text']}" for tweet in tweets)
-                            
-                        # checking warpcast if no tweets are found
-                        # TODO: warpcast fetching casts is a pain in ass, ignore for now
-                        # if not tweets:
-                        #     logger.info(f"🔍 Getting latest casts for {example_account}")
-                        #     try:
-                        #         casts = self.connection_manager.perform_action(
-                        #             connection_name="farcaster",
-                        #             action_name="get-latest-casts",
-                        #             params=[self.fid]  # Ensure proper string/int params
-                        #         )
-                        #         if casts:
-                        #             prompt_parts.extend(f"- {cast['text']}" for cast in casts)
-                        #     except Exception as e:
-                        #         logger.error(f"Failed to get casts: {e}")
-
-            self._system_prompt = "\n".join(prompt_parts)
-
+            self._prepare_system_prompt()
         return self._system_prompt
-    
+
     def _adjust_weights_for_time(self, current_hour: int, task_weights: list) -> list:
         weights = task_weights.copy()
         
@@ -208,20 +363,131 @@ class ZerePyAgent:
         )
         return str(result) if result is not None else None
 
+    async def aprompt_llm(self, prompt: str, system_prompt: str | None = None) -> str | None:
+        """Async variant of prompt_llm for callers running on an event loop"""
+        system_prompt = system_prompt or self._construct_system_prompt()
+        if not system_prompt:
+            return None
+
+        result = await self.connection_manager.aperform_action(
+            connection_name=self.model_provider,
+            action_name="generate-text",
+            params=[prompt, system_prompt]
+        )
+        return str(result) if result is not None else None
+
     def perform_action(self, connection: str, action: str, **kwargs) -> None:
         return self.connection_manager.perform_action(connection, action, **kwargs)
     
-    def select_action(self, use_time_based_weights: bool = False) -> dict:
+    def select_action(self, use_time_based_weights: bool = False, candidates: list | None = None) -> dict:
+        """Weighted random choice among candidates (all tasks by default)"""
         task_weights = [weight for weight in self.task_weights.copy()]
         
         if use_time_based_weights:
             current_hour = datetime.now().hour
             task_weights = self._adjust_weights_for_time(current_hour, task_weights)
+
+        if candidates is None:
+            return random.choices(self.tasks, weights=task_weights, k=1)[0]
+
+        candidate_ids = {id(task) for task in candidates}
+        pairs = [(task, weight) for task, weight in zip(self.tasks, task_weights) if id(task) in candidate_ids]
+        if not any(weight > 0 for _, weight in pairs):
+            return random.choice(candidates)
+        return random.choices([task for task, _ in pairs], weights=[weight for _, weight in pairs], k=1)[0]
+
+    def stop(self) -> None:
+        """Ask a running loop to exit"""
+        self._stop_event.set()
+
+    def _replenish_inputs(self) -> None:
+        # TODO: Add more inputs to complexify agent behavior
+        if "timeline_tweets" not in self.state or self.state["timeline_tweets"] is None or len(self.state["timeline_tweets"]) == 0:
+            if any("tweet" in task["name"] for task in self.tasks):
+                logger.info("\n👀 READING TIMELINE")
+                self.state["timeline_tweets"] = self.connection_manager.perform_action(
+                    connection_name="twitter",
+                    action_name="read-timeline",
+                    params=[]
+                )
+
+        if "room_info" not in self.state or self.state["room_info"] is None:
+            if any("echochambers" in task["name"] for task in self.tasks):
+                logger.info("\n👀 READING ECHOCHAMBERS ROOM INFO")
+                self.state["room_info"] = self.connection_manager.perform_action(
+                    connection_name="echochambers",
+                    action_name="get-room-info",
+                    params=[]  # Change empty dict to empty list
+                )
+
+    def _run_eligible_task(self, eligible: list) -> bool:
+        """Replenish inputs, pick one of the eligible tasks, run it and record the outcome"""
+        # REPLENISH INPUTS
+        self._replenish_inputs()
+
+        # CHOOSE AN ACTION
+        # TODO: Add agentic action selection
+        logger.info(f"🔍 Choosing action... out of {[task['name'] for task in eligible]} eligible tasks")
         
-        return random.choices(self.tasks, weights=task_weights, k=1)[0]
+        action = self.select_action(use_time_based_weights=self.use_time_based_weights, candidates=eligible)
+        action_name = action["name"]
+
+        # PERFORM ACTION
+        success = bool(execute_action(self, action_name))
+        self.scheduler.record(action_name, success)
+        return success
+
+    def start_listener(self, listener: str, factory) -> bool:
+        """
+        Start a long-lived listener (e.g. mention polling) on the agent runtime.
+
+        factory returns the listener coroutine. A listener with the same name is
+        only ever running once per agent, so tasks that start listeners can be
+        chosen repeatedly. Returns True if a new listener was started.
+        """
+        # Imported here to avoid a cycle, the runtime hosts ZerePyAgent instances
+        from src.agent_runtime import get_runtime
+        return get_runtime().ensure_listener(self.name, listener, factory)
+
+    async def arun(self, stop_event: asyncio.Event) -> None:
+        """
+        Async counterpart of loop, run as a task on the agent runtime.
+
+        Waiting happens on the event loop; each task runs on the shared blocking
+        executor since actions are synchronous.
+        """
+        if not self.is_llm_set:
+            await run_blocking(self._setup_llm_provider)
+
+        scheduler = self.scheduler
+        while not stop_event.is_set():
+            try:
+                eligible = scheduler.eligible_tasks()
+                if not eligible:
+                    wakeup = scheduler.next_wakeup()
+                    delay = self.loop_delay if wakeup is None else max(wakeup - time.time(), 0)
+                    logger.debug(f"{self.name}: next task is eligible in {delay:.0f} seconds")
+                    await _wait_event(stop_event, delay)
+                    continue
+
+                await run_blocking(self._run_eligible_task, eligible)
+
+            except Exception as e:
+                logger.error(f"\n❌ Error in agent loop iteration: {e}, traceback: {traceback.format_exc()}")
+                await _wait_event(stop_event, self.loop_delay)
+
+    def loop(self, stop_event: threading.Event | None = None):
+        """
+        Main agent loop for autonomous behavior.
+
+        Runs until stop_event (or agent.stop()) is set. Instead of sleeping a fixed
+        loop_delay between iterations, the loop waits exactly until the next task
+        becomes eligible according to its TaskScheduler, then picks a weighted
+        random task among the eligible ones.
+        """
+        self._stop_event = stop_event if stop_event is not None else threading.Event()
+        stop_event = self._stop_event
 
-    def loop(self):
-        """Main agent loop for autonomous behavior"""
         if not self.is_llm_set:
             self._setup_llm_provider()
 
@@ -229,54 +495,35 @@ class ZerePyAgent:
         logger.info("Press Ctrl+C at any time to stop the loop.")
         print_h_bar()
 
-        time.sleep(2)
+        if stop_event.wait(2):
+            return
         logger.info("Starting loop in 5 seconds...")
         for i in range(5, 0, -1):
             logger.info(f"{i}...")
-            time.sleep(1)
+            if stop_event.wait(1):
+                return
 
+        scheduler = self.scheduler
         try:
-            while True:
-                success = False
+            while not stop_event.is_set():
                 try:
-                    # REPLENISH INPUTS
-                    # TODO: Add more inputs to complexify agent behavior
-                    if "timeline_tweets" not in self.state or self.state["timeline_tweets"] is None or len(self.state["timeline_tweets"]) == 0:
-                        if any("tweet" in task["name"] for task in self.tasks):
-                            logger.info("\n👀 READING TIMELINE")
-                            self.state["timeline_tweets"] = self.connection_manager.perform_action(
-                                connection_name="twitter",
-                                action_name="read-timeline",
-                                params=[]
-                            )
-
-                    if "room_info" not in self.state or self.state["room_info"] is None:
-                        if any("echochambers" in task["name"] for task in self.tasks):
-                            logger.info("\n👀 READING ECHOCHAMBERS ROOM INFO")
-                            self.state["room_info"] = self.connection_manager.perform_action(
-                                connection_name="echochambers",
-                                action_name="get-room-info",
-                                params=[]  # Change empty dict to empty list
-                            )
-
-                    # CHOOSE AN ACTION
-                    # TODO: Add agentic action selection
-                    logger.info(f"🔍 Choosing action... out of {self.tasks} tasks")
-                    
-                    action = self.select_action(use_time_based_weights=self.use_time_based_weights)
-                    action_name = action["name"]
-
-                    # PERFORM ACTION
-                    success = execute_action(self, action_name)
-
-                    logger.info(f"\n⏳ Waiting {self.loop_delay} seconds before next loop...")
-                    print_h_bar()
-                    time.sleep(self.loop_delay if success else 60)
+                    eligible = scheduler.eligible_tasks()
+                    if not eligible:
+                        wakeup = scheduler.next_wakeup()
+                        delay = self.loop_delay if wakeup is None else max(wakeup - time.time(), 0)
+                        logger.info(f"\n⏳ Next task is eligible in {delay:.0f} seconds...")
+                        print_h_bar()
+                        stop_event.wait(delay)
+                        continue
+
+                    self._run_eligible_task(eligible)
 
                 except Exception as e:
                     logger.error(f"\n❌ Error in agent loop iteration: {e}, traceback: {traceback.format_exc()}")
                     logger.info(f"⏳ Waiting {self.loop_delay} seconds before retrying...")
-                    time.sleep(self.loop_delay)
+                    stop_event.wait(self.loop_delay)
+
+            logger.info("\n🛑 Agent loop stopped.")
 
         except KeyboardInterrupt:
             logger.info("\n🛑 Agent loop stopped by user.")
@@ -0,0 +1,173 @@
+import asyncio
+import inspect
+import logging
+import threading
+from typing import Any, Awaitable, Callable, Dict, List, Tuple
+
+from src.helpers.async_executor import BackgroundLoop, run_blocking
+
+logger = logging.getLogger("agent_runtime")
+
+
+class AgentRuntime:
+    """
+    A single asyncio event loop hosting many agents.
+
+    Every running agent is one task on the loop (ZerePyAgent.arun) and every
+    long-lived listener (e.g. mention polling) is one more task, keyed by
+    (agent name, listener name) so it is never started twice. Periodic
+    maintenance jobs (e.g. system prompt refresh) are tasks too. Blocking
+    connection calls made by agents and listeners go through the shared,
+    bounded executor in src.helpers.async_executor, so the number of OS
+    threads stays fixed no matter how many agents are hosted.
+
+    All public methods are thread-safe and may be called from sync code.
+    """
+
+    def __init__(self, name: str = "agent-runtime"):
+        self._background = BackgroundLoop(name)
+        self._agents: Dict[str, Tuple[asyncio.Task, asyncio.Event]] = {}
+        self._listeners: Dict[Tuple[str, str], asyncio.Task] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        return self._background.loop
+
+    def start_agent(self, agent) -> None:
+        """Start the agent's loop as a task on the runtime"""
+        with self._lock:
+            entry = self._agents.get(agent.name)
+            if entry is not None and not entry[0].done():
+                raise ValueError(f"Agent {agent.name} is already running")
+            self._background.run(self._start_agent(agent))
+
+    async def _start_agent(self, agent) -> None:
+        stop_event = asyncio.Event()
+        task = asyncio.create_task(self._run_agent(agent, stop_event), name=f"agent_{agent.name}")
+        self._agents[agent.name] = (task, stop_event)
+
+    async def _run_agent(self, agent, stop_event: asyncio.Event) -> None:
+        logger.info(f"\n🚀 Starting agent: {agent.name}")
+        try:
+            while not stop_event.is_set():
+                try:
+                    await agent.arun(stop_event)
+                except Exception as e:
+                    logger.error(f"Error in agent {agent.name} loop: {e}")
+                    try:
+                        # Wait 1 minute before retrying
+                        await asyncio.wait_for(stop_event.wait(), timeout=60)
+                    except asyncio.TimeoutError:
+                        pass
+        finally:
+            await self._cancel_listeners(agent.name)
+            logger.info(f"\n🛑 Agent {agent.name} stopped")
+
+    def stop_agent(self, agent_name: str, timeout: float = 5) -> None:
+        """Signal the agent to stop and wait for its task to finish"""
+        with self._lock:
+            entry = self._agents.get(agent_name)
+        if entry is None or not self._background.running:
+            return
+        task, stop_event = entry
+        self.loop.call_soon_threadsafe(stop_event.set)
+        try:
+            self._background.run(asyncio.wait({task}, timeout=timeout))
+        except Exception as e:
+            logger.error(f"Error stopping agent {agent_name}: {e}")
+
+    def running_agents(self) -> List[str]:
+        """Names of agents whose task is still running"""
+        with self._lock:
+            return [name for name, (task, _) in self._agents.items() if not task.done()]
+
+    def ensure_listener(self, agent_name: str, listener: str, factory: Callable[[], Awaitable[Any]]) -> bool:
+        """
+        Start a long-lived listener task unless one with the same key is already running.
+
+        factory is called on the runtime loop to create the coroutine. Returns
+        True if a new listener was started.
+        """
+        key = (agent_name, listener)
+
+        async def start() -> bool:
+            task = self._listeners.get(key)
+            if task is not None and not task.done():
+                return False
+            task = asyncio.create_task(self._run_listener(key, factory), name=f"{agent_name}:{listener}")
+            self._listeners[key] = task
+            return True
+
+        return self._background.run(start())
+
+    async def _run_listener(self, key: Tuple[str, str], factory: Callable[[], Awaitable[Any]]) -> None:
+        try:
+            await factory()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Listener {key[1]} of agent {key[0]} failed: {e}")
+
+    def schedule_periodic(self, name: str, func: Callable[[], Any], interval: float, delay: float = 0) -> asyncio.Task:
+        """
+        Call func every interval seconds, the first time after delay, until the
+        returned task is passed to cancel(). A coroutine function is awaited on
+        the loop; any other func runs on the shared executor, so it must not
+        itself wait on work submitted to that executor. Unlike listeners,
+        periodic jobs are not tied to an agent's loop running.
+        """
+        async def start() -> asyncio.Task:
+            return asyncio.create_task(self._run_periodic(name, func, interval, delay), name=name)
+
+        return self._background.run(start())
+
+    async def _run_periodic(self, name: str, func: Callable[[], Any], interval: float, delay: float) -> None:
+        while True:
+            await asyncio.sleep(delay)
+            try:
+                if inspect.iscoroutinefunction(func):
+                    await func()
+                else:
+                    await run_blocking(func)
+            except Exception as e:
+                logger.error(f"Periodic job {name} failed: {e}")
+            delay = interval
+
+    def cancel(self, task: asyncio.Task) -> None:
+        """Cancel a task created by the runtime, e.g. a periodic job"""
+        if self._background.running:
+            self.loop.call_soon_threadsafe(task.cancel)
+
+    async def _cancel_listeners(self, agent_name: str) -> None:
+        tasks = [task for (name, _), task in self._listeners.items() if name == agent_name]
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+        for key in [key for key in self._listeners if key[0] == agent_name]:
+            del self._listeners[key]
+
+    def listeners(self) -> List[Tuple[str, str]]:
+        """(agent name, listener) pairs of running listeners"""
+        return [key for key, task in list(self._listeners.items()) if not task.done()]
+
+    def shutdown(self) -> None:
+        """Stop every agent and the runtime loop"""
+        for agent_name in list(self._agents):
+            self.stop_agent(agent_name)
+        self._background.stop()
+
+
+_runtime: AgentRuntime | None = None
+_runtime_lock = threading.Lock()
+
+
+def get_runtime() -> AgentRuntime:
+    """The process-wide agent runtime"""
+    global _runtime
+    if _runtime is None:
+        with _runtime_lock:
+            if _runtime is None:
+                _runtime = AgentRuntime()
+    return _runtime
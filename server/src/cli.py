@@ -599,9 +599,15 @@ class ZerePyCLI:
             return
 
         try:
-            from src.multi_agent_manager import MultiAgentManager
             if self.multi_agent_manager is None:
-                self.multi_agent_manager = MultiAgentManager()
+                # AGENT_SHARDS > 1 spreads the agents across that many worker processes
+                shards = int(os.getenv("AGENT_SHARDS", "0"))
+                if shards > 1:
+                    from src.sharded_agent_manager import ShardedAgentManager
+                    self.multi_agent_manager = ShardedAgentManager(shards=shards)
+                else:
+                    from src.multi_agent_manager import MultiAgentManager
+                    self.multi_agent_manager = MultiAgentManager()
             
             loaded_agents = self.multi_agent_manager.load_agents_from_file(input_list[1])
             logger.info(f"\n✅ Successfully loaded {len(loaded_agents)} agents:")
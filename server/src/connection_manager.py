@@ -1,80 +1,134 @@
+import hashlib
+import importlib
+import json
 import logging
-from typing import Any, List, Optional, Type, Dict
+import os
+import threading
+import time
+from typing import Any, List, Optional, Tuple, Type, Dict
 import traceback
 from src.connections.base_connection import BaseConnection
-from src.connections.anthropic_connection import AnthropicConnection
-from src.connections.eternalai_connection import EternalAIConnection
-from src.connections.goat_connection import GoatConnection
-from src.connections.groq_connection import GroqConnection
-from src.connections.openai_connection import OpenAIConnection
-from src.connections.twitter_connection import TwitterConnection
-from src.connections.farcaster_connection import FarcasterConnection
-from src.connections.ollama_connection import OllamaConnection
-from src.connections.echochambers_connection import EchochambersConnection
-from src.connections.solana_connection import SolanaConnection
-from src.connections.hyperbolic_connection import HyperbolicConnection
-from src.connections.galadriel_connection import GaladrielConnection
-from src.connections.sonic_connection import SonicConnection
-from src.connections.discord_connection import DiscordConnection
-from src.connections.allora_connection import AlloraConnection
-from src.connections.xai_connection import XAIConnection
-from src.connections.ethereum_connection import EthereumConnection
-from src.connections.together_connection import TogetherAIConnection
-from src.connections.evm_connection import EVMConnection
-from src.connections.perplexity_connection import PerplexityConnection
+from src.helpers.async_executor import run_blocking
+from src.helpers.llm_cache import ResponseCache
 
 logger = logging.getLogger("connection_manager")
 
+# Connection name (as used in agent configs) -> "module:ClassName".
+# Modules are only imported the first time an agent config asks for them, so an
+# agent that only uses e.g. farcaster and openai never pulls in the Solana or EVM stacks.
+CONNECTION_REGISTRY: Dict[str, str] = {
+    "twitter": "src.connections.twitter_connection:TwitterConnection",
+    "anthropic": "src.connections.anthropic_connection:AnthropicConnection",
+    "openai": "src.connections.openai_connection:OpenAIConnection",
+    "farcaster": "src.connections.farcaster_connection:FarcasterConnection",
+    "groq": "src.connections.groq_connection:GroqConnection",
+    "eternalai": "src.connections.eternalai_connection:EternalAIConnection",
+    "ollama": "src.connections.ollama_connection:OllamaConnection",
+    "echochambers": "src.connections.echochambers_connection:EchochambersConnection",
+    "goat": "src.connections.goat_connection:GoatConnection",
+    "solana": "src.connections.solana_connection:SolanaConnection",
+    "hyperbolic": "src.connections.hyperbolic_connection:HyperbolicConnection",
+    "galadriel": "src.connections.galadriel_connection:GaladrielConnection",
+    "sonic": "src.connections.sonic_connection:SonicConnection",
+    "discord": "src.connections.discord_connection:DiscordConnection",
+    "allora": "src.connections.allora_connection:AlloraConnection",
+    "xai": "src.connections.xai_connection:XAIConnection",
+    "ethereum": "src.connections.ethereum_connection:EthereumConnection",
+    "together": "src.connections.together_connection:TogetherAIConnection",
+    "evm": "src.connections.evm_connection:EVMConnection",
+    "perplexity": "src.connections.perplexity_connection:PerplexityConnection",
+}
+
+# Resolved connection classes and how long their first import took (seconds)
+_loaded_connection_types: Dict[str, Type[BaseConnection]] = {}
+_connection_import_times: Dict[str, float] = {}
+
+# Connections shared by every ConnectionManager in the process, keyed by
+# (connection name, effective config, credential fingerprint), so agents with
+# the same config and credentials share clients, caches and rate-limit budgets.
+# The refcount is the number of managers holding each connection.
+PoolKey = Tuple[str, str, str]
+_connection_pool: Dict[PoolKey, BaseConnection] = {}
+_connection_refcounts: Dict[PoolKey, int] = {}
+_connection_pool_lock = threading.Lock()
+
+
+def _pool_key(name: str, connection_class: Type[BaseConnection], config: Dict[str, Any]) -> Optional[PoolKey]:
+    """Key a connection is pooled under, or None if the config opts out with "shared": false"""
+    if not config.get("shared", True):
+        return None
+    config_key = json.dumps(config, sort_keys=True, default=str)
+    credentials = json.dumps([os.getenv(env_var) for env_var in connection_class.credential_env_vars])
+    return name, config_key, hashlib.sha256(credentials.encode("utf-8")).hexdigest()
+
 
 class ConnectionManager:
     def __init__(self, agent_config):
         self.connections: Dict[str, BaseConnection] = {}
+        self._pool_keys: Dict[str, Optional[PoolKey]] = {}
+        # Optional cache in front of generate-text, set from the agent's "llm_cache" config
+        self.response_cache: Optional[ResponseCache] = None
         for config in agent_config:
             self._register_connection(config)
 
     @staticmethod
     def _class_name_to_type(class_name: str) -> Type[BaseConnection]:
-        if class_name == "twitter":
-            return TwitterConnection
-        elif class_name == "anthropic":
-            return AnthropicConnection
-        elif class_name == "openai":
-            return OpenAIConnection
-        elif class_name == "farcaster":
-            return FarcasterConnection
-        elif class_name == "groq":
-            return GroqConnection
-        elif class_name == "eternalai":
-            return EternalAIConnection
-        elif class_name == "ollama":
-            return OllamaConnection
-        elif class_name == "echochambers":
-            return EchochambersConnection
-        elif class_name == "goat":
-            return GoatConnection
-        elif class_name == "solana":
-            return SolanaConnection
-        elif class_name == "hyperbolic":
-            return HyperbolicConnection
-        elif class_name == "galadriel":
-            return GaladrielConnection
-        elif class_name == "sonic":
-            return SonicConnection
-        elif class_name == "discord":
-            return DiscordConnection
-        elif class_name == "allora":
-            return AlloraConnection
-        elif class_name == "xai":
-            return XAIConnection
-        elif class_name == "ethereum":
-            return EthereumConnection
-        elif class_name == "together":
-            return TogetherAIConnection
-        elif class_name == "evm":
-            return EVMConnection
-        elif class_name == "perplexity":
-            return PerplexityConnection
-        return None
+        if class_name in _loaded_connection_types:
+            return _loaded_connection_types[class_name]
+
+        target = CONNECTION_REGISTRY.get(class_name)
+        if target is None:
+            return None
+
+        module_path, type_name = target.split(":")
+        start = time.perf_counter()
+        module = importlib.import_module(module_path)
+        elapsed = time.perf_counter() - start
+
+        connection_type = getattr(module, type_name)
+        _loaded_connection_types[class_name] = connection_type
+        _connection_import_times[class_name] = elapsed
+        logger.debug(f"Imported {class_name} connection from {module_path} in {elapsed * 1000:.1f} ms")
+        return connection_type
+
+    def close(self) -> None:
+        """Release this manager's connections; pooled ones are closed with their last holder"""
+        for name, connection in list(self.connections.items()):
+            key = self._pool_keys.get(name)
+            if key is None:
+                connection.close()
+                continue
+            with _connection_pool_lock:
+                remaining = _connection_refcounts.get(key, 1) - 1
+                if remaining <= 0:
+                    _connection_refcounts.pop(key, None)
+                    _connection_pool.pop(key, None)
+                else:
+                    _connection_refcounts[key] = remaining
+            if remaining <= 0:
+                connection.close()
+        self.connections.clear()
+        self._pool_keys.clear()
+
+    @staticmethod
+    def get_pool_stats() -> Dict[str, Any]:
+        """Pooled connection instances per type and how many managers share them"""
+        with _connection_pool_lock:
+            by_type: Dict[str, Dict[str, int]] = {}
+            for (name, _, _), refcount in _connection_refcounts.items():
+                entry = by_type.setdefault(name, {"instances": 0, "holders": 0})
+                entry["instances"] += 1
+                entry["holders"] += refcount
+            return {
+                "instances": len(_connection_pool),
+                "holders": sum(_connection_refcounts.values()),
+                "by_type": by_type,
+            }
+
+    @staticmethod
+    def get_import_times() -> Dict[str, float]:
+        """Get the time (in seconds) spent importing each connection module loaded so far"""
+        return dict(_connection_import_times)
 
     def _register_connection(self, config_dic: Dict[str, Any]) -> None:
         """
@@ -88,15 +142,30 @@ class ConnectionManager:
         try:
             name = config_dic["name"]
             connection_class = self._class_name_to_type(name)
-            connection = connection_class(config_dic)
+            if connection_class is None:
+                raise ValueError(f"Unknown connection type '{name}'")
+            key = _pool_key(name, connection_class, config_dic)
+            connection = _connection_pool.get(key) if key is not None else None
+            if connection is None:
+                # Constructed outside the lock so agents can be built in parallel
+                connection = connection_class(config_dic)
+            if key is not None:
+                with _connection_pool_lock:
+                    pooled = _connection_pool.setdefault(key, connection)
+                    _connection_refcounts[key] = _connection_refcounts.get(key, 0) + 1
+                if pooled is not connection:
+                    # Another agent registered the same connection first
+                    connection.close()
+                    connection = pooled
             self.connections[name] = connection
+            self._pool_keys[name] = key
         except Exception as e:
             logging.error(f"Failed to initialize connection {name}: {e}")
 
     def _check_connection(self, connection_string: str) -> bool:
         try:
             connection = self.connections[connection_string]
-            return connection.is_configured(verbose=True)
+            return connection.is_ready(verbose=True)
         except KeyError:
             logging.error(
                 "\nUnknown connection. Try 'list-connections' to see all supported connections."
@@ -111,6 +180,8 @@ class ConnectionManager:
         try:
             connection = self.connections[connection_name]
             success = connection.configure()
+            # Credentials may have changed, drop whatever we cached before
+            connection.invalidate_readiness()
 
             if success:
                 logging.info(
@@ -130,20 +201,31 @@ class ConnectionManager:
             return False
 
     def list_connections(self) -> None:
-        """List all available connections and their status"""
+        """List all available connections and their cached readiness (no live probes)"""
         logging.info("\nAVAILABLE CONNECTIONS:")
         for name, connection in self.connections.items():
-            status = (
-                "✅ Configured" if connection.is_configured() else "❌ Not Configured"
-            )
+            ready = connection.readiness_state()["ready"]
+            if ready is None:
+                status = "❔ Not checked yet"
+            elif ready:
+                status = "✅ Configured"
+            else:
+                status = "❌ Not Configured"
             logging.info(f"- {name}: {status}")
 
+    def get_readiness(self) -> Dict[str, Dict[str, Any]]:
+        """Get the cached readiness state of every connection without probing"""
+        return {
+            name: connection.readiness_state()
+            for name, connection in self.connections.items()
+        }
+
     def list_actions(self, connection_name: str) -> None:
         """List all available actions for a specific connection"""
         try:
             connection = self.connections[connection_name]
 
-            if connection.is_configured():
+            if connection.is_ready():
                 logging.info(
                     f"\n✅ {connection_name} is configured. You can use any of its actions."
                 )
@@ -167,6 +249,58 @@ class ConnectionManager:
         except Exception as e:
             logging.error(f"\nAn error occurred: {e}")
 
+    def _build_action_kwargs(
+        self, connection: BaseConnection, connection_name: str, action_name: str, params: List[Any]
+    ) -> Optional[Dict[str, Any]]:
+        """Map positional params onto the action's parameters, or None if they don't fit"""
+        if action_name not in connection.actions:
+            logging.error(
+                f"\nError: Unknown action '{action_name}' for connection '{connection_name}'"
+            )
+            return None
+
+        action = connection.actions[action_name]
+
+        # Convert list of params to kwargs dictionary, handling both required and optional params
+        kwargs = {}
+        param_index = 0
+
+        # Add provided parameters up to the number provided
+        for i, param in enumerate(action.parameters):
+            if param_index < len(params):
+                kwargs[param.name] = params[param_index]
+                param_index += 1
+
+        # Validate all required parameters are present
+        missing_required = [
+            param.name
+            for param in action.parameters
+            if param.required and param.name not in kwargs
+        ]
+
+        if missing_required:
+            logging.error(
+                f"\nError: Missing required parameters: {', '.join(missing_required)}"
+            )
+            return None
+
+        return kwargs
+
+    def _response_cache_key(
+        self, connection: BaseConnection, connection_name: str, action_name: str, kwargs: Dict[str, Any]
+    ) -> Optional[str]:
+        """Cache key for a generate-text call, or None if the call is not cacheable"""
+        if self.response_cache is None or action_name != "generate-text" or not connection.is_llm_provider:
+            return None
+        model = kwargs.get("model") or connection.config.get("model")
+        return self.response_cache.key(
+            connection_name, model, kwargs.get("system_prompt") or "", kwargs.get("prompt") or ""
+        )
+
+    def get_response_cache_stats(self) -> Optional[Dict[str, Any]]:
+        """Hit/miss counters of the generate-text cache, None when caching is off"""
+        return self.response_cache.stats() if self.response_cache is not None else None
+
     def perform_action(
         self, connection_name: str, action_name: str, params: List[Any]
     ) -> Optional[Any]:
@@ -174,44 +308,80 @@ class ConnectionManager:
         try:
             connection = self.connections[connection_name]
 
-            if not connection.is_configured():
+            if not connection.is_ready():
                 logging.error(
                     f"\nError: Connection '{connection_name}' is not configured"
                 )
                 return None
 
-            if action_name not in connection.actions:
-                logging.error(
-                    f"\nError: Unknown action '{action_name}' for connection '{connection_name}'"
-                )
+            kwargs = self._build_action_kwargs(connection, connection_name, action_name, params)
+            if kwargs is None:
                 return None
 
-            action = connection.actions[action_name]
+            cache_key = self._response_cache_key(connection, connection_name, action_name, kwargs)
+            if cache_key is not None:
+                cached = self.response_cache.get(cache_key)
+                if cached is not None:
+                    return cached
 
-            # Convert list of params to kwargs dictionary, handling both required and optional params
-            kwargs = {}
-            param_index = 0
+            try:
+                result = connection.perform_action(action_name, kwargs)
+            except Exception as e:
+                # Auth/transport failures mean the cached readiness is stale
+                connection.observe_action_error(e)
+                raise
 
-            # Add provided parameters up to the number provided
-            for i, param in enumerate(action.parameters):
-                if param_index < len(params):
-                    kwargs[param.name] = params[param_index]
-                    param_index += 1
+            if cache_key is not None and result is not None:
+                self.response_cache.set(cache_key, result)
+            return result
 
-            # Validate all required parameters are present
-            missing_required = [
-                param.name
-                for param in action.parameters
-                if param.required and param.name not in kwargs
-            ]
+        except Exception as e:
+            logging.error(
+                f"\nAn error occurred while trying action {action_name} for {connection_name} connection: {e}, traceback: {traceback.format_exc()}"
+            )
+            return None
+
+    async def aperform_action(
+        self, connection_name: str, action_name: str, params: List[Any]
+    ) -> Optional[Any]:
+        """Async counterpart of perform_action, safe to await from the event loop"""
+        try:
+            connection = self.connections[connection_name]
 
-            if missing_required:
+            # A stale readiness means a live probe, which is blocking
+            if connection.readiness_state()["stale"]:
+                ready = await run_blocking(connection.is_ready)
+            else:
+                ready = connection.is_ready()
+            if not ready:
                 logging.error(
-                    f"\nError: Missing required parameters: {', '.join(missing_required)}"
+                    f"\nError: Connection '{connection_name}' is not configured"
                 )
                 return None
 
-            return connection.perform_action(action_name, kwargs)
+            kwargs = self._build_action_kwargs(connection, connection_name, action_name, params)
+            if kwargs is None:
+                return None
+
+            cache = self.response_cache
+            cache_key = self._response_cache_key(connection, connection_name, action_name, kwargs)
+            if cache_key is not None:
+                cached = await run_blocking(cache.get, cache_key) if cache.blocking else cache.get(cache_key)
+                if cached is not None:
+                    return cached
+
+            try:
+                result = await connection.aperform_action(action_name, kwargs)
+            except Exception as e:
+                connection.observe_action_error(e)
+                raise
+
+            if cache_key is not None and result is not None:
+                if cache.blocking:
+                    await run_blocking(cache.set, cache_key, result)
+                else:
+                    cache.set(cache_key, result)
+            return result
 
         except Exception as e:
             logging.error(
@@ -224,5 +394,5 @@ class ConnectionManager:
         return [
             name
             for name, conn in self.connections.items()
-            if conn.is_configured() and getattr(conn, "is_llm_provider", lambda: False)
+            if conn.is_ready() and getattr(conn, "is_llm_provider", lambda: False)
         ]
@@ -1,13 +1,32 @@
 import logging
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple
 from dotenv import set_key
 from allora_sdk.v2.api_client import AlloraAPIClient, ChainSlug
 from src.connections.base_connection import BaseConnection, Action, ActionParameter
+from src.helpers.async_executor import BackgroundLoop
 import os
 import asyncio
+import atexit
+import threading
+import time
 
 logger = logging.getLogger("connections.allora_connection")
 
+# Topics change rarely, so list-topics results are reused for this long (seconds)
+DEFAULT_TOPICS_CACHE_TTL = 300
+
+
+def _parse_topic_ids(value) -> List[int]:
+    """Accept a list of topic ids or a comma separated string ("1,2,3")"""
+    if isinstance(value, int):
+        value = [value]
+    elif isinstance(value, str):
+        value = [part for part in value.split(",") if part.strip()]
+    topic_ids = [int(topic_id) for topic_id in value]
+    if not topic_ids:
+        raise ValueError("At least one topic id is required")
+    return topic_ids
+
 class AlloraConnectionError(Exception):
     """Base exception for Allora connection errors"""
     pass
@@ -21,10 +40,17 @@ class AlloraAPIError(AlloraConnectionError):
     pass
 
 class AlloraConnection(BaseConnection):
+    credential_env_vars = ("ALLORA_API_KEY",)
     def __init__(self, config: Dict[str, Any]):
         super().__init__(config)
         self._client = None
         self.chain_slug = config.get("chain_slug", ChainSlug.TESTNET)
+        # One loop for the connection's lifetime so the client's sessions are reused
+        self._background = BackgroundLoop("allora-loop")
+        self.topics_cache_ttl = config.get("topics_cache_ttl", DEFAULT_TOPICS_CACHE_TTL)
+        self._topics_cache: Optional[Tuple[float, Any]] = None
+        self._topics_lock = threading.Lock()
+        atexit.register(self.close)
 
     @property
     def is_llm_provider(self) -> bool:
@@ -52,6 +78,13 @@ class AlloraConnection(BaseConnection):
                 ],
                 description="Get inference from Allora Network for a specific topic"
             ),
+            Action(
+                name="get-inferences",
+                parameters=[
+                    ActionParameter("topic_ids", True, _parse_topic_ids, "Topic IDs to get inferences for, fetched concurrently")
+                ],
+                description="Get inferences from Allora Network for several topics in one call"
+            ),
             Action(
                 name="list-topics",
                 parameters=[],
@@ -65,16 +98,7 @@ class AlloraConnection(BaseConnection):
         try:
             client = self._get_client()
             method = getattr(client, method_name)
-            
-            # Create event loop for async calls
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            try:
-                response = loop.run_until_complete(method(*args, **kwargs))
-                return response
-            finally:
-                loop.close()
-                
+            return self._background.run(method(*args, **kwargs))
         except Exception as e:
             raise AlloraAPIError(f"API request failed: {str(e)}")
 
@@ -89,12 +113,63 @@ class AlloraConnection(BaseConnection):
         except Exception as e:
             raise AlloraAPIError(f"Failed to get inference: {str(e)}")
 
-    def list_topics(self) -> List[Dict[str, Any]]:
-        """List all available Allora Network topics"""
+    def get_inferences(self, topic_ids: List[int]) -> List[Dict[str, Any]]:
+        """
+        Get inferences for several topics concurrently.
+
+        A failing topic does not fail the whole call, its entry carries an
+        "error" instead of an "inference".
+        """
+        client = self._get_client()
+
+        async def fetch_all():
+            return await asyncio.gather(
+                *(client.get_inference_by_topic_id(topic_id) for topic_id in topic_ids),
+                return_exceptions=True
+            )
+
         try:
-            return self._make_request('get_all_topics')
+            responses = self._background.run(fetch_all())
         except Exception as e:
-            raise AlloraAPIError(f"Failed to list topics: {str(e)}")
+            raise AlloraAPIError(f"Failed to get inferences: {str(e)}")
+
+        results = []
+        for topic_id, response in zip(topic_ids, responses):
+            if isinstance(response, Exception):
+                logger.warning(f"Failed to get inference for topic {topic_id}: {response}")
+                results.append({"topic_id": topic_id, "error": str(response)})
+            else:
+                results.append({
+                    "topic_id": topic_id,
+                    "inference": response.inference_data.network_inference_normalized
+                })
+        return results
+
+    def list_topics(self) -> List[Dict[str, Any]]:
+        """List all available Allora Network topics, cached for topics_cache_ttl seconds"""
+        cached = self._topics_cache
+        if cached is not None and time.monotonic() - cached[0] < self.topics_cache_ttl:
+            return cached[1]
+
+        with self._topics_lock:
+            # Another thread may have refreshed the cache while we waited
+            cached = self._topics_cache
+            if cached is not None and time.monotonic() - cached[0] < self.topics_cache_ttl:
+                return cached[1]
+            try:
+                topics = self._make_request('get_all_topics')
+            except Exception as e:
+                raise AlloraAPIError(f"Failed to list topics: {str(e)}")
+            self._topics_cache = (time.monotonic(), topics)
+            return topics
+
+    def invalidate_topics_cache(self) -> None:
+        """Drop the cached list-topics result"""
+        self._topics_cache = None
+
+    def close(self) -> None:
+        """Stop the background loop"""
+        self._background.stop()
 
     def configure(self) -> bool:
         """Sets up Allora API authentication"""
@@ -113,6 +188,8 @@ class AlloraConnection(BaseConnection):
 
             # Save to .env file
             set_key('.env', 'ALLORA_API_KEY', api_key)
+            self._client = None
+            self.invalidate_topics_cache()
             print("\n✅ Allora API key saved successfully!")
             return True
             
@@ -2,7 +2,7 @@ import logging
 import os
 from typing import Dict, Any
 from dotenv import load_dotenv, set_key
-from anthropic import Anthropic, NotFoundError
+from anthropic import Anthropic, AsyncAnthropic, NotFoundError, APIConnectionError, AuthenticationError, PermissionDeniedError
 from src.connections.base_connection import BaseConnection, Action, ActionParameter
 
 logger = logging.getLogger("connections.anthropic_connection")
@@ -20,9 +20,13 @@ class AnthropicAPIError(AnthropicConnectionError):
     pass
 
 class AnthropicConnection(BaseConnection):
+    credential_env_vars = ("ANTHROPIC_API_KEY",)
+    readiness_errors = BaseConnection.readiness_errors + (AnthropicConfigurationError, APIConnectionError, AuthenticationError, PermissionDeniedError)
+
     def __init__(self, config: Dict[str, Any]):
         super().__init__(config)
         self._client = None
+        self._async_client = None
 
     @property
     def is_llm_provider(self) -> bool:
@@ -76,6 +80,15 @@ class AnthropicConnection(BaseConnection):
             self._client = Anthropic(api_key=api_key)
         return self._client
 
+    def _get_async_client(self) -> AsyncAnthropic:
+        """Get or create async Anthropic client"""
+        if not self._async_client:
+            api_key = os.getenv("ANTHROPIC_API_KEY")
+            if not api_key:
+                raise AnthropicConfigurationError("Anthropic API key not found in environment")
+            self._async_client = AsyncAnthropic(api_key=api_key)
+        return self._async_client
+
     def configure(self) -> bool:
         """Sets up Anthropic API authentication"""
         logger.info("\n🤖 ANTHROPIC API SETUP")
@@ -159,6 +172,37 @@ class AnthropicConnection(BaseConnection):
         except Exception as e:
             raise AnthropicAPIError(f"Text generation failed: {e}")
 
+    async def agenerate_text(self, prompt: str, system_prompt: str, model: str = None, **kwargs) -> str:
+        """Async variant of generate_text using Anthropic models"""
+        try:
+            client = self._get_async_client()
+            
+            # Use configured model if none provided
+            if not model:
+                model = self.config["model"]
+
+            message = await client.messages.create(
+                model=model,
+                max_tokens=1000,
+                temperature=0,
+                system=system_prompt,
+                messages=[
+                    {
+                        "role": "user",
+                        "content": [
+                            {
+                                "type": "text",
+                                "text": prompt
+                            }
+                        ]
+                    }
+                ]
+            )
+            return message.content[0].text
+            
+        except Exception as e:
+            raise AnthropicAPIError(f"Text generation failed: {e}")
+
     def check_model(self, model: str, **kwargs) -> bool:
         """Check if a specific model is available"""
         try:
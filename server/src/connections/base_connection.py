@@ -1,7 +1,15 @@
 import logging
+import threading
+import time
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Callable
+from typing import Any, Dict, List, Callable, Optional, Tuple, Type
 from dataclasses import dataclass
+from src.helpers.async_executor import run_blocking
+
+# Seconds a successful readiness probe is trusted before re-validating
+DEFAULT_READINESS_TTL = 300
+# Failed probes are retried sooner, since they are often transient
+DEFAULT_READINESS_FAILURE_TTL = 30
 
 @dataclass
 class ActionParameter:
@@ -28,9 +36,48 @@ class Action:
                     errors.append(f"Invalid type for {param.name}. Expected {param.type.__name__}")
         return errors
 
+@dataclass
+class ReadinessState:
+    ready: Optional[bool] = None
+    checked_at: Optional[float] = None
+    ttl: float = DEFAULT_READINESS_TTL
+    failure_ttl: float = DEFAULT_READINESS_FAILURE_TTL
+    last_error: Optional[str] = None
+
+    def is_fresh(self, now: Optional[float] = None) -> bool:
+        """Whether the cached result can be used without probing again"""
+        if self.ready is None or self.checked_at is None:
+            return False
+        now = time.time() if now is None else now
+        ttl = self.ttl if self.ready else self.failure_ttl
+        return now - self.checked_at < ttl
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "ready": self.ready,
+            "checked_at": self.checked_at,
+            "expires_at": None if self.checked_at is None else self.checked_at + (self.ttl if self.ready else self.failure_ttl),
+            "stale": not self.is_fresh(),
+            "last_error": self.last_error,
+        }
+
 class BaseConnection(ABC):
+    # Exceptions that, when seen anywhere in the cause chain of a failed action,
+    # mean the cached readiness can no longer be trusted (auth or transport problems).
+    # OSError covers socket errors as well as the requests exception hierarchy.
+    readiness_errors: Tuple[Type[BaseException], ...] = (OSError,)
+    # Environment variables holding this connection's credentials; part of the
+    # key under which ConnectionManager shares instances between agents
+    credential_env_vars: Tuple[str, ...] = ()
+
     def __init__(self, config):
         try:
+            # Cached result of is_configured(), see is_ready()
+            self._readiness = ReadinessState(
+                ttl=config.get("readiness_ttl", DEFAULT_READINESS_TTL),
+                failure_ttl=config.get("readiness_failure_ttl", DEFAULT_READINESS_FAILURE_TTL)
+            )
+            self._readiness_lock = threading.Lock()
             # Dictionary to store action name -> handler method mapping
             self.actions: Dict[str, Callable] = {}
             # Dictionary to store some essential configuration
@@ -84,6 +131,59 @@ class BaseConnection(ABC):
         """
         pass
 
+    def is_ready(self, verbose = False, force = False) -> bool:
+        """
+        Cached variant of is_configured().
+
+        The live probe only runs when there is no cached result, the cached result
+        has expired, it was invalidated, or force is set.
+
+        Returns:
+            bool: True if the connection is configured, False otherwise
+        """
+        if not force and self._readiness.is_fresh():
+            return self._readiness.ready
+
+        with self._readiness_lock:
+            # Another thread may have refreshed the state while we waited
+            if not force and self._readiness.is_fresh():
+                return self._readiness.ready
+            try:
+                ready = bool(self.is_configured(verbose=verbose))
+                self._readiness.last_error = None if ready else "Not configured"
+            except Exception as e:
+                ready = False
+                self._readiness.last_error = str(e)
+            self._readiness.ready = ready
+            self._readiness.checked_at = time.time()
+            return ready
+
+    def invalidate_readiness(self, reason: Optional[str] = None) -> None:
+        """Drop the cached readiness so the next is_ready() probes again"""
+        self._readiness.checked_at = None
+        if reason:
+            self._readiness.last_error = reason
+            logging.debug(f"Readiness invalidated for {type(self).__name__}: {reason}")
+
+    def readiness_state(self) -> Dict[str, Any]:
+        """Return the cached readiness without probing the remote service"""
+        return self._readiness.to_dict()
+
+    def observe_action_error(self, error: BaseException) -> None:
+        """Invalidate cached readiness if a failed action points at auth/transport trouble"""
+        seen = set()
+        current = error
+        while current is not None and id(current) not in seen:
+            if isinstance(current, self.readiness_errors):
+                self.invalidate_readiness(f"{type(current).__name__}: {current}")
+                return
+            seen.add(id(current))
+            current = current.__cause__ or current.__context__
+
+    def close(self) -> None:
+        """Release clients, loops or sockets held by the connection"""
+        pass
+
     @abstractmethod
     def register_actions(self) -> None:
         """
@@ -112,3 +212,21 @@ class BaseConnection(ABC):
             
         handler = self.actions[action_name]
         return handler(**kwargs)
+
+    async def aperform_action(self, action_name: str, kwargs) -> Any:
+        """
+        Async counterpart of perform_action.
+
+        If the connection implements a native coroutine for the action, named like
+        the action method with an "a" prefix (e.g. agenerate_text for generate-text),
+        it is awaited directly. Otherwise the sync perform_action runs on the shared,
+        bounded blocking executor so it never stalls the event loop.
+        """
+        native = getattr(self, "a" + action_name.replace('-', '_'), None)
+        if native is None or action_name not in self.actions:
+            return await run_blocking(self.perform_action, action_name, kwargs)
+
+        errors = self.actions[action_name].validate_params(kwargs)
+        if errors:
+            raise ValueError(f"Invalid parameters: {', '.join(errors)}")
+        return await native(**kwargs)
@@ -4,6 +4,7 @@ from typing import Dict, Any, List
 from collections import deque
 
 import requests
+from src.helpers.http_transport import http_transport
 from dotenv import load_dotenv
 from src.connections.base_connection import BaseConnection, Action, ActionParameter
 
@@ -211,7 +212,7 @@ class EchochambersConnection(BaseConnection):
 
         for attempt in range(3):
             try:
-                response = requests.request(method, url, timeout=10, **kwargs)
+                response = http_transport.request(method, url, timeout=10, **kwargs)
                 if response.status_code == 429:  # Rate limit
                     retry_after = int(response.headers.get('Retry-After', 60))
                     logger.warning(f"Rate limit hit, waiting {retry_after}s")
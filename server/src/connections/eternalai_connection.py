@@ -3,10 +3,10 @@ import os
 import json
 from typing import Dict, Any
 from dotenv import load_dotenv, set_key
-from openai import OpenAI
+from openai import OpenAI, APIConnectionError, AuthenticationError, PermissionDeniedError
 from src.connections.base_connection import BaseConnection, Action, ActionParameter
 from web3 import Web3
-import requests
+from src.helpers.http_transport import http_transport
 
 logger = logging.getLogger("connections.eternalai_connection")
 IPFS = "ipfs://"
@@ -30,6 +30,9 @@ class EternalAIAPIError(EternalAIConnectionError):
 
 
 class EternalAIConnection(BaseConnection):
+    credential_env_vars = ("EternalAI_API_KEY", "EternalAI_API_URL")
+    readiness_errors = BaseConnection.readiness_errors + (EternalAIConfigurationError, APIConnectionError, AuthenticationError, PermissionDeniedError)
+
     def __init__(self, config: Dict[str, Any]):
         super().__init__(config)
         self._client = None
@@ -147,12 +150,12 @@ class EternalAIConnection(BaseConnection):
     def get_on_chain_system_prompt_content(on_chain_data: str) -> str:
         if IPFS in on_chain_data:
             light_house = on_chain_data.replace(IPFS, LIGHTHOUSE_IPFS)
-            response = requests.get(light_house)
+            response = http_transport.get(light_house)
             if response.status_code == 200:
                 return response.text
             else:
                 gcs = on_chain_data.replace(IPFS, GCS_ETERNAL_AI_BASE_URL)
-                response = requests.get(gcs)
+                response = http_transport.get(gcs)
                 if response.status_code == 200:
                     return response.text
                 else:
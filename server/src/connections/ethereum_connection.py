@@ -1,13 +1,20 @@
 import logging
 import os
 import time
-import requests
-from typing import Dict, Any, Optional, Union
+from src.helpers.http_transport import http_transport
+from typing import Dict, Any, List, Optional, Union
 from dotenv import load_dotenv, set_key
 from web3 import Web3
 from web3.middleware import geth_poa_middleware
 from src.constants.networks import EVM_NETWORKS
-from src.constants.abi import ERC20_ABI
+from src.helpers.allowance_tracker import APPROVAL_POLICIES, MAX_UINT256, get_allowance_tracker
+from src.helpers.evm_batch import APPROVE, TRANSFER, erc20_calldata, get_portfolio, parse_address_list
+from src.helpers.fee_oracle import FeeOracle, get_fee_oracle
+from src.helpers.rpc_pool import PooledHTTPProvider, get_rpc_pool
+from src.helpers.swap_routes import get_swap_router
+from src.helpers.nonce_manager import PendingTransaction, get_transaction_pipeline
+from src.helpers.token_metadata import get_token_metadata_store
+from src.helpers.token_index import get_token_index
 from src.connections.base_connection import BaseConnection, Action, ActionParameter
 
 logger = logging.getLogger("connections.ethereum_connection")
@@ -17,6 +24,7 @@ class EthereumConnectionError(Exception):
     pass
 
 class EthereumConnection(BaseConnection):
+    credential_env_vars = ("ETH_PRIVATE_KEY",)
     def __init__(self, config: Dict[str, Any]):
         logger.info("Initializing Ethereum connection...")
         self._web3 = None
@@ -27,15 +35,33 @@ class EthereumConnection(BaseConnection):
         self.rpc_url = config.get("rpc")  # Get RPC from config
         if not self.rpc_url:
             self.rpc_url = EVM_NETWORKS[self.network]["rpc_url"]
+        self.rpc_urls = config.get("rpc_urls") or ([self.rpc_url] if config.get("rpc") else EVM_NETWORKS[self.network].get("rpc_urls", [self.rpc_url]))
+        # Seconds before a slow read is also sent to a second endpoint (None: no hedging)
+        self.rpc_hedge_after = config.get("rpc_hedge_after")
+        # Every read and write of the connection goes through the pool, including batched reads
+        self.rpc_pool = get_rpc_pool(self.rpc_urls, hedge_after=self.rpc_hedge_after)
             
         self.scanner_url = EVM_NETWORKS[self.network]["scanner_url"]
         self.chain_id = EVM_NETWORKS[self.network]["chain_id"]
+        self.native_symbol = EVM_NETWORKS[self.network]["native_symbol"]
         
         super().__init__(config)
         self._initialize_web3()
+        # symbol/decimals never change, so they are read once per chain and kept on disk
+        self.token_metadata = get_token_metadata_store(self.chain_id)
+        if config.get("token_list"):
+            self.token_metadata.prewarm_from_token_list(config["token_list"])
+        # Allowances only change through our own approvals and swaps, so they are tracked locally
+        self.allowances = get_allowance_tracker(self.chain_id)
+        self.approval_policy = config.get("approval_policy", "exact")
+        if self.approval_policy not in APPROVAL_POLICIES:
+            raise ValueError(f"Invalid approval_policy '{self.approval_policy}'. Must be one of: {', '.join(APPROVAL_POLICIES)}")
         
         # Kyberswap aggregator API for best swap routes
         self.aggregator_api = f"https://aggregator-api.kyberswap.com/{self.network}/api/v1"
+        self.swap_router = get_swap_router(self.aggregator_api, client_id="zerepy")
+        self._hot_pair_keys = []
+        self._register_hot_pairs(config.get("hot_pairs", []))
 
     def _get_explorer_link(self, tx_hash: str) -> str:
         """Generate block explorer link for transaction"""
@@ -46,7 +72,7 @@ class EthereumConnection(BaseConnection):
         if not self._web3:
             for attempt in range(3):
                 try:
-                    self._web3 = Web3(Web3.HTTPProvider(self.rpc_url))
+                    self._web3 = Web3(PooledHTTPProvider(self.rpc_pool))
                     self._web3.middleware_onion.inject(geth_poa_middleware, layer=0)
                     
                     if not self._web3.is_connected():
@@ -93,6 +119,14 @@ class EthereumConnection(BaseConnection):
                 ],
                 description="Get ETH or token balance"
             ),
+            "get-portfolio": Action(
+                name="get-portfolio",
+                parameters=[
+                    ActionParameter("tokens", False, parse_address_list, "Token addresses (comma separated)"),
+                    ActionParameter("wallets", False, parse_address_list, "Wallet addresses, the configured wallet if not provided")
+                ],
+                description="Get ETH and token balances of one or more wallets in a single request"
+            ),
             "transfer": Action(
                 name="transfer", 
                 parameters=[
@@ -200,41 +234,8 @@ class EthereumConnection(BaseConnection):
             return f"Failed to get address: {str(e)}"
 
     def _get_token_address(self, ticker: str) -> Optional[str]:
-        """Helper function to get token address from DEXScreener"""
-        try:
-            response = requests.get(
-                f"https://api.dexscreener.com/latest/dex/search?q={ticker}"
-            )
-            response.raise_for_status()
-
-            data = response.json()
-            if not data.get('pairs'):
-                return None
-
-            # Filter pairs for Ethereum network
-            eth_pairs = [
-                pair for pair in data["pairs"] 
-                if pair.get("chainId", "").lower() == "ethereum"
-            ]
-            
-            # Sort by liquidity/volume
-            eth_pairs.sort(
-                key=lambda x: float(x.get('liquidity', {}).get('usd', 0) or 0) * 
-                            float(x.get('volume', {}).get('h24', 0) or 0),
-                reverse=True
-            )
-
-            # Find exact ticker match
-            for pair in eth_pairs:
-                base_token = pair.get("baseToken", {})
-                if base_token.get("symbol", "").lower() == ticker.lower():
-                    return base_token.get("address")
-            
-            return None
-
-        except Exception as error:
-            logger.error(f"Error fetching token address: {str(error)}")
-            return None
+        """Token address from the local DEXScreener index of Ethereum"""
+        return get_token_index("ethereum").lookup(ticker)
 
     def get_token_by_ticker(self, ticker: str) -> str:
         try:
@@ -248,21 +249,25 @@ class EthereumConnection(BaseConnection):
         except Exception as error:
             return False
 
+    def _token_contract(self, token_address: str):
+        """Cached ERC-20 contract object"""
+        return self.token_metadata.contract(self._web3, token_address)
+
+    def _token_decimals(self, token_address: str) -> int:
+        """decimals() of a token, read from the chain only the first time"""
+        return self.token_metadata.decimals(self.rpc_pool, token_address)
+
     def _get_raw_balance(self, address: str, token_address: Optional[str] = None) -> float:
         """Helper function to get raw balance value"""
         if token_address and token_address.lower() != self.NATIVE_TOKEN.lower():
-            # Get ERC20 token balance
-            contract = self._web3.eth.contract(
-                address=Web3.to_checksum_address(token_address),
-                abi=ERC20_ABI
-            )
-            balance = contract.functions.balanceOf(
-                Web3.to_checksum_address(address)
-            ).call()
-            decimals = contract.functions.decimals().call()
-            return balanqce / (10 ** decimals)
+            # balanceOf and decimals in one round-trip
+            snapshot = get_portfolio(self.rpc_pool, [(address, token_address)], native_symbol=self.native_symbol, token_metadata=self.token_metadata)
+            self.token_metadata.remember(snapshot)
+            entry = snapshot["balances"][0]
+            if entry["balance"] is None:
+                raise EthereumConnectionError(f"Could not read {token_address} balance: {entry.get('error')}")
+            return entry["balance"]
         else:
-            # Get native ETH balance
             balance = self._web3.eth.get_balance(Web3.to_checksum_address(address))
             return self._web3.from_wei(balance, 'ether')
 
@@ -291,24 +296,19 @@ class EthereumConnection(BaseConnection):
                 raw_balance = self._web3.eth.get_balance(account.address)
                 return self._web3.from_wei(raw_balance, 'ether')
             
-            # Get token contract
-            token_contract = self._web3.eth.contract(
-                address=Web3.to_checksum_address(token_address), 
-                abi=ERC20_ABI 
-            )
-            
-            # Get token info
-            symbol = token_contract.functions.symbol().call()
-            decimals = token_contract.functions.decimals().call()
-            
-            # Get balance
-            raw_balance = token_contract.functions.balanceOf(account.address).call()
-            token_balance = raw_balance / (10 ** decimals)
+            # Get token info and balance in one round-trip
+            snapshot = get_portfolio(self.rpc_pool, [(account.address, token_address)], native_symbol=self.native_symbol, token_metadata=self.token_metadata)
+            self.token_metadata.remember(snapshot)
+            entry = snapshot["balances"][0]
+            if entry["balance"] is None:
+                return False
+            raw_balance = entry["raw"]
+            token_balance = entry["balance"]
             
             # Try to get ETH value using Kyberswap price API
             try:
                 kyber_url = f"{self.aggregator_api}/tokens/rates"
-                response = requests.get(kyber_url, params={
+                response = http_transport.get(kyber_url, params={
                     "tokenIn": token_address, 
                     "tokenOut": self.NATIVE_TOKEN, 
                     "amount": str(raw_balance) 
@@ -328,6 +328,21 @@ class EthereumConnection(BaseConnection):
         except Exception as e:
             return False
 
+    def get_portfolio(self, tokens: Optional[List[str]] = None, wallets: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        ETH and token balances of every wallet, read through Multicall3 in a
+        single round-trip and returned as one snapshot (see evm_batch.get_portfolio)
+        """
+        if not wallets:
+            private_key = os.getenv('ETH_PRIVATE_KEY')
+            if not private_key:
+                raise EthereumConnectionError("No wallet private key configured in .env")
+            wallets = [self._web3.eth.account.from_key(private_key).address]
+        pairs = [(wallet, token) for wallet in wallets for token in [None, *(tokens or [])]]
+        snapshot = get_portfolio(self.rpc_pool, pairs, native_symbol=self.native_symbol, token_metadata=self.token_metadata)
+        self.token_metadata.remember(snapshot)
+        return snapshot
+
     def _prepare_transfer_tx(
         self, 
         to_address: str,
@@ -339,37 +354,30 @@ class EthereumConnection(BaseConnection):
             private_key = os.getenv('ETH_PRIVATE_KEY')
             account = self._web3.eth.account.from_key(private_key)
             
-            # Get latest nonce and gas price
-            nonce = self._web3.eth.get_transaction_count(account.address)
-            gas_price = self._web3.eth.gas_price
+            # The nonce is assigned by the transaction pipeline when sending
+            fee_oracle = self._fee_oracle()
             
             if token_address and token_address.lower() != self.NATIVE_TOKEN.lower():
                 # Prepare ERC20 transfer
-                contract = self._web3.eth.contract(
-                    address=Web3.to_checksum_address(token_address),
-                    abi=ERC20_ABI
-                )
-                decimals = contract.functions.decimals().call()
+                decimals = self._token_decimals(token_address)
                 amount_raw = int(amount * (10 ** decimals))
                 
-                tx = contract.functions.transfer(
-                    Web3.to_checksum_address(to_address),
-                    amount_raw
-                ).build_transaction({
+                tx = {
                     'from': account.address,
-                    'nonce': nonce,
-                    'gasPrice': gas_price,
-                    'chainId': self.chain_id
-                })
+                    'to': Web3.to_checksum_address(token_address),
+                    'data': erc20_calldata(TRANSFER, to_address, amount_raw),
+                    'chainId': self.chain_id,
+                    **fee_oracle.fees()
+                }
+                tx['gas'] = fee_oracle.estimate_gas(tx)
             else:
                 # Prepare native ETH transfer
                 tx = {
-                    'nonce': nonce,
                     'to': Web3.to_checksum_address(to_address),
                     'value': self._web3.to_wei(amount, 'ether'),
                     'gas': 21000,  # Standard ETH transfer gas
-                    'gasPrice': gas_price,
-                    'chainId': self.chain_id
+                    'chainId': self.chain_id,
+                    **fee_oracle.fees()
                 }
             
             return tx
@@ -398,17 +406,52 @@ class EthereumConnection(BaseConnection):
             private_key = os.getenv('ETH_PRIVATE_KEY')
             account = self._web3.eth.account.from_key(private_key)
             
-            signed = account.sign_transaction(tx)
-            tx_hash = self._web3.eth.send_raw_transaction(signed.rawTransaction)
+            tx_hash = self._send_transaction(account, tx).tx_hash
             
             # Return explorer link
-            tx_url = self._get_explorer_link(tx_hash.hex())
+            tx_url = self._get_explorer_link(tx_hash)
             return tx_url
 
         except Exception as e:
             logger.error(f"Transfer failed: {str(e)}")
             raise
 
+    def _fee_oracle(self) -> FeeOracle:
+        """Background-polled fees and cached gas estimates of this chain"""
+        return get_fee_oracle(self._web3, self.chain_id)
+
+    def _send_transaction(self, account, tx: Dict[str, Any]) -> PendingTransaction:
+        """Sign and broadcast through the wallet's shared nonce-managed pipeline"""
+        return get_transaction_pipeline(self._web3, self.chain_id, account).submit(tx)
+
+    def _raw_amount(self, token: str, amount: float) -> int:
+        """Amount in the token's smallest unit"""
+        if token.lower() == self.NATIVE_TOKEN.lower():
+            return self._web3.to_wei(amount, 'ether')
+        return int(amount * (10 ** self._token_decimals(token)))
+
+    def _register_hot_pairs(self, hot_pairs: List[Dict[str, Any]]) -> None:
+        """
+        Keep routes ready for swaps the agent makes repeatedly, configured as
+        [{"token_in": ..., "token_out": ..., "amount": ..., "slippage": 0.5}]
+        """
+        private_key = os.getenv('ETH_PRIVATE_KEY')
+        sender = self._web3.eth.account.from_key(private_key).address if private_key else None
+        for pair in hot_pairs:
+            try:
+                amount_raw = self._raw_amount(pair["token_in"], pair["amount"])
+                self._hot_pair_keys.append(self.swap_router.add_hot_pair(
+                    pair["token_in"], pair["token_out"], amount_raw, sender, pair.get("slippage", 0.5)
+                ))
+            except Exception as e:
+                logger.warning(f"Skipping hot pair {pair}: {e}")
+
+    def close(self) -> None:
+        """Stop prefetching this connection's hot pairs; the shared router keeps running for others"""
+        for key in self._hot_pair_keys:
+            self.swap_router.remove_hot_pair(key)
+        self._hot_pair_keys = []
+
     def _get_swap_route(
         self,
         token_in: str,
@@ -416,40 +459,9 @@ class EthereumConnection(BaseConnection):
         amount: float,
         sender: str
     ) -> Dict:
-        """Get optimal swap route from Kyberswap API"""
+        """Get optimal swap route from Kyberswap API (reused for a few seconds, see SwapRouter)"""
         try:
-            url = f"{self.aggregator_api}/routes"
-            
-            # Convert amount to raw value with proper decimals
-            if token_in.lower() == self.NATIVE_TOKEN.lower():
-                amount_raw = self._web3.to_wei(amount, 'ether')
-            else:
-                token_contract = self._web3.eth.contract(
-                    address=Web3.to_checksum_address(token_in),
-                    abi=ERC20_ABI
-                )
-                decimals = token_contract.functions.decimals().call()
-                amount_raw = int(amount * (10 ** decimals))
-            
-            # Prepare API request
-            headers = {"x-client-id": "zerepy"}
-            params = {
-                "tokenIn": token_in,
-                "tokenOut": token_out,
-                "amountIn": str(amount_raw),
-                "to": sender,
-                "gasInclude": "true"
-            }
-            
-            response = requests.get(url, headers=headers, params=params)
-            response.raise_for_status()
-            
-            data = response.json()
-            if data.get("code") != 0:
-                raise ValueError(f"API error: {data.get('message')}")
-                
-            return data["data"]
-                
+            return self.swap_router.route(token_in, token_out, self._raw_amount(token_in, amount), sender)
         except Exception as e:
             logger.error(f"Failed to get swap route: {str(e)}")
             raise
@@ -467,39 +479,22 @@ class EthereumConnection(BaseConnection):
             private_key = os.getenv('ETH_PRIVATE_KEY')
             account = self._web3.eth.account.from_key(private_key)
             
-            url = f"{self.aggregator_api}/route/build"
-            headers = {"x-client-id": "zerepy"}
-            
-            payload = {
-                "routeSummary": route_data["routeSummary"],
-                "sender": account.address,
-                "recipient": account.address,
-                "slippageTolerance": int(slippage * 100),  # Convert to bps
-                "deadline": int(time.time() + 1200),  # 20 minutes
-                "source": "zerepy"
-            }
-            
-            response = requests.post(url, headers=headers, json=payload)
-            response.raise_for_status()
-            
-            data = response.json()
-            if data.get("code") != 0:
-                raise ValueError(f"API error: {data.get('message')}")
+            build = self.swap_router.build(route_data, account.address, account.address, slippage)
                 
             # Prepare transaction parameters
+            fee_oracle = self._fee_oracle()
             tx = {
                 'from': account.address,
                 'to': Web3.to_checksum_address(route_data["routerAddress"]),
-                'data': data["data"]["data"],
+                'data': build["data"],
                 'value': self._web3.to_wei(amount, 'ether') if token_in.lower() == self.NATIVE_TOKEN.lower() else 0,
-                'nonce': self._web3.eth.get_transaction_count(account.address),
-                'gasPrice': self._web3.eth.gas_price,
-                'chainId': self.chain_id
+                'chainId': self.chain_id,
+                **fee_oracle.fees()
             }
             
             # Estimate gas
             try:
-                gas_estimate = self._web3.eth.estimate_gas(tx)
+                gas_estimate = fee_oracle.estimate_gas(tx)
                 tx['gas'] = int(gas_estimate * 1.2)  # Add 20% buffer
             except Exception as e:
                 logger.warning(f"Gas estimation failed: {e}, using default gas limit")
@@ -511,64 +506,66 @@ class EthereumConnection(BaseConnection):
             logger.error(f"Failed to build swap transaction: {str(e)}")
             raise
 
-        def _handle_token_approval(
-            self,
-            token_address: str,
-            spender_address: str,
-            amount: int
-        ) -> Optional[str]:
-            """Handle token approval for spender, returns tx hash if approval needed"""
-            try:
-                private_key = os.getenv('ETH_PRIVATE_KEY')
-                account = self._web3.eth.account.from_key(private_key)
+    def _handle_token_approval(
+        self,
+        token_address: str,
+        spender_address: str,
+        amount: int
+    ) -> Optional[str]:
+        """Handle token approval for spender, returns tx hash if approval needed"""
+        try:
+            private_key = os.getenv('ETH_PRIVATE_KEY')
+            account = self._web3.eth.account.from_key(private_key)
+            
+            # A tracked allowance that covers the amount needs no allowance() read
+            if self.allowances.covers(account.address, token_address, spender_address, amount):
+                return None
+            token_contract = self._token_contract(token_address)
+            
+            # Check current allowance
+            current_allowance = token_contract.functions.allowance(
+                account.address,
+                spender_address
+            ).call()
+            self.allowances.set(account.address, token_address, spender_address, current_allowance)
+            
+            if current_allowance < amount:
+                approve_amount = MAX_UINT256 if self.approval_policy == "max" else amount
+                # Prepare approval transaction
+                fee_oracle = self._fee_oracle()
+                approve_tx = {
+                    'from': account.address,
+                    'to': Web3.to_checksum_address(token_address),
+                    'data': erc20_calldata(APPROVE, spender_address, approve_amount),
+                    'chainId': self.chain_id,
+                    **fee_oracle.fees()
+                }
                 
-                token_contract = self._web3.eth.contract(
-                    address=Web3.to_checksum_address(token_address),
-                    abi=ERC20_ABI
-                )
+                # Estimate gas for approval
+                try:
+                    gas_estimate = fee_oracle.estimate_gas(approve_tx)
+                    approve_tx['gas'] = int(gas_estimate * 1.1)  # Add 10% buffer
+                except Exception as e:
+                    logger.warning(f"Approval gas estimation failed: {e}, using default")
+                    approve_tx['gas'] = 100000  # Default gas for approvals
                 
-                # Check current allowance
-                current_allowance = token_contract.functions.allowance(
-                    account.address,
-                    spender_address
-                ).call()
+                # Send approval transaction
+                pending = self._send_transaction(account, approve_tx)
                 
-                if current_allowance < amount:
-                    # Prepare approval transaction
-                    approve_tx = token_contract.functions.approve(
-                        spender_address,
-                        amount
-                    ).build_transaction({
-                        'from': account.address,
-                        'nonce': self._web3.eth.get_transaction_count(account.address),
-                        'gasPrice': self._web3.eth.gas_price,
-                        'chainId': self.chain_id
-                    })
-                    
-                    # Estimate gas for approval
-                    try:
-                        gas_estimate = self._web3.eth.estimate_gas(approve_tx)
-                        approve_tx['gas'] = int(gas_estimate * 1.1)  # Add 10% buffer
-                    except Exception as e:
-                        logger.warning(f"Approval gas estimation failed: {e}, using default")
-                        approve_tx['gas'] = 100000  # Default gas for approvals
-                    
-                    # Sign and send approval transaction
-                    signed_approve = account.sign_transaction(approve_tx)
-                    tx_hash = self._web3.eth.send_raw_transaction(signed_approve.rawTransaction)
-                    
-                    # Wait for approval to be mined
-                    receipt = self._web3.eth.wait_for_transaction_receipt(tx_hash)
-                    if receipt['status'] != 1:
-                        raise ValueError("Token approval failed")
-                    
-                    return tx_hash.hex()
-                    
-                return None
+                # Wait for approval to be mined; the swap's gas estimate needs the allowance
+                receipt = pending.receipt()
+                if receipt['status'] != 1:
+                    raise ValueError("Token approval failed")
+                if not self.allowances.apply_receipt(receipt):
+                    self.allowances.set(account.address, token_address, spender_address, approve_amount)
+                
+                return pending.tx_hash
+                
+            return None
 
-            except Exception as e:
-                logger.error(f"Token approval failed: {str(e)}")
-                raise
+        except Exception as e:
+            logger.error(f"Token approval failed: {str(e)}")
+            raise
 
     def swap(
         self,
@@ -604,11 +601,7 @@ class EthereumConnection(BaseConnection):
                 if token_in.lower() == "0xc02aaa39b223fe8d0a0e5c4f27ead9083c756cc2".lower():  # WETH
                     amount_raw = self._web3.to_wei(amount, 'ether')
                 else:
-                    token_contract = self._web3.eth.contract(
-                        address=Web3.to_checksum_address(token_in),
-                        abi=ERC20_ABI
-                    )
-                    decimals = token_contract.functions.decimals().call()
+                    decimals = self._token_decimals(token_in)
                     amount_raw = int(amount * (10 ** decimals))
                     
                 approval_hash = self._handle_token_approval(token_in, router_address, amount_raw)
@@ -617,10 +610,12 @@ class EthereumConnection(BaseConnection):
             
             # Build and send swap transaction
             swap_tx = self._build_swap_tx(token_in, token_out, amount, slippage, route_data)
-            signed_tx = account.sign_transaction(swap_tx)
-            tx_hash = self._web3.eth.send_raw_transaction(signed_tx.rawTransaction)
+            pending = self._send_transaction(account, swap_tx)
+            if token_in.lower() != self.NATIVE_TOKEN.lower():
+                self.allowances.watch_spend(pending, account.address, token_in, router_address, amount_raw)
+            tx_hash = pending.tx_hash
 
-            tx_url = self._get_explorer_link(tx_hash.hex())
+            tx_url = self._get_explorer_link(tx_hash)
             
             return (f"Swap transaction sent!(allow time for scanner to populate it):\n"
                     f"Transaction: {tx_url}")
@@ -635,7 +630,7 @@ class EthereumConnection(BaseConnection):
 
         load_dotenv()
         
-        if not self.is_configured(verbose=True):
+        if not self.is_ready(verbose=True):
             raise EthereumConnectionError("Ethereum connection is not properly configured")
 
         action = self.actions[action_name]
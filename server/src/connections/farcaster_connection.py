@@ -21,6 +21,9 @@ class FarcasterAPIError(FarcasterConnectionError):
     pass
 
 class FarcasterConnection(BaseConnection):
+    credential_env_vars = ("FARCASTER_MNEMONIC",)
+    readiness_errors = BaseConnection.readiness_errors + (FarcasterConfigurationError,)
+
     def __init__(self, config: Dict[str, Any]):
         logger.info("Initializing Farcaster connection...")
         super().__init__(config)
@@ -168,6 +171,7 @@ class FarcasterConnection(BaseConnection):
 
             logger.info("Saving recovery phrase to .env file...")
             set_key('.env', 'FARCASTER_MNEMONIC', recovery_phrase)
+            self._client = None
 
             # Simple validation of token format
             if not recovery_phrase.strip():
@@ -187,7 +191,9 @@ class FarcasterConnection(BaseConnection):
         try:
             credentials = self._get_credentials()
 
-            self._client = Warpcast(mnemonic=credentials['FARCASTER_MNEMONIC'])
+            # Reuse the client across probes, it is only rebuilt after (re)configuration
+            if self._client is None:
+                self._client = Warpcast(mnemonic=credentials['FARCASTER_MNEMONIC'])
 
             self._client.get_me()
             logger.debug("Farcaster configuration is valid")
@@ -2,9 +2,9 @@ import logging
 import os
 from typing import Dict, Any
 
-import requests
+from src.helpers.http_transport import http_transport
 from dotenv import load_dotenv, set_key
-from openai import OpenAI
+from openai import OpenAI, AsyncOpenAI, APIConnectionError, AuthenticationError, PermissionDeniedError
 from src.connections.base_connection import BaseConnection, Action, ActionParameter
 
 logger = logging.getLogger("connections.galadriel_connection")
@@ -24,9 +24,13 @@ class GaladrielAPIError(GaladrielConnectionError):
 API_BASE_URL = "https://api.galadriel.com/v1/verified"
 
 class GaladrielConnection(BaseConnection):
+    credential_env_vars = ("GALADRIEL_API_KEY", "GALADRIEL_FINE_TUNE_API_KEY")
+    readiness_errors = BaseConnection.readiness_errors + (GaladrielConfigurationError, APIConnectionError, AuthenticationError, PermissionDeniedError)
+
     def __init__(self, config: Dict[str, Any]):
         super().__init__(config)
         self._client = None
+        self._async_client = None
 
     @property
     def is_llm_provider(self) -> bool:
@@ -73,6 +77,19 @@ class GaladrielConnection(BaseConnection):
             self._client = OpenAI(api_key=api_key, base_url=API_BASE_URL, default_headers=headers)
         return self._client
 
+    def _get_async_client(self) -> AsyncOpenAI:
+        """Get or create async Galadriel client"""
+        if not self._async_client:
+            api_key = os.getenv("GALADRIEL_API_KEY")
+            if not api_key:
+                raise GaladrielConfigurationError("Galadriel API key not found in environment")
+
+            headers = {}
+            if fine_tune_api_key := os.getenv("GALADRIEL_FINE_TUNE_API_KEY"):
+                headers["Fine-Tune-Authorization"] = f"Bearer {fine_tune_api_key}"
+            self._async_client = AsyncOpenAI(api_key=api_key, base_url=API_BASE_URL, default_headers=headers)
+        return self._async_client
+
     def configure(self) -> bool:
         """Sets up Galadriel API authentication"""
         logger.info("\n🤖 GALADRIEL API SETUP")
@@ -127,7 +144,7 @@ class GaladrielConnection(BaseConnection):
             return False
 
     def _is_api_key_valid(self, api_key):
-        response = requests.get(
+        response = http_transport.get(
             f"{API_BASE_URL}/chat/completions",
             headers={
                 "Authorization": f"Bearer {api_key}"
@@ -158,6 +175,28 @@ class GaladrielConnection(BaseConnection):
         except Exception as e:
             raise GaladrielAPIError(f"Text generation failed: {e}")
 
+    async def agenerate_text(self, prompt: str, system_prompt: str, model: str = None, **kwargs) -> str:
+        """Async variant of generate_text using Galadriel models"""
+        try:
+            client = self._get_async_client()
+
+            # Use configured model if none provided
+            if not model:
+                model = self.config["model"]
+
+            completion = await client.chat.completions.create(
+                model=model,
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": prompt},
+                ],
+            )
+
+            return completion.choices[0].message.content
+
+        except Exception as e:
+            raise GaladrielAPIError(f"Text generation failed: {e}")
+
     def perform_action(self, action_name: str, kwargs) -> Any:
         """Execute an action with validation"""
         if action_name not in self.actions:
@@ -30,6 +30,7 @@ class GoatConfigurationError(GoatConnectionError):
 
 
 class GoatConnection(BaseConnection):
+    credential_env_vars = ("GOAT_RPC_PROVIDER_URL", "GOAT_WALLET_PRIVATE_KEY")
     def __init__(self, config: Dict[str, Any]):
         logger.info("🐐 Initializing Goat connection...")
 
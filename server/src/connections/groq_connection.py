@@ -2,7 +2,7 @@ import logging
 import os
 from typing import Dict, Any
 from dotenv import load_dotenv, set_key
-from openai import OpenAI
+from openai import OpenAI, AsyncOpenAI, APIConnectionError, AuthenticationError, PermissionDeniedError
 from src.connections.base_connection import BaseConnection, Action, ActionParameter
 
 logger = logging.getLogger("connections.groq_connection")
@@ -20,9 +20,13 @@ class GroqAPIError(GroqConnectionError):
     pass
 
 class GroqConnection(BaseConnection):
+    credential_env_vars = ("GROQ_API_KEY",)
+    readiness_errors = BaseConnection.readiness_errors + (GroqConfigurationError, APIConnectionError, AuthenticationError, PermissionDeniedError)
+
     def __init__(self, config: Dict[str, Any]):
         super().__init__(config)
         self._client = None
+        self._async_client = None
 
     @property
     def is_llm_provider(self) -> bool:
@@ -80,6 +84,18 @@ class GroqConnection(BaseConnection):
             )
         return self._client
 
+    def _get_async_client(self) -> AsyncOpenAI:
+        """Get or create async Groq client"""
+        if not self._async_client:
+            api_key = os.getenv("GROQ_API_KEY")
+            if not api_key:
+                raise GroqConfigurationError("Groq API key not found in environment")
+            self._async_client = AsyncOpenAI(
+                api_key=api_key,
+                base_url="https://api.groq.com/openai/v1"
+            )
+        return self._async_client
+
     def configure(self) -> bool:
         """Sets up Groq API authentication"""
         logger.info("\n🤖 GROQ API SETUP")
@@ -160,6 +176,29 @@ class GroqConnection(BaseConnection):
         except Exception as e:
             raise GroqAPIError(f"Text generation failed: {e}")
 
+    async def agenerate_text(self, prompt: str, system_prompt: str, model: str = None, **kwargs) -> str:
+        """Async variant of generate_text using Groq models"""
+        try:
+            client = self._get_async_client()
+            
+            # Use configured model if none provided
+            if not model:
+                model = self.config["model"]
+
+            completion = await client.chat.completions.create(
+                model=model,
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": prompt},
+                ],
+                
+            )
+
+            return completion.choices[0].message.content
+            
+        except Exception as e:
+            raise GroqAPIError(f"Text generation failed: {e}")
+
     def check_model(self, model: str, **kwargs) -> bool:
         """Check if a specific model is available"""
         try:
@@ -199,7 +238,7 @@ class GroqConnection(BaseConnection):
         # Explicitly reload environment variables
         load_dotenv()
         
-        if not self.is_configured(verbose=True):
+        if not self.is_ready(verbose=True):
             raise GroqConfigurationError("Groq is not properly configured")
 
         action = self.actions[action_name]
@@ -2,7 +2,7 @@ import logging
 import os
 from typing import Dict, Any
 from dotenv import load_dotenv, set_key
-from openai import OpenAI
+from openai import OpenAI, AsyncOpenAI, APIConnectionError, AuthenticationError, PermissionDeniedError
 from src.connections.base_connection import BaseConnection, Action, ActionParameter
 
 logger = logging.getLogger("connections.hyperbolic_connection")
@@ -20,9 +20,13 @@ class HyperbolicAPIError(HyperbolicConnectionError):
     pass
 
 class HyperbolicConnection(BaseConnection):
+    credential_env_vars = ("HYPERBOLIC_API_KEY",)
+    readiness_errors = BaseConnection.readiness_errors + (HyperbolicConfigurationError, APIConnectionError, AuthenticationError, PermissionDeniedError)
+
     def __init__(self, config: Dict[str, Any]):
         super().__init__(config)
         self._client = None
+        self._async_client = None
 
     @property
     def is_llm_provider(self) -> bool:
@@ -81,6 +85,18 @@ class HyperbolicConnection(BaseConnection):
             )
         return self._client
 
+    def _get_async_client(self) -> AsyncOpenAI:
+        """Get or create async Hyperbolic client"""
+        if not self._async_client:
+            api_key = os.getenv("HYPERBOLIC_API_KEY")
+            if not api_key:
+                raise HyperbolicConfigurationError("Hyperbolic API key not found in environment")
+            self._async_client = AsyncOpenAI(
+                api_key=api_key,
+                base_url="https://api.hyperbolic.xyz/v1"
+            )
+        return self._async_client
+
     def configure(self) -> bool:
         """Sets up Hyperbolic API authentication"""
         logger.info("\n🤖 HYPERBOLIC API SETUP")
@@ -163,6 +179,28 @@ class HyperbolicConnection(BaseConnection):
         except Exception as e:
             raise HyperbolicAPIError(f"Text generation failed: {e}")
 
+    async def agenerate_text(self, prompt: str, system_prompt: str, model: str = None, **kwargs) -> str:
+        """Async variant of generate_text using Hyperbolic models"""
+        try:
+            client = self._get_async_client()
+            
+            # Use configured model if none provided
+            if not model:
+                model = self.config["model"]
+
+            completion = await client.chat.completions.create(
+                model=model,
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": prompt},
+                ],
+            )
+
+            return completion.choices[0].message.content
+            
+        except Exception as e:
+            raise HyperbolicAPIError(f"Text generation failed: {e}")
+
     def check_model(self, model: str, **kwargs) -> bool:
         """Check if a specific model is available"""
         try:
@@ -202,7 +240,7 @@ class HyperbolicConnection(BaseConnection):
         # Explicitly reload environment variables
         load_dotenv()
         
-        if not self.is_configured(verbose=True):
+        if not self.is_ready(verbose=True):
             raise HyperbolicConfigurationError("Hyperbolic is not properly configured")
 
         action = self.actions[action_name]
@@ -1,5 +1,5 @@
 import logging
-import requests
+from src.helpers.http_transport import http_transport, async_http_transport
 import json
 from typing import Dict, Any
 from src.connections.base_connection import BaseConnection, Action, ActionParameter
@@ -79,7 +79,7 @@ class OllamaConnection(BaseConnection):
         """Test if Ollama is reachable"""
         try:
             url = f"{self.base_url}/v1/models"
-            response = requests.get(url)
+            response = http_transport.get(url)
             if response.status_code != 200:
                 raise OllamaAPIError(f"Failed to connect to Ollama: {response.status_code} - {response.text}")
         except Exception as e:
@@ -104,7 +104,7 @@ class OllamaConnection(BaseConnection):
                 "prompt": prompt,
                 "system": system_prompt,
             }
-            response = requests.post(url, json=payload, stream=True)
+            response = http_transport.post(url, json=payload, stream=True)
 
             if response.status_code != 200:
                 raise OllamaAPIError(f"API error: {response.status_code} - {response.text}")
@@ -128,6 +128,34 @@ class OllamaConnection(BaseConnection):
         except Exception as e:
             raise OllamaAPIError(f"Text generation failed: {e}")
 
+    async def agenerate_text(self, prompt: str, system_prompt: str, model: str = None, **kwargs) -> str:
+        """Async variant of generate_text, reading the stream on the event loop"""
+        try:
+            url = f"{self.base_url}/api/generate"
+            payload = {
+                "model": model or self.config["model"],
+                "prompt": prompt,
+                "system": system_prompt,
+            }
+            async with async_http_transport.request("POST", url, json=payload) as response:
+                if response.status != 200:
+                    raise OllamaAPIError(f"API error: {response.status} - {await response.text()}")
+
+                full_response = ""
+                async for line in response.content:
+                    line = line.strip()
+                    if line:
+                        try:
+                            data = json.loads(line.decode("utf-8"))
+                            full_response += data.get("response", "")
+                        except json.JSONDecodeError as e:
+                            raise OllamaAPIError(f"Failed to parse JSON: {e}")
+
+            return full_response
+
+        except Exception as e:
+            raise OllamaAPIError(f"Text generation failed: {e}")
+
     def perform_action(self, action_name: str, kwargs) -> Any:
         if action_name not in self.actions:
             raise KeyError(f"Unknown action: {action_name}")
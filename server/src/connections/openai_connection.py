@@ -2,7 +2,7 @@ import logging
 import os
 from typing import Dict, Any
 from dotenv import load_dotenv, set_key
-from openai import OpenAI
+from openai import OpenAI, AsyncOpenAI, APIConnectionError, AuthenticationError, PermissionDeniedError
 from src.connections.base_connection import BaseConnection, Action, ActionParameter
 
 logger = logging.getLogger("connections.openai_connection")
@@ -20,9 +20,13 @@ class OpenAIAPIError(OpenAIConnectionError):
     pass
 
 class OpenAIConnection(BaseConnection):
+    credential_env_vars = ("OPENAI_API_KEY",)
+    readiness_errors = BaseConnection.readiness_errors + (OpenAIConfigurationError, APIConnectionError, AuthenticationError, PermissionDeniedError)
+
     def __init__(self, config: Dict[str, Any]):
         super().__init__(config)
         self._client = None
+        self._async_client = None
 
     @property
     def is_llm_provider(self) -> bool:
@@ -77,6 +81,15 @@ class OpenAIConnection(BaseConnection):
             self._client = OpenAI(api_key=api_key)
         return self._client
 
+    def _get_async_client(self) -> AsyncOpenAI:
+        """Get or create async OpenAI client"""
+        if not self._async_client:
+            api_key = os.getenv("OPENAI_API_KEY")
+            if not api_key:
+                raise OpenAIConfigurationError("OpenAI API key not found in environment")
+            self._async_client = AsyncOpenAI(api_key=api_key)
+        return self._async_client
+
     def configure(self) -> bool:
         """Sets up OpenAI API authentication"""
         logger.info("\n🤖 OPENAI API SETUP")
@@ -152,6 +165,28 @@ class OpenAIConnection(BaseConnection):
         except Exception as e:
             raise OpenAIAPIError(f"Text generation failed: {e}")
 
+    async def agenerate_text(self, prompt: str, system_prompt: str, model: str = None, **kwargs) -> str:
+        """Async variant of generate_text using OpenAI models"""
+        try:
+            client = self._get_async_client()
+            
+            # Use configured model if none provided
+            if not model:
+                model = self.config["model"]
+
+            completion = await client.chat.completions.create(
+                model=model,
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": prompt},
+                ],
+            )
+
+            return completion.choices[0].message.content
+            
+        except Exception as e:
+            raise OpenAIAPIError(f"Text generation failed: {e}")
+
     def check_model(self, model, **kwargs):
         try:
             client = self._get_client()
@@ -2,7 +2,7 @@ import logging
 import os
 from typing import Dict, Any
 from dotenv import load_dotenv, set_key
-from openai import OpenAI
+from openai import OpenAI, APIConnectionError, AuthenticationError, PermissionDeniedError
 from src.connections.base_connection import BaseConnection, Action, ActionParameter
 
 logger = logging.getLogger("connections.perplexity_connection")
@@ -24,6 +24,9 @@ class PerplexityConfigurationError(PerplexityConnectionError):
 
 
 class PerplexityConnection(BaseConnection):
+    credential_env_vars = ("PERPLEXITY_API_KEY",)
+    readiness_errors = BaseConnection.readiness_errors + (PerplexityConfigurationError, APIConnectionError, AuthenticationError, PermissionDeniedError)
+
     def __init__(self, config: Dict[str, Any]):
         super().__init__(config)
         self._client = None
@@ -1,10 +1,11 @@
 import logging
 import os
 import requests
-import asyncio
+import atexit
 from typing import Dict, Any, Optional
 
 from src.connections.base_connection import BaseConnection, Action, ActionParameter
+from src.helpers.async_executor import BackgroundLoop
 from src.types import JupiterTokenData
 from src.constants import LAMPORTS_PER_SOL, SPL_TOKENS
 from src.helpers.solana.pumpfun import PumpfunTokenManager
@@ -44,17 +45,31 @@ class SolanaConfigurationError(SolanaConnectionError):
 
 
 class SolanaConnection(BaseConnection):
+    credential_env_vars = ("SOLANA_PRIVATE_KEY",)
     def __init__(self, config: Dict[str, Any]):
         logger.info("Initializing Solana connection...")
         super().__init__(config)
+        # Background event loop owned by this connection; the RPC client and
+        # Jupiter instance live on it so their HTTP sessions are reused
+        self._background = BackgroundLoop("solana-loop")
+        self._async_client: Optional[AsyncClient] = None
+        self._jupiter: Optional[Jupiter] = None
+        self._jupiter_owner = None
+        atexit.register(self.close)
 
     @property
     def is_llm_provider(self) -> bool:
         return False
 
+    def _run(self, coro) -> Any:
+        """Run a coroutine on the background loop and wait for its result"""
+        return self._background.run(coro)
+
     def _get_connection_async(self) -> AsyncClient:
-        conn = AsyncClient(self.config["rpc"])
-        return conn
+        """Get the shared RPC client, bound to the background loop"""
+        if self._async_client is None:
+            self._async_client = AsyncClient(self.config["rpc"])
+        return self._async_client
 
     def _get_wallet(self):
         creds = self._get_credentials()
@@ -83,6 +98,9 @@ class SolanaConnection(BaseConnection):
         return credentials
 
     def _get_jupiter(self, keypair, async_client):
+        # Rebuilt only when the wallet changes (e.g. after reconfiguration)
+        if self._jupiter is not None and self._jupiter_owner == keypair.pubkey():
+            return self._jupiter
         jupiter = Jupiter(
             async_client=async_client,
             keypair=keypair,
@@ -94,8 +112,17 @@ class SolanaConnection(BaseConnection):
             query_order_history_api_url="https://jup.ag/api/limit/v1/orderHistory",
             query_trade_history_api_url="https://jup.ag/api/limit/v1/tradeHistory",
         )
+        self._jupiter = jupiter
+        self._jupiter_owner = keypair.pubkey()
         return jupiter
 
+    def close(self) -> None:
+        """Close the RPC client and stop the background loop"""
+        client, self._async_client = self._async_client, None
+        self._jupiter = None
+        self._jupiter_owner = None
+        self._background.stop(client.close if client is not None else None)
+
     def validate_config(self, config: Dict[str, Any]) -> Dict[str, Any]:
         """Validate Solana configuration from JSON"""
         required_fields = ["rpc"]
@@ -245,6 +272,7 @@ class SolanaConnection(BaseConnection):
 
             set_key(".env", "SOLANA_PRIVATE_KEY", private_key)
             load_dotenv(override=True)
+            self._jupiter = None
 
             logger.info("\n✅ Solana configuration successfully saved!")
             logger.info("Your private key has been stored in the .env file.")
@@ -293,7 +321,7 @@ class SolanaConnection(BaseConnection):
             amount,
             token_mint,
         )
-        res = asyncio.run(res)
+        res = self._run(res)
         logger.debug(f"Transferred {amount} to {to_address}\nTransaction ID: {res}")
         return res
 
@@ -318,7 +346,7 @@ class SolanaConnection(BaseConnection):
             input_mint,
             slippage_bps,
         )
-        res = asyncio.run(res)
+        res = self._run(res)
         return res
 
     def get_balance(self, token_address: str = None) -> float:
@@ -329,7 +357,7 @@ class SolanaConnection(BaseConnection):
         res = SolanaReadHelper.get_balance(
             self._get_connection_async(), self._get_wallet(), token_address
         )
-        res = asyncio.run(res)
+        res = self._run(res)
         return res
 
     def stake(self, amount: float) -> str:
@@ -337,7 +365,7 @@ class SolanaConnection(BaseConnection):
         res = StakeManager.stake_with_jup(
             self._get_connection_async(), self._get_wallet(), amount
         )
-        res = asyncio.run(res)
+        res = self._run(res)
         logger.debug(f"Staked {amount} SOL\nTransaction ID: {res}")
         return res
 
@@ -354,8 +382,10 @@ class SolanaConnection(BaseConnection):
 
     def request_faucet(self) -> str:
         logger.info("Requesting faucet funds")
-        res = FaucetManager.request_faucet_funds(self)
-        res = asyncio.run(res)
+        res = FaucetManager.request_faucet_funds(
+            self._get_connection_async(), self._get_wallet()
+        )
+        res = self._run(res)
         logger.debug(f"Requested faucet funds\nTransaction ID: {res}")
         return res
 
@@ -377,7 +407,7 @@ class SolanaConnection(BaseConnection):
     # todo: test on mainnet
     def get_tps(self) -> int:
         res = SolanaPerformanceTracker.fetch_current_tps(self._get_connection_async())
-        res = asyncio.run(res)
+        res = self._run(res)
         return res
 
     def get_token_by_ticker(self, ticker: str) -> str:
@@ -1,12 +1,18 @@
 import logging
 import os
-import requests
-import time
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 from dotenv import load_dotenv, set_key
 from web3 import Web3
 from web3.middleware import geth_poa_middleware
 from src.constants.abi import ERC20_ABI
+from src.helpers.allowance_tracker import APPROVAL_POLICIES, MAX_UINT256, get_allowance_tracker
+from src.helpers.evm_batch import APPROVE, TRANSFER, erc20_calldata, get_portfolio, parse_address_list
+from src.helpers.fee_oracle import FeeOracle, get_fee_oracle
+from src.helpers.rpc_pool import PooledHTTPProvider, get_rpc_pool
+from src.helpers.swap_routes import get_swap_router
+from src.helpers.nonce_manager import PendingTransaction, get_transaction_pipeline
+from src.helpers.token_metadata import get_token_metadata_store
+from src.helpers.token_index import get_token_index, rank_by_fdv
 from src.connections.base_connection import BaseConnection, Action, ActionParameter
 from src.constants.networks import SONIC_NETWORKS
 
@@ -18,6 +24,7 @@ class SonicConnectionError(Exception):
     pass
 
 class SonicConnection(BaseConnection):
+    credential_env_vars = ("SONIC_PRIVATE_KEY",)
     
     def __init__(self, config: Dict[str, Any]):
         logger.info("Initializing Sonic connection...")
@@ -31,12 +38,31 @@ class SonicConnection(BaseConnection):
         network_config = SONIC_NETWORKS[network]
         self.explorer = network_config["scanner_url"]
         self.rpc_url = network_config["rpc_url"]
+        self.rpc_urls = config.get("rpc_urls") or network_config.get("rpc_urls", [self.rpc_url])
+        # Seconds before a slow read is also sent to a second endpoint (None: no hedging)
+        self.rpc_hedge_after = config.get("rpc_hedge_after")
+        # Every read and write of the connection goes through the pool, including batched reads
+        self.rpc_pool = get_rpc_pool(self.rpc_urls, hedge_after=self.rpc_hedge_after)
+        # Known for mainnet and testnet; a custom network takes it from its node
+        self.chain_id = network_config.get("chain_id")
         
         super().__init__(config)
         self._initialize_web3()
+        # symbol/decimals never change, so they are read once per chain and kept on disk
+        self.token_metadata = get_token_metadata_store(self.chain_id)
+        if config.get("token_list"):
+            self.token_metadata.prewarm_from_token_list(config["token_list"])
+        # Allowances only change through our own approvals and swaps, so they are tracked locally
+        self.allowances = get_allowance_tracker(self.chain_id)
+        self.approval_policy = config.get("approval_policy", "exact")
+        if self.approval_policy not in APPROVAL_POLICIES:
+            raise ValueError(f"Invalid approval_policy '{self.approval_policy}'. Must be one of: {', '.join(APPROVAL_POLICIES)}")
         self.ERC20_ABI = ERC20_ABI
         self.NATIVE_TOKEN = "0xEeeeeEeeeEeEeeEeEeEeeEEEeeeeEeeeeeeeEEeE"
         self.aggregator_api = "https://aggregator-api.kyberswap.com/sonic/api/v1"
+        self.swap_router = get_swap_router(self.aggregator_api, client_id="ZerePyBot")
+        self._hot_pair_keys = []
+        self._register_hot_pairs(config.get("hot_pairs", []))
 
     def _get_explorer_link(self, tx_hash: str) -> str:
         """Generate block explorer link for transaction"""
@@ -45,16 +71,23 @@ class SonicConnection(BaseConnection):
     def _initialize_web3(self):
         """Initialize Web3 connection"""
         if not self._web3:
-            self._web3 = Web3(Web3.HTTPProvider(self.rpc_url))
+            self._web3 = Web3(PooledHTTPProvider(self.rpc_pool))
             self._web3.middleware_onion.inject(geth_poa_middleware, layer=0)
             if not self._web3.is_connected():
                 raise SonicConnectionError("Failed to connect to Sonic network")
             
             try:
-                chain_id = self._web3.eth.chain_id
-                logger.info(f"Connected to network with chain ID: {chain_id}")
+                node_chain_id = self._web3.eth.chain_id
             except Exception as e:
-                logger.warning(f"Could not get chain ID: {e}")
+                # Transactions are signed for, and caches keyed by, the chain ID: never guess it
+                if self.chain_id is None:
+                    raise SonicConnectionError(f"Could not get chain ID: {e}")
+                logger.warning(f"Could not get chain ID, using {self.chain_id}: {e}")
+                return
+            if self.chain_id is not None and node_chain_id != self.chain_id:
+                raise SonicConnectionError(f"RPC is on chain {node_chain_id}, expected {self.chain_id}")
+            self.chain_id = node_chain_id
+            logger.info(f"Connected to network with chain ID: {self.chain_id}")
 
     @property
     def is_llm_provider(self) -> bool:
@@ -74,37 +107,9 @@ class SonicConnection(BaseConnection):
 
     def get_token_by_ticker(self, ticker: str) -> Optional[str]:
         """Get token address by ticker symbol"""
-        try:
-            if ticker.lower() in ["s", "S"]:
-                return "0xEeeeeEeeeEeEeeEeEeEeeEEEeeeeEeeeeeeeEEeE"
-                
-            response = requests.get(
-                f"https://api.dexscreener.com/latest/dex/search?q={ticker}"
-            )
-            response.raise_for_status()
-
-            data = response.json()
-            if not data.get('pairs'):
-                return None
-
-            sonic_pairs = [
-                pair for pair in data["pairs"] if pair.get("chainId") == "sonic"
-            ]
-            sonic_pairs.sort(key=lambda x: x.get("fdv", 0), reverse=True)
-
-            sonic_pairs = [
-                pair
-                for pair in sonic_pairs
-                if pair.get("baseToken", {}).get("symbol", "").lower() == ticker.lower()
-            ]
-
-            if sonic_pairs:
-                return sonic_pairs[0].get("baseToken", {}).get("address")
-            return None
-
-        except Exception as error:
-            logger.error(f"Error fetching token address: {str(error)}")
-            return None
+        if ticker.lower() in ["s", "S"]:
+            return "0xEeeeeEeeeEeEeeEeEeEeeEEEeeeeEeeeeeeeEEeE"
+        return get_token_index("sonic", rank=rank_by_fdv).lookup(ticker)
 
     def register_actions(self) -> None:
         self.actions = {
@@ -123,6 +128,14 @@ class SonicConnection(BaseConnection):
                 ],
                 description="Get $S or token balance"
             ),
+            "get-portfolio": Action(
+                name="get-portfolio",
+                parameters=[
+                    ActionParameter("tokens", False, parse_address_list, "Token addresses (comma separated)"),
+                    ActionParameter("wallets", False, parse_address_list, "Wallet addresses, the configured wallet if not provided")
+                ],
+                description="Get $S and token balances of one or more wallets in a single request"
+            ),
             "transfer": Action(
                 name="transfer",
                 parameters=[
@@ -192,24 +205,34 @@ class SonicConnection(BaseConnection):
                 logger.error(f"Configuration check failed: {e}")
             return False
 
+    def _token_contract(self, token_address: str):
+        """Cached ERC-20 contract object"""
+        return self.token_metadata.contract(self._web3, token_address)
+
+    def _token_decimals(self, token_address: str) -> int:
+        """decimals() of a token, read from the chain only the first time"""
+        return self.token_metadata.decimals(self.rpc_pool, token_address)
+
+    def _wallet_address(self) -> str:
+        private_key = os.getenv('SONIC_PRIVATE_KEY')
+        if not private_key:
+            raise SonicConnectionError("No wallet configured")
+        return self._web3.eth.account.from_key(private_key).address
+
     def get_balance(self, address: Optional[str] = None, token_address: Optional[str] = None) -> float:
         """Get balance for an address or the configured wallet"""
         try:
             if not address:
-                private_key = os.getenv('SONIC_PRIVATE_KEY')
-                if not private_key:
-                    raise SonicConnectionError("No wallet configured")
-                account = self._web3.eth.account.from_key(private_key)
-                address = account.address
+                address = self._wallet_address()
 
             if token_address:
-                contract = self._web3.eth.contract(
-                    address=Web3.to_checksum_address(token_address),
-                    abi=self.ERC20_ABI
-                )
-                balance = contract.functions.balanceOf(address).call()
-                decimals = contract.functions.decimals().call()
-                return balance / (10 ** decimals)
+                # balanceOf and decimals in one round-trip
+                snapshot = get_portfolio(self.rpc_pool, [(address, token_address)], native_symbol="S", token_metadata=self.token_metadata)
+                self.token_metadata.remember(snapshot)
+                entry = snapshot["balances"][0]
+                if entry["balance"] is None:
+                    raise SonicConnectionError(f"Could not read {token_address} balance: {entry.get('error')}")
+                return entry["balance"]
             else:
                 balance = self._web3.eth.get_balance(address)
                 return self._web3.from_wei(balance, 'ether')
@@ -218,117 +241,109 @@ class SonicConnection(BaseConnection):
             logger.error(f"Failed to get balance: {e}")
             raise
 
+    def get_portfolio(self, tokens: Optional[List[str]] = None, wallets: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        $S and token balances of every wallet, read through Multicall3 in a
+        single round-trip and returned as one snapshot (see evm_batch.get_portfolio)
+        """
+        try:
+            wallets = wallets or [self._wallet_address()]
+            pairs = [(wallet, token) for wallet in wallets for token in [None, *(tokens or [])]]
+            snapshot = get_portfolio(self.rpc_pool, pairs, native_symbol="S", token_metadata=self.token_metadata)
+            self.token_metadata.remember(snapshot)
+            return snapshot
+        except Exception as e:
+            logger.error(f"Failed to get portfolio: {e}")
+            raise
+
     def transfer(self, to_address: str, amount: float, token_address: Optional[str] = None) -> str:
         """Transfer $S or tokens to an address"""
         try:
             private_key = os.getenv('SONIC_PRIVATE_KEY')
             account = self._web3.eth.account.from_key(private_key)
-            chain_id = self._web3.eth.chain_id
+            fee_oracle = self._fee_oracle()
             
             if token_address:
-                contract = self._web3.eth.contract(
-                    address=Web3.to_checksum_address(token_address),
-                    abi=self.ERC20_ABI
-                )
-                decimals = contract.functions.decimals().call()
+                decimals = self._token_decimals(token_address)
                 amount_raw = int(amount * (10 ** decimals))
                 
-                tx = contract.functions.transfer(
-                    Web3.to_checksum_address(to_address),
-                    amount_raw
-                ).build_transaction({
+                tx = {
                     'from': account.address,
-                    'nonce': self._web3.eth.get_transaction_count(account.address),
-                    'gasPrice': self._web3.eth.gas_price,
-                    'chainId': chain_id
-                })
+                    'to': Web3.to_checksum_address(token_address),
+                    'data': erc20_calldata(TRANSFER, to_address, amount_raw),
+                    'chainId': self.chain_id,
+                    **fee_oracle.fees()
+                }
+                tx['gas'] = fee_oracle.estimate_gas(tx)
             else:
                 tx = {
-                    'nonce': self._web3.eth.get_transaction_count(account.address),
                     'to': Web3.to_checksum_address(to_address),
                     'value': self._web3.to_wei(amount, 'ether'),
                     'gas': 21000,
-                    'gasPrice': self._web3.eth.gas_price,
-                    'chainId': chain_id
+                    'chainId': self.chain_id,
+                    **fee_oracle.fees()
                 }
 
-            signed = account.sign_transaction(tx)
-            tx_hash = self._web3.eth.send_raw_transaction(signed.rawTransaction)
+            tx_hash = self._send_transaction(account, tx).tx_hash
 
             # Log and return explorer link immediately
-            tx_link = self._get_explorer_link(tx_hash.hex())
+            tx_link = self._get_explorer_link(tx_hash)
             return f"⛓️ Transfer transaction sent: {tx_link}"
 
         except Exception as e:
             logger.error(f"Transfer failed: {e}")
             raise
 
+    def _fee_oracle(self) -> FeeOracle:
+        """Background-polled fees and cached gas estimates of this chain"""
+        return get_fee_oracle(self._web3, self.chain_id)
+
+    def _send_transaction(self, account, tx: Dict[str, Any]) -> PendingTransaction:
+        """Sign and broadcast through the wallet's shared nonce-managed pipeline"""
+        return get_transaction_pipeline(self._web3, self.chain_id, account).submit(tx)
+
+    def _raw_amount(self, token: str, amount: float) -> int:
+        """Amount in the token's smallest unit"""
+        if token.lower() == self.NATIVE_TOKEN.lower():
+            return self._web3.to_wei(amount, 'ether')
+        return int(amount * (10 ** self._token_decimals(token)))
+
+    def _register_hot_pairs(self, hot_pairs: List[Dict[str, Any]]) -> None:
+        """
+        Keep routes ready for swaps the agent makes repeatedly, configured as
+        [{"token_in": ..., "token_out": ..., "amount": ..., "slippage": 0.5}]
+        """
+        private_key = os.getenv('SONIC_PRIVATE_KEY')
+        sender = self._web3.eth.account.from_key(private_key).address if private_key else None
+        for pair in hot_pairs:
+            try:
+                amount_raw = self._raw_amount(pair["token_in"], pair["amount"])
+                self._hot_pair_keys.append(self.swap_router.add_hot_pair(
+                    pair["token_in"], pair["token_out"], amount_raw, sender, pair.get("slippage", 0.5)
+                ))
+            except Exception as e:
+                logger.warning(f"Skipping hot pair {pair}: {e}")
+
+    def close(self) -> None:
+        """Stop prefetching this connection's hot pairs; the shared router keeps running for others"""
+        for key in self._hot_pair_keys:
+            self.swap_router.remove_hot_pair(key)
+        self._hot_pair_keys = []
+
     def _get_swap_route(self, token_in: str, token_out: str, amount_in: float) -> Dict:
-        """Get the best swap route from Kyberswap API"""
+        """Get the best swap route from Kyberswap API (reused for a few seconds, see SwapRouter)"""
         try:
-            # Handle native token address
-            
-            # Convert amount to raw value
-            if token_in.lower() == self.NATIVE_TOKEN.lower():
-                amount_raw = self._web3.to_wei(amount_in, 'ether')
-            else:
-                token_contract = self._web3.eth.contract(
-                    address=Web3.to_checksum_address(token_in),
-                    abi=self.ERC20_ABI
-                )
-                decimals = token_contract.functions.decimals().call()
-                amount_raw = int(amount_in * (10 ** decimals))
-            
-            # Set up API request
-            url = f"{self.aggregator_api}/routes"
-            headers = {"x-client-id": "ZerePyBot"}
-            params = {
-                "tokenIn": token_in,
-                "tokenOut": token_out,
-                "amountIn": str(amount_raw),
-                "gasInclude": "true"
-            }
-            
-            response = requests.get(url, headers=headers, params=params)
-            response.raise_for_status()
-            
-            data = response.json()
-            if data.get("code") != 0:
-                raise SonicConnectionError(f"API error: {data.get('message')}")
-                
-            return data["data"]
-                
+            return self.swap_router.route(token_in, token_out, self._raw_amount(token_in, amount_in))
         except Exception as e:
             logger.error(f"Failed to get swap route: {e}")
             raise
 
-    def _get_encoded_swap_data(self, route_summary: Dict, slippage: float = 0.5) -> str:
+    def _get_encoded_swap_data(self, route_data: Dict, slippage: float = 0.5) -> str:
         """Get encoded swap data from Kyberswap API"""
         try:
             private_key = os.getenv('SONIC_PRIVATE_KEY')
             account = self._web3.eth.account.from_key(private_key)
-            
-            url = f"{self.aggregator_api}/route/build"
-            headers = {"x-client-id": "zerepy"}
-            
-            payload = {
-                "routeSummary": route_summary,
-                "sender": account.address,
-                "recipient": account.address,
-                "slippageTolerance": int(slippage * 100),  # Convert to bps
-                "deadline": int(time.time() + 1200),  # 20 minutes
-                "source": "ZerePyBot"
-            }
-            
-            response = requests.post(url, headers=headers, json=payload)
-            response.raise_for_status()
-            
-            data = response.json()
-            if data.get("code") != 0:
-                raise SonicConnectionError(f"API error: {data.get('message')}")
-                
-            return data["data"]["data"]
-                
+            return self.swap_router.build(route_data, account.address, account.address, slippage)["data"]
         except Exception as e:
             logger.error(f"Failed to encode swap data: {e}")
             raise
@@ -339,34 +354,39 @@ class SonicConnection(BaseConnection):
             private_key = os.getenv('SONIC_PRIVATE_KEY')
             account = self._web3.eth.account.from_key(private_key)
             
-            token_contract = self._web3.eth.contract(
-                address=Web3.to_checksum_address(token_address),
-                abi=self.ERC20_ABI
-            )
+            # A tracked allowance that covers the amount needs no allowance() read
+            if self.allowances.covers(account.address, token_address, spender_address, amount):
+                return
+            token_contract = self._token_contract(token_address)
             
             # Check current allowance
             current_allowance = token_contract.functions.allowance(
                 account.address,
                 spender_address
             ).call()
+            self.allowances.set(account.address, token_address, spender_address, current_allowance)
             
             if current_allowance < amount:
-                approve_tx = token_contract.functions.approve(
-                    spender_address,
-                    amount
-                ).build_transaction({
+                approve_amount = MAX_UINT256 if self.approval_policy == "max" else amount
+                fee_oracle = self._fee_oracle()
+                approve_tx = {
                     'from': account.address,
-                    'nonce': self._web3.eth.get_transaction_count(account.address),
-                    'gasPrice': self._web3.eth.gas_price,
-                    'chainId': self._web3.eth.chain_id
-                })
+                    'to': Web3.to_checksum_address(token_address),
+                    'data': erc20_calldata(APPROVE, spender_address, approve_amount),
+                    'chainId': self.chain_id,
+                    **fee_oracle.fees()
+                }
+                approve_tx['gas'] = fee_oracle.estimate_gas(approve_tx)
                 
-                signed_approve = account.sign_transaction(approve_tx)
-                tx_hash = self._web3.eth.send_raw_transaction(signed_approve.rawTransaction)
-                logger.info(f"Approval transaction sent: {self._get_explorer_link(tx_hash.hex())}")
+                pending = self._send_transaction(account, approve_tx)
+                logger.info(f"Approval transaction sent: {self._get_explorer_link(pending.tx_hash)}")
                 
-                # Wait for approval to be mined
-                self._web3.eth.wait_for_transaction_receipt(tx_hash)
+                # The swap's gas estimate needs the allowance in place
+                receipt = pending.receipt()
+                if receipt['status'] != 1:
+                    raise SonicConnectionError("Token approval failed")
+                if not self.allowances.apply_receipt(receipt):
+                    self.allowances.set(account.address, token_address, spender_address, approve_amount)
                 
         except Exception as e:
             logger.error(f"Approval failed: {e}")
@@ -391,7 +411,7 @@ class SonicConnection(BaseConnection):
             route_data = self._get_swap_route(token_in, token_out, amount)
             
             # Get encoded swap data
-            encoded_data = self._get_encoded_swap_data(route_data["routeSummary"], slippage)
+            encoded_data = self._get_encoded_swap_data(route_data, slippage)
             
             # Get router address from route data
             router_address = route_data["routerAddress"]
@@ -401,38 +421,36 @@ class SonicConnection(BaseConnection):
                 if token_in.lower() == "0x039e2fb66102314ce7b64ce5ce3e5183bc94ad38".lower():  # $S token
                     amount_raw = self._web3.to_wei(amount, 'ether')
                 else:
-                    token_contract = self._web3.eth.contract(
-                        address=Web3.to_checksum_address(token_in),
-                        abi=self.ERC20_ABI
-                    )
-                    decimals = token_contract.functions.decimals().call()
+                    decimals = self._token_decimals(token_in)
                     amount_raw = int(amount * (10 ** decimals))
                 self._handle_token_approval(token_in, router_address, amount_raw)
             
             # Prepare transaction
+            fee_oracle = self._fee_oracle()
             tx = {
                 'from': account.address,
                 'to': Web3.to_checksum_address(router_address),
                 'data': encoded_data,
-                'nonce': self._web3.eth.get_transaction_count(account.address),
-                'gasPrice': self._web3.eth.gas_price,
-                'chainId': self._web3.eth.chain_id,
-                'value': self._web3.to_wei(amount, 'ether') if token_in.lower() == self.NATIVE_TOKEN.lower() else 0
+                'chainId': self.chain_id,
+                'value': self._web3.to_wei(amount, 'ether') if token_in.lower() == self.NATIVE_TOKEN.lower() else 0,
+                **fee_oracle.fees()
             }
             
             # Estimate gas
             try:
-                tx['gas'] = self._web3.eth.estimate_gas(tx)
+                tx['gas'] = fee_oracle.estimate_gas(tx)
             except Exception as e:
                 logger.warning(f"Gas estimation failed: {e}, using default gas limit")
                 tx['gas'] = 500000  # Default gas limit
             
             # Sign and send transaction
-            signed_tx = account.sign_transaction(tx)
-            tx_hash = self._web3.eth.send_raw_transaction(signed_tx.rawTransaction)
+            pending = self._send_transaction(account, tx)
+            if token_in.lower() != self.NATIVE_TOKEN.lower():
+                self.allowances.watch_spend(pending, account.address, token_in, router_address, amount_raw)
+            tx_hash = pending.tx_hash
             
             # Log and return explorer link immediately
-            tx_link = self._get_explorer_link(tx_hash.hex())
+            tx_link = self._get_explorer_link(tx_hash)
             return f"🔄 Swap transaction sent: {tx_link}"
                 
         except Exception as e:
@@ -445,7 +463,7 @@ class SonicConnection(BaseConnection):
 
         load_dotenv()
         
-        if not self.is_configured(verbose=True):
+        if not self.is_ready(verbose=True):
             raise SonicConnectionError("Sonic is not properly configured")
 
         action = self.actions[action_name]
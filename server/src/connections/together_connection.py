@@ -22,6 +22,7 @@ class TogetherAIAPIError(TogetherAIConnectionError):
     pass
 
 class TogetherAIConnection(BaseConnection):
+    credential_env_vars = ("TOGETHER_API_KEY",)
     def __init__(self, config: Dict[str, Any]):
         super().__init__(config)
         self._client = None
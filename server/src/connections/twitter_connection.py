@@ -1,11 +1,13 @@
 import os
 import logging
-from typing import Dict, Any, List, Tuple, Iterator
+import threading
+from typing import Dict, Any, List, Set, Tuple, Iterator
 from requests_oauthlib import OAuth1Session
 from dotenv import set_key, load_dotenv
 from src.connections.base_connection import BaseConnection, Action, ActionParameter
 from src.helpers import print_h_bar
-import json,requests
+import json
+from src.helpers.http_transport import http_transport
 
 logger = logging.getLogger("connections.twitter_connection")
 
@@ -21,10 +23,73 @@ class TwitterAPIError(TwitterConnectionError):
     """Raised when Twitter API requests fail"""
     pass
 
+class TweetStream:
+    """
+    One filtered-stream subscription. A pooled connection can serve several
+    agents' listeners at once, so each stream keeps its own response and
+    close() only ends this one.
+    """
+
+    def __init__(self, connection: "TwitterConnection", filter_string: str):
+        self._connection = connection
+        self._filter_string = filter_string
+        self._response = None
+        self._closed = False
+        self._lock = threading.Lock()
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        connection = self._connection
+        rules = connection._get_rules()
+        connection._delete_rules(rules)
+        connection._build_rule(self._filter_string)
+        logger.info("Starting Twitter stream")
+        connection._add_stream(self)
+        try:
+            response = connection._make_request('get', 'tweets/search/stream',
+                                        use_bearer=True, stream=True)
+
+            if response.status_code != 200:
+                raise TwitterAPIError(f"Stream connection failed with status {response.status_code}: {response.text}")
+            with self._lock:
+                self._response = response
+                closed = self._closed
+            if closed:
+                response.close()
+                return
+
+            for line in response.iter_lines():
+                if line:
+                    tweet_data = json.loads(line)['data']
+                    yield tweet_data
+
+        except Exception as e:
+            if self._closed:
+                return
+            logger.error(f"Error streaming tweets: {str(e)}")
+            raise TwitterAPIError(f"Error streaming tweets: {str(e)}")
+        finally:
+            with self._lock:
+                self._response = None
+            connection._remove_stream(self)
+
+    def close(self) -> None:
+        """Close this stream's response, which unblocks the thread reading it"""
+        with self._lock:
+            self._closed = True
+            response = self._response
+        if response is not None:
+            response.close()
+
+
 class TwitterConnection(BaseConnection):
+    credential_env_vars = ("TWITTER_CONSUMER_KEY", "TWITTER_CONSUMER_SECRET", "TWITTER_ACCESS_TOKEN", "TWITTER_ACCESS_TOKEN_SECRET", "TWITTER_USER_ID", "TWITTER_BEARER_TOKEN")
+    readiness_errors = BaseConnection.readiness_errors + (TwitterConfigurationError,)
+
     def __init__(self, config: Dict[str, Any]):
         super().__init__(config)
         self._oauth_session = None
+        self._streams: Set[TweetStream] = set()
+        self._streams_lock = threading.Lock()
 
     @property
     def is_llm_provider(self) -> bool:
@@ -153,7 +218,7 @@ class TwitterConnection(BaseConnection):
             full_url = f"https://api.twitter.com/2/{endpoint.lstrip('/')}"
 
             if use_bearer:
-                response = requests.request(
+                response = http_transport.request(
                     method=method.lower(),
                     url=full_url,
                     auth=self._bearer_oauth,
@@ -164,6 +229,14 @@ class TwitterConnection(BaseConnection):
                 oauth = self._get_oauth()
                 response = getattr(oauth, method.lower())(full_url, **kwargs)
 
+            if not stream and response.status_code in [401, 403]:
+                logger.error(
+                    f"Request rejected: {response.status_code} - {response.text}"
+                )
+                raise TwitterConfigurationError(
+                    f"Credentials rejected with status {response.status_code}: {response.text}"
+                )
+
             if not stream and response.status_code not in [200, 201]:
                 logger.error(
                     f"Request failed: {response.status_code} - {response.text}"
@@ -548,26 +621,23 @@ class TwitterConnection(BaseConnection):
         payload = {"add": rule}
         return self._make_request('post', 'tweets/search/stream/rules', use_bearer=True, json=payload)
     
-    def stream_tweets(self, filter_string:str,**kwargs) ->Iterator[Dict[str, Any]]:
+    def stream_tweets(self, filter_string:str,**kwargs) -> TweetStream:
         """Stream tweets. Requires Twitter Premium Plan and Bearer Token"""
-        rules = self._get_rules()
-        self._delete_rules(rules)
-        self._build_rule(filter_string)
-        logger.info("Starting Twitter stream")
-        try:
-            response = self._make_request('get', 'tweets/search/stream', 
-                                        use_bearer=True, stream=True)
-            
-            if response.status_code != 200:
-                raise TwitterAPIError(f"Stream connection failed with status {response.status_code}: {response.text}")
-                
-            for line in response.iter_lines():
-                if line:
-                    tweet_data = json.loads(line)['data']
-                    yield tweet_data
-                
-        except Exception as e:
-            logger.error(f"Error streaming tweets: {str(e)}")
-            raise TwitterAPIError(f"Error streaming tweets: {str(e)}")
+        return TweetStream(self, filter_string)
+
+    def _add_stream(self, stream: TweetStream) -> None:
+        with self._streams_lock:
+            self._streams.add(stream)
+
+    def _remove_stream(self, stream: TweetStream) -> None:
+        with self._streams_lock:
+            self._streams.discard(stream)
+
+    def close(self) -> None:
+        """Close every open stream; only called once no agent holds the connection"""
+        with self._streams_lock:
+            streams = list(self._streams)
+        for stream in streams:
+            stream.close()
         
     
@@ -1,7 +1,7 @@
 import logging
 import os
 from typing import Dict, Any
-from openai import OpenAI
+from openai import OpenAI, AsyncOpenAI, APIConnectionError, AuthenticationError, PermissionDeniedError
 from dotenv import set_key, load_dotenv
 from src.connections.base_connection import BaseConnection, Action, ActionParameter
 
@@ -20,9 +20,13 @@ class XAIAPIError(XAIConnectionError):
     pass
 
 class XAIConnection(BaseConnection):
+    credential_env_vars = ("XAI_API_KEY",)
+    readiness_errors = BaseConnection.readiness_errors + (XAIConfigurationError, APIConnectionError, AuthenticationError, PermissionDeniedError)
+
     def __init__(self, config: Dict[str, Any]):
         super().__init__(config)
         self._client = None
+        self._async_client = None
 
     @property
     def is_llm_provider(self) -> bool:
@@ -79,6 +83,18 @@ class XAIConnection(BaseConnection):
             )
         return self._client
 
+    def _get_async_client(self) -> AsyncOpenAI:
+        """Get or create async XAI client using OpenAI's client with custom base URL"""
+        if not self._async_client:
+            api_key = os.getenv("XAI_API_KEY")
+            if not api_key:
+                raise XAIConfigurationError("XAI API key not found in environment")
+            self._async_client = AsyncOpenAI(
+                api_key=api_key,
+                base_url="https://api.x.ai/v1",
+            )
+        return self._async_client
+
     def configure(self) -> bool:
         """Sets up XAI API authentication"""
         logger.info("\n🤖 XAI API SETUP")
@@ -152,6 +168,27 @@ class XAIConnection(BaseConnection):
         except Exception as e:
             raise XAIAPIError(f"Text generation failed: {e}")
 
+    async def agenerate_text(self, prompt: str, system_prompt: str = None, model: str = None, **kwargs) -> str:
+        """Async variant of generate_text using XAI models"""
+        try:
+            client = self._get_async_client()
+            
+            # Use configured model if none provided
+            if not model:
+                model = self.config["model"]
+
+            response = await client.chat.completions.create(
+                model=model,
+                messages=[
+                    {"role": "system", "content": system_prompt} if system_prompt else {"role": "system", "content": ""},
+                    {"role": "user", "content": prompt},
+                ]
+            )
+            return response.choices[0].message.content
+            
+        except Exception as e:
+            raise XAIAPIError(f"Text generation failed: {e}")
+
     def check_model(self, model: str, **kwargs) -> bool:
         """Check if a specific model is available"""
         try:
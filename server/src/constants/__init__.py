@@ -1,15 +1,15 @@
-from solders.pubkey import Pubkey  # type: ignore
-
-# Common token addresses used across the toolkit
-SPL_TOKENS = {
-    "USDC": Pubkey.from_string("EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v"),
-    "USDT": Pubkey.from_string("Es9vMFrzaCERmJfrF4H2FYD4KCoNkY11McCe8BenwNYB"),
-    "USDS": Pubkey.from_string("USDSwr9ApdHk5bvJKMjzff41FfuX8bSxdKcR81vTwcA"),
-    "SOL": Pubkey.from_string("So11111111111111111111111111111111111111112"),
-    "JITOSOL": Pubkey.from_string("J1toso1uCk3RLmjorhTtrVwY9HJ7X8V9yYac6Y7kGCPn"),
-    "BSOL": Pubkey.from_string("bSo13r4TkiE4KumL71LsHTPpL2euBYLFx6h9HP3piy1"),
-    "MSOL": Pubkey.from_string("mSoLzYCxHdYgdzU16g5QSh3i5K3z3KZK7ytfqcJm7So"),
-    "BONK": Pubkey.from_string("DezXAZ8z7PnrnRJjz3wXBoRgixCa6xjnB7YaB1pPB263"),
+# Common token addresses used across the toolkit, as base58 strings.
+# Exposed as Pubkeys through SPL_TOKENS, which is built lazily so that importing
+# src.constants (e.g. for the EVM network tables) does not pull in solders.
+_SPL_TOKEN_ADDRESSES = {
+    "USDC": "EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v",
+    "USDT": "Es9vMFrzaCERmJfrF4H2FYD4KCoNkY11McCe8BenwNYB",
+    "USDS": "USDSwr9ApdHk5bvJKMjzff41FfuX8bSxdKcR81vTwcA",
+    "SOL": "So11111111111111111111111111111111111111112",
+    "JITOSOL": "J1toso1uCk3RLmjorhTtrVwY9HJ7X8V9yYac6Y7kGCPn",
+    "BSOL": "bSo13r4TkiE4KumL71LsHTPpL2euBYLFx6h9HP3piy1",
+    "MSOL": "mSoLzYCxHdYgdzU16g5QSh3i5K3z3KZK7ytfqcJm7So",
+    "BONK": "DezXAZ8z7PnrnRJjz3wXBoRgixCa6xjnB7YaB1pPB263",
 }
 
 DEFAULT_OPTIONS = {
@@ -21,3 +21,16 @@ JUP_API = "https://quote-api.jup.ag/v6"
 
 LAMPORTS_PER_SOL = 1_000_000_000
 SOL_FEES = 100_000_000
+
+
+def __getattr__(name):
+    if name == "SPL_TOKENS":
+        from solders.pubkey import Pubkey  # type: ignore
+
+        global SPL_TOKENS
+        SPL_TOKENS = {
+            ticker: Pubkey.from_string(address)
+            for ticker, address in _SPL_TOKEN_ADDRESSES.items()
+        }
+        return SPL_TOKENS
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,14 +1,28 @@
 SONIC_NETWORKS = {
     "mainnet": {
         "rpc_url": "https://rpc.soniclabs.com",
-        "scanner_url": "https://sonicscan.org"
+        # rpc_url first; reads go to the fastest healthy one (see helpers/rpc_pool.py)
+        "rpc_urls": [
+            "https://rpc.soniclabs.com",
+            "https://sonic-rpc.publicnode.com",
+            "https://sonic.drpc.org"
+        ],
+        "scanner_url": "https://sonicscan.org",
+        "chain_id": 146
     },
     "testnet": {
         "rpc_url": "https://rpc.blaze.soniclabs.com",
-        "scanner_url": "https://testnet.sonicscan.org"
+        "rpc_urls": [
+            "https://rpc.blaze.soniclabs.com"
+        ],
+        "scanner_url": "https://testnet.sonicscan.org",
+        "chain_id": 57054
     },
     "custom": {
         "rpc_url": "placeholder",
+        "rpc_urls": [
+            "placeholder"
+        ],
         "scanner_url": "https://sonicscan.org"
         }
     }
@@ -16,17 +30,35 @@ SONIC_NETWORKS = {
 EVM_NETWORKS = {
     "ethereum": {
         "rpc_url": "https://ethereum-rpc.publicnode.com",
+        "rpc_urls": [
+            "https://ethereum-rpc.publicnode.com",
+            "https://eth.llamarpc.com",
+            "https://eth.drpc.org"
+        ],
         "scanner_url": "etherscan.io",
-        "chain_id": 1
+        "chain_id": 1,
+        "native_symbol": "ETH"
     },
     "base": {
         "rpc_url": "https://mainnet.base.org",
+        "rpc_urls": [
+            "https://mainnet.base.org",
+            "https://base-rpc.publicnode.com",
+            "https://base.drpc.org"
+        ],
         "scanner_url": "basescan.org",
-        "chain_id": 8453
+        "chain_id": 8453,
+        "native_symbol": "ETH"
     },
     "polygon": {
         "rpc_url": "https://polygon-rpc.com",
+        "rpc_urls": [
+            "https://polygon-rpc.com",
+            "https://polygon-bor-rpc.publicnode.com",
+            "https://polygon.drpc.org"
+        ],
         "scanner_url": "polygonscan.com",
-        "chain_id": 137
+        "chain_id": 137,
+        "native_symbol": "POL"
     }
-}
\ No newline at end of file
+}
@@ -1,6 +1,7 @@
 
 
 import requests
+from src.helpers.http_transport import http_transport
 from .constants import NEYNAR_API_KEY, SIGNER_UUID, NEYNAR_BASE_URL, OPENAI_API_KEY
 import logging
 logging.basicConfig(level=logging.INFO, format='%(message)s')
@@ -46,7 +47,7 @@ class FarcasterBot:
             payload["channel_id"] = channel_id
 
         try:
-            response = requests.post(url, headers=self.headers, json=payload)
+            response = http_transport.post(url, headers=self.headers, json=payload)
             response.raise_for_status()
             return response.json()
         except requests.exceptions.RequestException as e:
@@ -0,0 +1,149 @@
+import json
+import logging
+import os
+import threading
+from typing import Any, Dict, Optional, Union
+
+from eth_utils import keccak, to_checksum_address
+
+logger = logging.getLogger("helpers.allowance_tracker")
+
+ALLOWANCE_CACHE_DIR = os.path.join(".cache", "allowances")
+MAX_UINT256 = 2 ** 256 - 1
+# Tokens don't decrease an allowance this large on transferFrom
+UNLIMITED_ALLOWANCE = 2 ** 255
+# Approval(address indexed owner, address indexed spender, uint256 value)
+APPROVAL_TOPIC = "0x" + keccak(text="Approval(address,address,uint256)").hex()
+# "exact" approves the amount of each swap, "max" approves MAX_UINT256 once per (token, spender)
+APPROVAL_POLICIES = ("exact", "max")
+
+
+def _hex(value: Union[str, bytes]) -> str:
+    if isinstance(value, (bytes, bytearray)):
+        return "0x" + bytes(value).hex()
+    return value if value.startswith("0x") else "0x" + value
+
+
+def _key(wallet: str, token: str, spender: str) -> str:
+    return "|".join(to_checksum_address(address) for address in (wallet, token, spender))
+
+
+class AllowanceTracker:
+    """
+    Known ERC-20 allowances of one chain, keyed by (wallet, token, spender).
+
+    Entries come from allowance() reads, the Approval events in the receipts
+    of our own transactions, and local bookkeeping of what our swaps spend.
+    They are kept in a JSON file under .cache/allowances/ so a restart does
+    not read them again. Anything that may have made an entry wrong (a
+    reverted or dropped spend) removes it, so the next swap reads the chain.
+    """
+
+    def __init__(self, chain_id: Union[int, str], cache_dir: Optional[str] = ALLOWANCE_CACHE_DIR):
+        self.chain_id = chain_id
+        self.path = os.path.join(cache_dir, f"{chain_id}.json") if cache_dir else None
+        self._allowances: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self) -> None:
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r") as f:
+                self._allowances = {key: int(value) for key, value in json.load(f).items()}
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable allowance cache {self.path}: {e}")
+
+    def _save(self) -> None:
+        if not self.path:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(self._allowances, f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.warning(f"Could not persist allowances to {self.path}: {e}")
+
+    def get(self, wallet: str, token: str, spender: str) -> Optional[int]:
+        return self._allowances.get(_key(wallet, token, spender))
+
+    def covers(self, wallet: str, token: str, spender: str, amount: int) -> bool:
+        """Whether the known allowance is enough for amount (False when unknown)"""
+        allowance = self.get(wallet, token, spender)
+        return allowance is not None and allowance >= amount
+
+    def set(self, wallet: str, token: str, spender: str, allowance: int) -> None:
+        with self._lock:
+            self._allowances[_key(wallet, token, spender)] = allowance
+            self._save()
+
+    def invalidate(self, wallet: str, token: str, spender: str) -> None:
+        with self._lock:
+            if self._allowances.pop(_key(wallet, token, spender), None) is not None:
+                self._save()
+
+    def spend(self, wallet: str, token: str, spender: str, amount: int) -> None:
+        """Account for a transferFrom of amount by spender"""
+        key = _key(wallet, token, spender)
+        with self._lock:
+            allowance = self._allowances.get(key)
+            if allowance is None or allowance >= UNLIMITED_ALLOWANCE:
+                return
+            self._allowances[key] = max(allowance - amount, 0)
+            self._save()
+
+    def apply_receipt(self, receipt: Dict[str, Any]) -> int:
+        """Record the Approval events in a receipt; returns how many were found"""
+        found = 0
+        with self._lock:
+            for log in receipt.get("logs", []):
+                topics = [_hex(topic) for topic in log.get("topics", [])]
+                # ERC-721 Approval has a third indexed topic and no data
+                if len(topics) != 3 or topics[0].lower() != APPROVAL_TOPIC:
+                    continue
+                owner, spender = ("0x" + topic[-40:] for topic in topics[1:])
+                data = _hex(log.get("data") or "0x")
+                if len(data) < 66:
+                    continue
+                self._allowances[_key(owner, log["address"], spender)] = int(data[2:66], 16)
+                found += 1
+            if found:
+                self._save()
+        return found
+
+    def watch_spend(self, pending, wallet: str, token: str, spender: str, amount: int) -> None:
+        """
+        Deduct amount now for a sent transaction that lets spender pull it
+        (e.g. a swap), then correct from its receipt once it is mined.
+        """
+        self.spend(wallet, token, spender, amount)
+
+        def on_done(tx) -> None:
+            try:
+                receipt = tx.receipt()
+            except Exception:
+                self.invalidate(wallet, token, spender)
+                return
+            if receipt["status"] != 1:
+                self.invalidate(wallet, token, spender)
+            else:
+                self.apply_receipt(receipt)
+        pending.add_done_callback(on_done)
+
+
+_trackers: Dict[str, AllowanceTracker] = {}
+_trackers_lock = threading.Lock()
+
+
+def get_allowance_tracker(chain_id: Union[int, str]) -> AllowanceTracker:
+    """The process-wide allowance tracker of a chain, shared by every connection"""
+    key = str(chain_id)
+    with _trackers_lock:
+        tracker = _trackers.get(key)
+        if tracker is None:
+            tracker = AllowanceTracker(chain_id)
+            _trackers[key] = tracker
+        return tracker
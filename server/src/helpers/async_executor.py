@@ -0,0 +1,154 @@
+import asyncio
+import functools
+import logging
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, AsyncIterator, Awaitable, Callable, Iterable, Optional
+
+logger = logging.getLogger("helpers.async_executor")
+
+# Upper bound on threads used to run blocking (sync-only) connection calls from async code
+BLOCKING_EXECUTOR_WORKERS = int(os.getenv("BLOCKING_EXECUTOR_WORKERS", "32"))
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_blocking_executor() -> ThreadPoolExecutor:
+    """Get the shared, bounded thread pool for blocking calls"""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=BLOCKING_EXECUTOR_WORKERS,
+                    thread_name_prefix="blocking"
+                )
+    return _executor
+
+
+async def run_blocking(func: Callable[..., Any], *args, **kwargs) -> Any:
+    """Run a blocking callable on the shared executor without stalling the event loop"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_blocking_executor(), functools.partial(func, *args, **kwargs))
+
+
+async def iterate_in_thread(
+    iterable: Iterable[Any], name: str, on_close: Optional[Callable[[], None]] = None
+) -> AsyncIterator[Any]:
+    """
+    Consume a blocking iterable (e.g. a streaming HTTP response) from async code.
+
+    The iterable runs on its own daemon thread rather than the shared executor:
+    a stream never ends, so it would hold an executor worker for good. When the
+    consumer stops early (break or task cancellation), on_close is called to
+    unblock the thread, e.g. by closing the underlying response.
+    """
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue()
+    finished = object()
+    stopped = threading.Event()
+
+    def put(item: Any, error: Optional[BaseException] = None) -> None:
+        try:
+            loop.call_soon_threadsafe(queue.put_nowait, (item, error))
+        except RuntimeError:
+            # The loop is closed, nobody is listening anymore
+            stopped.set()
+
+    def pump() -> None:
+        try:
+            for item in iterable:
+                if stopped.is_set():
+                    return
+                put(item)
+            put(finished)
+        except Exception as e:
+            if not stopped.is_set():
+                put(finished, e)
+
+    thread = threading.Thread(target=pump, name=name, daemon=True)
+    thread.start()
+    try:
+        while True:
+            item, error = await queue.get()
+            if item is finished:
+                if error is not None:
+                    raise error
+                return
+            yield item
+    finally:
+        stopped.set()
+        if thread.is_alive() and on_close is not None:
+            try:
+                on_close()
+            except Exception as e:
+                logger.debug(f"Closing {name} failed: {e}")
+
+
+def shutdown_blocking_executor(wait: bool = True) -> None:
+    """Shut the shared executor down; a new one is created on next use"""
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=wait)
+            _executor = None
+
+
+class BackgroundLoop:
+    """
+    An event loop running forever on its own daemon thread.
+
+    Sync code hands coroutines to it with run(), so async SDK clients created
+    for the loop (and their HTTP sessions) can be reused across calls instead
+    of being rebuilt under a fresh asyncio.run() every time.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        """The running loop, started on first use"""
+        if self._loop is None:
+            with self._lock:
+                if self._loop is None:
+                    loop = asyncio.new_event_loop()
+                    thread = threading.Thread(target=loop.run_forever, name=self.name, daemon=True)
+                    thread.start()
+                    self._thread = thread
+                    self._loop = loop
+        return self._loop
+
+    @property
+    def running(self) -> bool:
+        return self._loop is not None
+
+    def submit(self, coro) -> Future:
+        """Schedule a coroutine on the loop and return a concurrent Future"""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def run(self, coro, timeout: Optional[float] = None) -> Any:
+        """Run a coroutine on the loop and block until it finishes"""
+        return self.submit(coro).result(timeout=timeout)
+
+    def stop(self, cleanup: Optional[Callable[[], Awaitable[Any]]] = None, timeout: float = 5) -> None:
+        """Run an optional async cleanup on the loop, then stop it and join the thread"""
+        with self._lock:
+            loop, self._loop = self._loop, None
+            thread, self._thread = self._thread, None
+        if loop is None:
+            return
+        if cleanup is not None:
+            try:
+                asyncio.run_coroutine_threadsafe(cleanup(), loop).result(timeout=timeout)
+            except Exception as e:
+                logger.debug(f"Cleanup on {self.name} failed: {e}")
+        loop.call_soon_threadsafe(loop.stop)
+        if thread is not None:
+            thread.join(timeout=timeout)
+        loop.close()
@@ -0,0 +1,248 @@
+import logging
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple, Union
+
+from eth_abi import decode, encode
+from eth_utils import keccak, to_checksum_address
+
+from src.helpers.http_transport import http_transport
+from src.helpers.rpc_pool import RpcPool
+
+logger = logging.getLogger("helpers.evm_batch")
+
+# Multicall3 is deployed at the same address on Ethereum, Base, Polygon, Sonic and most other chains
+MULTICALL3_ADDRESS = "0xcA11bde05977b3631167028862bE2a173976CA11"
+# Placeholder address aggregators use for the chain's native token
+NATIVE_TOKEN = "0xEeeeeEeeeEeEeeEeEeEeeEEEeeeeEeeeeeeeEEeE"
+# Sub-calls per aggregate3 / JSON-RPC batch request
+DEFAULT_CHUNK_SIZE = 300
+
+# An RPC URL, or a pool of them for failover and health tracking
+RpcTarget = Union[str, RpcPool]
+
+
+def _selector(signature: str) -> bytes:
+    return keccak(text=signature)[:4]
+
+
+SYMBOL = _selector("symbol()")
+DECIMALS = _selector("decimals()")
+BALANCE_OF = _selector("balanceOf(address)")
+GET_ETH_BALANCE = _selector("getEthBalance(address)")
+GET_BLOCK_NUMBER = _selector("getBlockNumber()")
+AGGREGATE3 = _selector("aggregate3((address,bool,bytes)[])")
+TRANSFER = _selector("transfer(address,uint256)")
+APPROVE = _selector("approve(address,uint256)")
+
+
+class BatchCallError(Exception):
+    """Raised when a batched RPC request fails as a whole"""
+    pass
+
+
+def parse_address_list(value) -> List[str]:
+    """Accept a list of addresses or a comma separated string ("0x..,0x..")"""
+    if isinstance(value, str):
+        value = [part.strip() for part in value.split(",") if part.strip()]
+    addresses = [to_checksum_address(address) for address in value]
+    if not addresses:
+        raise ValueError("At least one address is required")
+    return addresses
+
+
+def decode_uint(data: bytes) -> int:
+    return decode(["uint256"], data)[0]
+
+
+def decode_symbol(data: bytes) -> str:
+    # A few old tokens (e.g. MKR) return bytes32 instead of string
+    try:
+        return decode(["string"], data)[0]
+    except Exception:
+        return data[:32].rstrip(b"\x00").decode("utf-8", errors="replace")
+
+
+def erc20_calldata(selector: bytes, address: str, amount: int) -> str:
+    """Hex calldata of transfer(address,uint256) or approve(address,uint256)"""
+    return "0x" + (selector + encode(["address", "uint256"], [to_checksum_address(address), amount])).hex()
+
+
+def _is_native(token: Optional[str]) -> bool:
+    return token is None or token.lower() == NATIVE_TOKEN.lower()
+
+
+class Call:
+    """One read-only contract call and the decoder of its return data"""
+
+    __slots__ = ("target", "data", "decoder", "rpc")
+
+    def __init__(self, target: str, data: bytes, decoder: Callable[[bytes], Any], rpc: Optional[Tuple[str, list]] = None):
+        self.target = target
+        self.data = data
+        self.decoder = decoder
+        # Equivalent standalone JSON-RPC request, used when there is no Multicall3
+        self.rpc = rpc or ("eth_call", [{"to": target, "data": "0x" + data.hex()}, "latest"])
+
+
+def _rpc(rpc: RpcTarget, payload: Any) -> Any:
+    if isinstance(rpc, RpcPool):
+        return rpc.send(payload)
+    response = http_transport.post(rpc, json=payload)
+    response.raise_for_status()
+    return response.json()
+
+
+def _run_multicall(rpc: RpcTarget, calls: Sequence[Call], multicall_address: str) -> List[Tuple[bool, bytes]]:
+    calldata = AGGREGATE3 + encode(
+        ["(address,bool,bytes)[]"],
+        [[(call.target, True, call.data) for call in calls]],
+    )
+    reply = _rpc(rpc, {
+        "jsonrpc": "2.0",
+        "id": 1,
+        "method": "eth_call",
+        "params": [{"to": multicall_address, "data": "0x" + calldata.hex()}, "latest"],
+    })
+    if "error" in reply:
+        raise BatchCallError(f"aggregate3 failed: {reply['error']}")
+    return decode(["(bool,bytes)[]"], bytes.fromhex(reply["result"][2:]))[0]
+
+
+def _run_rpc_batch(rpc: RpcTarget, calls: Sequence[Call]) -> List[Tuple[bool, bytes]]:
+    payload = [
+        {"jsonrpc": "2.0", "id": i, "method": method, "params": params}
+        for i, (method, params) in enumerate(call.rpc for call in calls)
+    ]
+    replies = _rpc(rpc, payload)
+    if isinstance(replies, dict):
+        raise BatchCallError(f"JSON-RPC batch failed: {replies.get('error', replies)}")
+    by_id = {reply.get("id"): reply for reply in replies}
+    results = []
+    for i, call in enumerate(calls):
+        reply = by_id.get(i, {})
+        if reply.get("result") is None:
+            results.append((False, b""))
+        elif call.rpc[0] == "eth_call":
+            results.append((True, bytes.fromhex(reply["result"][2:])))
+        else:
+            # eth_getBalance / eth_blockNumber return quantities; encode them as an ABI word
+            results.append((True, encode(["uint256"], [int(reply["result"], 16)])))
+    return results
+
+
+def execute_calls(
+    rpc: RpcTarget,
+    calls: Sequence[Call],
+    use_multicall: bool = True,
+    multicall_address: str = MULTICALL3_ADDRESS,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> List[Tuple[bool, Any]]:
+    """
+    Run read-only calls in as few round-trips as possible and decode the results.
+
+    Calls go through Multicall3 aggregate3 (allowFailure=True), falling back
+    to a JSON-RPC batch of eth_call requests if the chain has no Multicall3.
+    rpc is an RPC URL or an RpcPool. Returns (success, decoded value) per call, in order.
+    """
+    raw: List[Tuple[bool, bytes]] = []
+    for start in range(0, len(calls), chunk_size):
+        chunk = calls[start:start + chunk_size]
+        if use_multicall:
+            try:
+                raw.extend(_run_multicall(rpc, chunk, multicall_address))
+                continue
+            except Exception as e:
+                logger.warning(f"Multicall3 unavailable on {rpc}, using a JSON-RPC batch: {e}")
+                use_multicall = False
+        raw.extend(_run_rpc_batch(rpc, chunk))
+
+    results = []
+    for call, (success, data) in zip(calls, raw):
+        if not success or not data:
+            results.append((False, None))
+            continue
+        try:
+            results.append((True, call.decoder(data)))
+        except Exception:
+            results.append((False, None))
+    return results
+
+
+def get_portfolio(
+    rpc: RpcTarget,
+    pairs: Iterable[Tuple[str, Optional[str]]],
+    native_symbol: str = "ETH",
+    use_multicall: bool = True,
+    multicall_address: str = MULTICALL3_ADDRESS,
+    token_metadata: Optional[Mapping[str, Tuple[Optional[str], int]]] = None,
+) -> Dict[str, Any]:
+    """
+    Balances of many (wallet, token) pairs in one round-trip.
+
+    A token of None (or the native token placeholder) means the native
+    balance. symbol() and decimals() are read once per distinct token unless
+    token_metadata (e.g. a TokenMetadataStore) already maps its checksum
+    address to (symbol, decimals).
+
+    Returns a snapshot:
+        {"block_number": 123, "balances": [{"wallet", "token", "symbol",
+         "decimals", "raw", "balance"}, ...]}
+    where a balance that could not be read has raw/balance None and an "error".
+    """
+    pairs = [
+        (to_checksum_address(wallet), None if _is_native(token) else to_checksum_address(token))
+        for wallet, token in pairs
+    ]
+    token_metadata = token_metadata or {}
+    multicall_address = to_checksum_address(multicall_address)
+
+    # Read in the same batch so every balance in the snapshot is from one block
+    calls: List[Call] = [Call(multicall_address, GET_BLOCK_NUMBER, decode_uint, ("eth_blockNumber", []))]
+
+    metadata_index: Dict[str, Tuple[int, int]] = {}
+    for token in dict.fromkeys(token for _, token in pairs if token is not None):
+        if token in token_metadata:
+            continue
+        metadata_index[token] = (len(calls), len(calls) + 1)
+        calls.append(Call(token, SYMBOL, decode_symbol))
+        calls.append(Call(token, DECIMALS, decode_uint))
+
+    balance_index = []
+    for wallet, token in pairs:
+        balance_index.append(len(calls))
+        if token is None:
+            calls.append(Call(
+                multicall_address,
+                GET_ETH_BALANCE + encode(["address"], [wallet]),
+                decode_uint,
+                ("eth_getBalance", [wallet, "latest"]),
+            ))
+        else:
+            calls.append(Call(token, BALANCE_OF + encode(["address"], [wallet]), decode_uint))
+
+    results = execute_calls(rpc, calls, use_multicall=use_multicall, multicall_address=multicall_address)
+
+    metadata = {token: token_metadata[token] for _, token in pairs if token is not None and token in token_metadata}
+    for token, (symbol_at, decimals_at) in metadata_index.items():
+        (symbol_ok, symbol), (decimals_ok, decimals) = results[symbol_at], results[decimals_at]
+        metadata[token] = (symbol if symbol_ok else None, decimals if decimals_ok else None)
+
+    balances = []
+    for (wallet, token), index in zip(pairs, balance_index):
+        symbol, decimals = (native_symbol, 18) if token is None else metadata[token]
+        ok, raw = results[index]
+        entry = {
+            "wallet": wallet,
+            "token": token or NATIVE_TOKEN,
+            "symbol": symbol,
+            "decimals": decimals,
+            "raw": raw if ok else None,
+            "balance": raw / (10 ** decimals) if ok and decimals is not None else None,
+        }
+        if not ok:
+            entry["error"] = "balance call failed"
+        elif decimals is None:
+            entry["error"] = "decimals call failed"
+        balances.append(entry)
+
+    block_ok, block_number = results[0]
+    return {"block_number": block_number if block_ok else None, "balances": balances}
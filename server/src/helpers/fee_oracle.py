@@ -0,0 +1,172 @@
+import logging
+import statistics
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Optional, Tuple, Union
+
+from web3 import Web3
+
+logger = logging.getLogger("helpers.fee_oracle")
+
+# Seconds between background fee polls
+DEFAULT_POLL_INTERVAL = 12
+# Blocks requested per eth_feeHistory call
+FEE_HISTORY_BLOCKS = 20
+# Tips of the most recent blocks kept per speed for the rolling percentile
+TIP_WINDOW = 120
+# Reward percentile of each block used for each speed
+TIP_PERCENTILES = {"slow": 10, "standard": 50, "fast": 90}
+# maxFeePerGas = multiplier * next base fee + tip, so a few full blocks in a row don't strand the transaction
+BASE_FEE_MULTIPLIER = 2
+# Cached gas estimates are trusted for this long
+GAS_CACHE_TTL = 600
+# A cached estimate was measured against older state; leave room for it to have grown
+CACHED_GAS_HEADROOM = 1.25
+
+GasKey = Tuple[str, str, int, bool]
+
+
+class FeeOracle:
+    """
+    Gas fees and gas limits of one chain without RPC calls on the send path.
+
+    A background thread polls eth_feeHistory (and eth_gasPrice) and keeps the
+    priority fee paid at the 10th/50th/90th percentile of each recent block;
+    the tip for a speed is the median of that column over the last
+    TIP_WINDOW blocks. Chains without EIP-1559 (no base fee) get legacy
+    gasPrice. estimate_gas() results are cached per (contract, selector,
+    calldata length, sends value), keeping the largest estimate seen.
+    """
+
+    def __init__(self, web3: Web3, chain_id: Union[int, str], poll_interval: float = DEFAULT_POLL_INTERVAL):
+        self.web3 = web3
+        self.chain_id = chain_id
+        self.poll_interval = poll_interval
+        self.eip1559 = False
+        self._base_fee: Optional[int] = None
+        self._gas_price: Optional[int] = None
+        self._tips: Dict[str, Deque[int]] = {speed: deque(maxlen=TIP_WINDOW) for speed in TIP_PERCENTILES}
+        self._last_block = -1
+        self._updated_at = 0.0
+        self._gas_estimates: Dict[GasKey, Tuple[int, float]] = {}
+        self._lock = threading.Lock()
+        self._poller: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._counters = {"fee_polls": 0, "gas_cache_hits": 0, "gas_estimates": 0}
+
+    def refresh(self) -> None:
+        """Poll the node once"""
+        self._counters["fee_polls"] += 1
+        try:
+            history = self.web3.eth.fee_history(FEE_HISTORY_BLOCKS, "latest", list(TIP_PERCENTILES.values()))
+            base_fees = history["baseFeePerGas"]
+            with self._lock:
+                # The last base fee is the one of the next block
+                self.eip1559 = bool(base_fees) and base_fees[-1] > 0
+                if self.eip1559:
+                    self._base_fee = base_fees[-1]
+                    # Successive polls overlap; only add blocks not seen yet
+                    for offset, rewards in enumerate(history.get("reward") or []):
+                        block = history["oldestBlock"] + offset
+                        if block <= self._last_block:
+                            continue
+                        self._last_block = block
+                        for speed, tip in zip(TIP_PERCENTILES, rewards):
+                            self._tips[speed].append(tip)
+        except Exception as e:
+            logger.debug(f"eth_feeHistory unavailable on chain {self.chain_id}: {e}")
+            self.eip1559 = False
+        try:
+            self._gas_price = self.web3.eth.gas_price
+        except Exception as e:
+            logger.warning(f"eth_gasPrice failed on chain {self.chain_id}: {e}")
+        self._updated_at = time.time()
+
+    def _poll(self) -> None:
+        while not self._stop.wait(self.poll_interval):
+            self.refresh()
+
+    def _ensure_fresh(self) -> None:
+        # Only the first call (or one after the poller fell behind) waits for the node
+        if time.time() - self._updated_at > 3 * self.poll_interval:
+            self.refresh()
+        if self._poller is None:
+            with self._lock:
+                if self._poller is None:
+                    self._poller = threading.Thread(
+                        target=self._poll, name=f"fee-oracle-{self.chain_id}", daemon=True
+                    )
+                    self._poller.start()
+
+    def fees(self, speed: str = "standard") -> Dict[str, int]:
+        """Fee fields to merge into a transaction: EIP-1559 maxFeePerGas/maxPriorityFeePerGas, or gasPrice"""
+        self._ensure_fresh()
+        with self._lock:
+            if self.eip1559:
+                tips = self._tips[speed]
+                tip = int(statistics.median(tips)) if tips else max((self._gas_price or 0) - self._base_fee, 0)
+                return {
+                    "maxPriorityFeePerGas": tip,
+                    "maxFeePerGas": BASE_FEE_MULTIPLIER * self._base_fee + tip,
+                }
+            if self._gas_price is None:
+                raise ValueError(f"No gas price available for chain {self.chain_id}")
+            return {"gasPrice": self._gas_price}
+
+    @staticmethod
+    def _gas_key(tx: Dict[str, Any]) -> Optional[GasKey]:
+        to = tx.get("to")
+        if not to:
+            return None
+        data = tx.get("data") or "0x"
+        if isinstance(data, bytes):
+            data = Web3.to_hex(data)
+        return (to.lower(), data[:10], len(data), bool(tx.get("value")))
+
+    def estimate_gas(self, tx: Dict[str, Any]) -> int:
+        """eth_estimateGas, answered from the cache for calls of the same shape"""
+        key = self._gas_key(tx)
+        now = time.time()
+        cached = self._gas_estimates.get(key) if key else None
+        if cached and cached[1] > now:
+            self._counters["gas_cache_hits"] += 1
+            return int(cached[0] * CACHED_GAS_HEADROOM)
+        self._counters["gas_estimates"] += 1
+        gas = self.web3.eth.estimate_gas(tx)
+        if key:
+            with self._lock:
+                previous = self._gas_estimates.get(key)
+                if previous and previous[1] > now:
+                    gas = max(gas, previous[0])
+                self._gas_estimates[key] = (gas, now + GAS_CACHE_TTL)
+        return gas
+
+    def close(self) -> None:
+        self._stop.set()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "chain_id": self.chain_id,
+            "eip1559": self.eip1559,
+            "base_fee": self._base_fee,
+            "gas_price": self._gas_price,
+            "tip_samples": len(self._tips["standard"]),
+            "cached_gas_estimates": len(self._gas_estimates),
+            **self._counters,
+        }
+
+
+_oracles: Dict[str, FeeOracle] = {}
+_oracles_lock = threading.Lock()
+
+
+def get_fee_oracle(web3: Web3, chain_id: Union[int, str]) -> FeeOracle:
+    """The process-wide fee oracle of a chain, shared by every connection"""
+    key = str(chain_id)
+    with _oracles_lock:
+        oracle = _oracles.get(key)
+        if oracle is None:
+            oracle = FeeOracle(web3, chain_id)
+            _oracles[key] = oracle
+        return oracle
@@ -0,0 +1,234 @@
+import asyncio
+import logging
+import os
+import threading
+import time
+import weakref
+from typing import Any, Dict, Optional, Tuple, Union
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger("helpers.http_transport")
+
+# Defaults can be overridden through the environment or configure_http()
+DEFAULT_POOL_CONNECTIONS = int(os.getenv("HTTP_POOL_CONNECTIONS", "10"))
+DEFAULT_POOL_MAXSIZE = int(os.getenv("HTTP_POOL_MAXSIZE", "20"))
+DEFAULT_MAX_RETRIES = int(os.getenv("HTTP_MAX_RETRIES", "0"))
+DEFAULT_CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", "5"))
+DEFAULT_READ_TIMEOUT = float(os.getenv("HTTP_READ_TIMEOUT", "60"))
+
+
+class HttpTransport:
+    """
+    Process-wide HTTP transport with one keep-alive session per host.
+
+    Every REST-based connection goes through here instead of calling the module
+    level requests.* helpers, so steady-state calls reuse pooled TCP/TLS
+    connections instead of paying a fresh handshake each time.
+    """
+
+    def __init__(
+        self,
+        pool_connections: int = DEFAULT_POOL_CONNECTIONS,
+        pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        timeout: Union[float, Tuple[float, float]] = (DEFAULT_CONNECT_TIMEOUT, DEFAULT_READ_TIMEOUT),
+    ):
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.max_retries = max_retries
+        self.timeout = timeout
+        self._sessions: Dict[str, requests.Session] = {}
+        self._stats: Dict[str, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def configure(
+        self,
+        pool_connections: Optional[int] = None,
+        pool_maxsize: Optional[int] = None,
+        max_retries: Optional[int] = None,
+        timeout: Optional[Union[float, Tuple[float, float]]] = None,
+    ) -> None:
+        """Change pool settings; sessions are rebuilt lazily with the new values"""
+        with self._lock:
+            if pool_connections is not None:
+                self.pool_connections = pool_connections
+            if pool_maxsize is not None:
+                self.pool_maxsize = pool_maxsize
+            if max_retries is not None:
+                self.max_retries = max_retries
+            if timeout is not None:
+                self.timeout = timeout
+            self._close_sessions()
+
+    @staticmethod
+    def _host_key(url: str) -> str:
+        parts = urlsplit(url)
+        return f"{parts.scheme}://{parts.netloc}"
+
+    def _new_session(self) -> requests.Session:
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=self.pool_connections,
+            pool_maxsize=self.pool_maxsize,
+            max_retries=self.max_retries,
+        )
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+    def get_session(self, url: str) -> requests.Session:
+        """Get (or create) the pooled session for the host of the given URL"""
+        host = self._host_key(url)
+        session = self._sessions.get(host)
+        if session is None:
+            with self._lock:
+                session = self._sessions.get(host)
+                if session is None:
+                    session = self._new_session()
+                    self._sessions[host] = session
+        return session
+
+    def _host_stats(self, host: str) -> Dict[str, float]:
+        return self._stats.setdefault(host, {"requests": 0, "errors": 0, "total_latency": 0.0})
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """Drop-in replacement for requests.request() that uses the pooled session"""
+        kwargs.setdefault("timeout", self.timeout)
+        session = self.get_session(url)
+        stats = self._host_stats(self._host_key(url))
+        start = time.perf_counter()
+        try:
+            return session.request(method, url, **kwargs)
+        except requests.RequestException:
+            stats["errors"] += 1
+            raise
+        finally:
+            stats["requests"] += 1
+            stats["total_latency"] += time.perf_counter() - start
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request("POST", url, **kwargs)
+
+    def put(self, url: str, **kwargs) -> requests.Response:
+        return self.request("PUT", url, **kwargs)
+
+    def metrics(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Per-host request counts, latency and connection reuse.
+
+        new_connections comes from urllib3's own pool counters, so
+        reused_connections is the number of requests that did not need a
+        new TCP/TLS handshake.
+        """
+        result = {}
+        for host, session in list(self._sessions.items()):
+            stats = self._host_stats(host)
+            new_connections = 0
+            pool_requests = 0
+            adapter = session.get_adapter(host)
+            pools = adapter.poolmanager.pools
+            for key in pools.keys():
+                pool = pools.get(key)
+                if pool is None:
+                    continue
+                new_connections += pool.num_connections
+                pool_requests += pool.num_requests
+            result[host] = {
+                "requests": stats["requests"],
+                "errors": stats["errors"],
+                "avg_latency_ms": (stats["total_latency"] / stats["requests"] * 1000) if stats["requests"] else 0.0,
+                "new_connections": new_connections,
+                "reused_connections": max(pool_requests - new_connections, 0),
+                "reuse_ratio": (1 - new_connections / pool_requests) if pool_requests else 0.0,
+            }
+        return result
+
+    def _close_sessions(self) -> None:
+        for session in self._sessions.values():
+            session.close()
+        self._sessions.clear()
+        self._stats.clear()
+
+    def close(self) -> None:
+        """Close every pooled connection"""
+        with self._lock:
+            self._close_sessions()
+
+
+class AsyncHttpTransport:
+    """
+    aiohttp counterpart of HttpTransport for the async execution path.
+
+    Keeps one ClientSession per event loop (aiohttp sessions cannot be shared
+    across loops) with a connector limited per host to the same pool size.
+    """
+
+    def __init__(
+        self,
+        pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+        connect_timeout: float = DEFAULT_CONNECT_TIMEOUT,
+        read_timeout: float = DEFAULT_READ_TIMEOUT,
+    ):
+        self.pool_maxsize = pool_maxsize
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self._sessions = weakref.WeakKeyDictionary()
+        self._stats: Dict[str, int] = {"requests": 0}
+
+    def get_session(self):
+        """Get (or create) the aiohttp session bound to the running event loop"""
+        # Imported lazily so that sync-only processes never pay for aiohttp
+        import aiohttp
+
+        loop = asyncio.get_running_loop()
+        session = self._sessions.get(loop)
+        if session is None or session.closed:
+            session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit_per_host=self.pool_maxsize, keepalive_timeout=60),
+                timeout=aiohttp.ClientTimeout(sock_connect=self.connect_timeout, sock_read=self.read_timeout),
+            )
+            self._sessions[loop] = session
+        return session
+
+    def request(self, method: str, url: str, **kwargs):
+        """
+        Start a request on the pooled session.
+
+        Returns aiohttp's request context manager, use it as
+        ``async with async_http_transport.request("GET", url) as response:``
+        """
+        self._stats["requests"] += 1
+        return self.get_session().request(method, url, **kwargs)
+
+    async def request_json(self, method: str, url: str, **kwargs) -> Any:
+        """Perform a request, raise on HTTP errors and return the decoded JSON body"""
+        async with self.request(method, url, **kwargs) as response:
+            response.raise_for_status()
+            return await response.json(content_type=None)
+
+    async def close(self) -> None:
+        """Close the session bound to the running event loop"""
+        session = self._sessions.pop(asyncio.get_running_loop(), None)
+        if session is not None:
+            await session.close()
+
+
+# Shared by every connection in the process
+http_transport = HttpTransport()
+async_http_transport = AsyncHttpTransport()
+
+
+def configure_http(**kwargs) -> None:
+    """Configure the shared transport (pool_connections, pool_maxsize, max_retries, timeout)"""
+    http_transport.configure(**kwargs)
+
+
+def get_http_metrics() -> Dict[str, Dict[str, Any]]:
+    """Connection reuse and latency metrics of the shared transport, per host"""
+    return http_transport.metrics()
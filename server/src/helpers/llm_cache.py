@@ -0,0 +1,225 @@
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+logger = logging.getLogger("helpers.llm_cache")
+
+DEFAULT_MAX_ENTRIES = 1000
+DEFAULT_TTL = 3600
+DEFAULT_SQLITE_PATH = os.path.join(".cache", "llm_responses.sqlite3")
+
+
+def make_cache_key(provider: str, model: Optional[str], system_prompt: str, prompt: str, hashed: bool = True) -> str:
+    """
+    Build the cache key for a generate-text call.
+
+    With hashed=False the key is the JSON encoded (provider, model, system_prompt,
+    prompt) tuple itself; otherwise it is its sha256, which keeps keys small when
+    system prompts are long.
+    """
+    raw = json.dumps([provider, model, system_prompt, prompt], ensure_ascii=False)
+    if not hashed:
+        return raw
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class ResponseCache(ABC):
+    """Base class for generate-text response caches"""
+
+    # Whether get/set touch the disk and should be kept off the event loop
+    blocking = False
+
+    def __init__(self, ttl: Optional[float] = DEFAULT_TTL, hashed_keys: bool = True):
+        self.ttl = ttl
+        self.hashed_keys = hashed_keys
+        self._counters = {"hits": 0, "misses": 0, "sets": 0, "evictions": 0}
+
+    def key(self, provider: str, model: Optional[str], system_prompt: str, prompt: str) -> str:
+        return make_cache_key(provider, model, system_prompt, prompt, hashed=self.hashed_keys)
+
+    def _expired(self, stored_at: float) -> bool:
+        return bool(self.ttl) and time.time() - stored_at > self.ttl
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[str]:
+        """Cached value of key, or None when missing or expired"""
+        pass
+
+    @abstractmethod
+    def set(self, key: str, value: str) -> None:
+        pass
+
+    @abstractmethod
+    def clear(self) -> None:
+        pass
+
+    @abstractmethod
+    def __len__(self) -> int:
+        pass
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters plus the current size"""
+        lookups = self._counters["hits"] + self._counters["misses"]
+        return {
+            "backend": type(self).__name__,
+            **self._counters,
+            "hit_ratio": self._counters["hits"] / lookups if lookups else 0.0,
+            "entries": len(self),
+        }
+
+
+class MemoryResponseCache(ResponseCache):
+    """In-process LRU cache with size and TTL eviction"""
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, ttl: Optional[float] = DEFAULT_TTL, hashed_keys: bool = True):
+        super().__init__(ttl=ttl, hashed_keys=hashed_keys)
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self._expired(entry[0]):
+                del self._entries[key]
+                self._counters["evictions"] += 1
+                entry = None
+            if entry is None:
+                self._counters["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._counters["hits"] += 1
+            return entry[1]
+
+    def set(self, key: str, value: str) -> None:
+        with self._lock:
+            self._entries[key] = (time.time(), value)
+            self._entries.move_to_end(key)
+            self._counters["sets"] += 1
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._counters["evictions"] += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SQLiteResponseCache(ResponseCache):
+    """
+    On-disk cache, survives restarts and can be shared by every agent (and
+    process) pointing at the same file. Entries past the TTL are dropped on
+    read; the oldest entries are pruned once max_entries is exceeded.
+    """
+
+    blocking = True
+
+    def __init__(
+        self,
+        path: str = DEFAULT_SQLITE_PATH,
+        max_entries: Optional[int] = None,
+        ttl: Optional[float] = DEFAULT_TTL,
+        hashed_keys: bool = True,
+    ):
+        super().__init__(ttl=ttl, hashed_keys=hashed_keys)
+        self.path = path
+        self.max_entries = max_entries
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, stored_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS responses_stored_at ON responses (stored_at)")
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, stored_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None and self._expired(row[1]):
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._counters["evictions"] += 1
+                row = None
+            if row is None:
+                self._counters["misses"] += 1
+                return None
+            self._counters["hits"] += 1
+            return row[0]
+
+    def set(self, key: str, value: str) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, value, stored_at) VALUES (?, ?, ?)",
+                (key, value, time.time()),
+            )
+            self._counters["sets"] += 1
+            if self.max_entries:
+                pruned = self._conn.execute(
+                    "DELETE FROM responses WHERE key NOT IN "
+                    "(SELECT key FROM responses ORDER BY stored_at DESC LIMIT ?)",
+                    (self.max_entries,),
+                ).rowcount
+                self._counters["evictions"] += max(pruned, 0)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+
+CACHE_BACKENDS = {
+    "memory": MemoryResponseCache,
+    "sqlite": SQLiteResponseCache,
+}
+
+# Agents with an identical cache config share one cache instance
+_shared_caches: Dict[str, ResponseCache] = {}
+_shared_caches_lock = threading.Lock()
+
+
+def get_response_cache(config: Optional[Dict[str, Any]]) -> Optional[ResponseCache]:
+    """
+    Build (or reuse) the response cache described by an agent's "llm_cache" config.
+
+    Example:
+        "llm_cache": {"backend": "memory", "max_entries": 500, "ttl": 600}
+        "llm_cache": {"backend": "sqlite", "path": ".cache/llm.sqlite3", "ttl": 86400}
+
+    Returns None when the config is missing or has "enabled": false.
+    """
+    if not config or not config.get("enabled", True):
+        return None
+
+    options = {k: v for k, v in config.items() if k != "enabled"}
+    backend = options.pop("backend", "memory")
+    if backend not in CACHE_BACKENDS:
+        raise ValueError(f"Unknown llm_cache backend: {backend}")
+    if "key" in options:
+        options["hashed_keys"] = options.pop("key") != "exact"
+
+    cache_id = json.dumps([backend, options], sort_keys=True)
+    with _shared_caches_lock:
+        cache = _shared_caches.get(cache_id)
+        if cache is None:
+            cache = CACHE_BACKENDS[backend](**options)
+            _shared_caches[cache_id] = cache
+            logger.info(f"Enabled {backend} LLM response cache")
+        return cache
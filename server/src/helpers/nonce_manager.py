@@ -0,0 +1,256 @@
+import heapq
+import logging
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Dict, List, Optional, Set, Tuple, Union
+
+from web3 import Web3
+from web3.exceptions import TransactionNotFound
+
+logger = logging.getLogger("helpers.nonce_manager")
+
+# Seconds between receipt polls of in-flight transactions
+RECEIPT_POLL_INTERVAL = 1.0
+# A transaction without a receipt after this long is treated as dropped
+RECEIPT_TIMEOUT = 300
+# Attempts per transaction when the node rejects its nonce
+SEND_RETRIES = 3
+
+# Node errors meaning the nonce is out of step with the chain (already used, or past a gap)
+NONCE_ERRORS = (
+    "nonce too low",
+    "nonce too high",
+    "already known",
+    "known transaction",
+    "replacement transaction underpriced",
+    "invalid nonce",
+)
+
+
+def is_nonce_error(error: Exception) -> bool:
+    message = str(error).lower()
+    return any(marker in message for marker in NONCE_ERRORS)
+
+
+class NonceManager:
+    """
+    Allocates the nonces of one wallet locally.
+
+    The first allocation reads the wallet's pending transaction count; after
+    that nonces are handed out from memory, so several transactions can be
+    signed and sent without waiting for each other. An allocated nonce stays
+    reserved until its sender reports it with mark_sent() (broadcast),
+    release() (never reached the node, hand it out again) or discard() (the
+    node says it is used). resync() re-reads the pending count from the node:
+    it skips past nonces used by another process, and it fills the gap left
+    by a dropped transaction, but only once no later nonce is still being
+    sent, so a reserved nonce is never handed out twice.
+    """
+
+    def __init__(self, web3: Web3, address: str):
+        self.web3 = web3
+        self.address = Web3.to_checksum_address(address)
+        self._next: Optional[int] = None
+        self._unsent: Set[int] = set()
+        self._released: List[int] = []
+        self._lock = threading.Lock()
+        self.resyncs = 0
+
+    def allocate(self) -> int:
+        with self._lock:
+            if self._released:
+                nonce = heapq.heappop(self._released)
+            else:
+                if self._next is None:
+                    self._next = self.web3.eth.get_transaction_count(self.address, "pending")
+                nonce = self._next
+                self._next += 1
+            self._unsent.add(nonce)
+            return nonce
+
+    def mark_sent(self, nonce: int) -> None:
+        with self._lock:
+            self._unsent.discard(nonce)
+
+    def release(self, nonce: int) -> None:
+        """Give back a nonce whose transaction never reached the node; the next allocation reuses it"""
+        with self._lock:
+            if nonce in self._unsent:
+                self._unsent.discard(nonce)
+                heapq.heappush(self._released, nonce)
+
+    def discard(self, nonce: int) -> None:
+        """Forget a nonce the node rejected as used"""
+        with self._lock:
+            self._unsent.discard(nonce)
+
+    def resync(self) -> int:
+        """Realign with the node's pending nonce and return the next nonce to allocate"""
+        with self._lock:
+            pending = self.web3.eth.get_transaction_count(self.address, "pending")
+            self.resyncs += 1
+            if self._next is None or pending >= self._next or not any(nonce >= pending for nonce in self._unsent):
+                # Released nonces below the new count were used elsewhere, the ones above it are allocated again
+                self._next = pending
+                self._released = []
+            else:
+                # Another thread is about to send a nonce past the node's count: moving back would hand it out again
+                self._released = [nonce for nonce in self._released if nonce >= pending]
+                heapq.heapify(self._released)
+            logger.info(f"Resynced nonce of {self.address} to {self._next} (node pending count {pending})")
+            return self._released[0] if self._released else self._next
+
+
+class PendingTransaction:
+    """A sent transaction whose receipt is tracked in the background"""
+
+    def __init__(self, tx_hash: str, nonce: int):
+        self.tx_hash = tx_hash
+        self.nonce = nonce
+        self.sent_at = time.time()
+        self.future: "Future[Dict[str, Any]]" = Future()
+
+    def done(self) -> bool:
+        return self.future.done()
+
+    def receipt(self, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """Block until the transaction is mined; raises TimeoutError if it was dropped"""
+        return self.future.result(timeout)
+
+    def add_done_callback(self, callback) -> None:
+        """Call callback(PendingTransaction) once the receipt (or a failure) is known"""
+        self.future.add_done_callback(lambda _: callback(self))
+
+
+class TransactionPipeline:
+    """
+    Sends the transactions of one wallet back-to-back and tracks their receipts.
+
+    submit() assigns a nonce from the wallet's NonceManager, signs and
+    broadcasts, and returns a PendingTransaction right away. A nonce rejected
+    by the node triggers a resync and a retry with a fresh nonce; any other
+    send failure releases the nonce, so the next transaction reuses it. One background thread polls the receipts of every in-flight
+    transaction and stops when none are left.
+    """
+
+    def __init__(
+        self,
+        web3: Web3,
+        account,
+        poll_interval: float = RECEIPT_POLL_INTERVAL,
+        receipt_timeout: float = RECEIPT_TIMEOUT,
+    ):
+        self.web3 = web3
+        self.account = account
+        self.nonces = NonceManager(web3, account.address)
+        self.poll_interval = poll_interval
+        self.receipt_timeout = receipt_timeout
+        self._pending: Dict[str, PendingTransaction] = {}
+        self._lock = threading.Lock()
+        self._tracker: Optional[threading.Thread] = None
+        self._counters = {"submitted": 0, "confirmed": 0, "reverted": 0, "dropped": 0, "send_errors": 0}
+
+    def submit(self, tx: Dict[str, Any]) -> PendingTransaction:
+        """Sign and broadcast tx (any 'nonce' in it is replaced)"""
+        for attempt in range(SEND_RETRIES):
+            nonce = self.nonces.allocate()
+            tx = {**tx, "nonce": nonce}
+            try:
+                signed = self.account.sign_transaction(tx)
+                # eth-account 0.13 renamed rawTransaction
+                raw = getattr(signed, "raw_transaction", None) or signed.rawTransaction
+                tx_hash = self.web3.eth.send_raw_transaction(raw)
+            except Exception as e:
+                with self._lock:
+                    self._counters["send_errors"] += 1
+                if not is_nonce_error(e):
+                    self.nonces.release(nonce)
+                    raise
+                self.nonces.discard(nonce)
+                self.nonces.resync()
+                if attempt < SEND_RETRIES - 1:
+                    logger.warning(f"Nonce {nonce} rejected for {self.account.address}: {e}, retrying")
+                    continue
+                raise
+            self.nonces.mark_sent(nonce)
+            break
+
+        pending = PendingTransaction(Web3.to_hex(tx_hash), tx["nonce"])
+        with self._lock:
+            self._pending[pending.tx_hash] = pending
+            self._counters["submitted"] += 1
+            if self._tracker is None:
+                self._tracker = threading.Thread(
+                    target=self._track_receipts, name=f"tx-receipts-{self.account.address[:10]}", daemon=True
+                )
+                self._tracker.start()
+        return pending
+
+    def _track_receipts(self) -> None:
+        while True:
+            time.sleep(self.poll_interval)
+            with self._lock:
+                pending = list(self._pending.values())
+            finished: List[Tuple[PendingTransaction, Union[Dict[str, Any], Exception]]] = []
+            dropped = False
+            for tx in pending:
+                try:
+                    receipt = self.web3.eth.get_transaction_receipt(tx.tx_hash)
+                except TransactionNotFound:
+                    receipt = None
+                except Exception as e:
+                    logger.warning(f"Receipt poll for {tx.tx_hash} failed: {e}")
+                    continue
+                if receipt is not None:
+                    finished.append((tx, receipt))
+                elif time.time() - tx.sent_at > self.receipt_timeout:
+                    finished.append((tx, TimeoutError(f"No receipt for {tx.tx_hash} after {self.receipt_timeout}s")))
+                    dropped = True
+
+            with self._lock:
+                for tx, result in finished:
+                    del self._pending[tx.tx_hash]
+                    if isinstance(result, Exception):
+                        self._counters["dropped"] += 1
+                    else:
+                        self._counters["confirmed" if result["status"] == 1 else "reverted"] += 1
+                idle = not self._pending
+                if idle:
+                    self._tracker = None
+            # A dropped transaction leaves a gap every later nonce would queue behind
+            if dropped:
+                self.nonces.resync()
+            for tx, result in finished:
+                if isinstance(result, Exception):
+                    tx.future.set_exception(result)
+                else:
+                    tx.future.set_result(result)
+            if idle:
+                return
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "address": self.account.address,
+            "in_flight": len(self._pending),
+            "nonce_resyncs": self.nonces.resyncs,
+            **self._counters,
+        }
+
+
+_pipelines: Dict[Tuple[str, str], TransactionPipeline] = {}
+_pipelines_lock = threading.Lock()
+
+
+def get_transaction_pipeline(web3: Web3, chain_id: Union[int, str], account) -> TransactionPipeline:
+    """
+    The process-wide pipeline of a wallet on a chain. Every connection
+    sending from the same wallet must share it, or their nonces collide.
+    """
+    key = (str(chain_id), account.address)
+    with _pipelines_lock:
+        pipeline = _pipelines.get(key)
+        if pipeline is None:
+            pipeline = TransactionPipeline(web3, account)
+            _pipelines[key] = pipeline
+        return pipeline
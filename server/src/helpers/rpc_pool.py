@@ -0,0 +1,257 @@
+import itertools
+import logging
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+from web3.providers import JSONBaseProvider
+
+from src.helpers.http_transport import http_transport
+
+logger = logging.getLogger("helpers.rpc_pool")
+
+# Weight of the newest sample in the latency / error moving averages
+EWMA_ALPHA = 0.2
+# Consecutive failures before an endpoint is taken out of rotation
+FAILURES_BEFORE_COOLDOWN = 3
+# First cooldown, doubled on every further failure up to MAX_COOLDOWN
+BASE_COOLDOWN = 5
+MAX_COOLDOWN = 300
+# Every Nth read goes to another healthy endpoint so its latency stays current
+EXPLORE_EVERY = 20
+# Latency assumed for an endpoint that has not answered yet: try it first, so every endpoint gets measured
+UNKNOWN_LATENCY = 0.0
+# Calls that must reach the same node: it holds our pending transactions
+WRITE_METHODS = {"eth_sendRawTransaction", "eth_sendTransaction"}
+HEDGE_WORKERS = 8
+
+
+class RpcPoolError(Exception):
+    """Raised when no endpoint of the pool could answer a request"""
+    pass
+
+
+class RpcEndpoint:
+    """Health and latency of one RPC URL"""
+
+    def __init__(self, url: str):
+        self.url = url
+        self.requests = 0
+        self.errors = 0
+        self.hedge_wins = 0
+        self.latency: Optional[float] = None
+        self.error_rate = 0.0
+        self.consecutive_failures = 0
+        self.cooldown_until = 0.0
+
+    def healthy(self, now: float) -> bool:
+        return now >= self.cooldown_until
+
+    def score(self) -> float:
+        """Expected cost of a call; lower is better"""
+        latency = self.latency if self.latency is not None else UNKNOWN_LATENCY
+        return latency * (1 + 10 * self.error_rate)
+
+    def record_success(self, elapsed: float) -> None:
+        self.requests += 1
+        self.latency = elapsed if self.latency is None else (1 - EWMA_ALPHA) * self.latency + EWMA_ALPHA * elapsed
+        self.error_rate *= 1 - EWMA_ALPHA
+        self.consecutive_failures = 0
+
+    def record_failure(self, now: float) -> None:
+        self.requests += 1
+        self.errors += 1
+        self.error_rate = (1 - EWMA_ALPHA) * self.error_rate + EWMA_ALPHA
+        self.consecutive_failures += 1
+        if self.consecutive_failures >= FAILURES_BEFORE_COOLDOWN:
+            excess = self.consecutive_failures - FAILURES_BEFORE_COOLDOWN
+            self.cooldown_until = now + min(BASE_COOLDOWN * 2 ** excess, MAX_COOLDOWN)
+
+    def stats(self, now: float) -> Dict[str, Any]:
+        return {
+            "url": self.url,
+            "healthy": self.healthy(now),
+            "requests": self.requests,
+            "errors": self.errors,
+            "error_rate": round(self.error_rate, 4),
+            "latency_ms": round(self.latency * 1000, 1) if self.latency is not None else None,
+            "cooldown_remaining": max(round(self.cooldown_until - now, 1), 0),
+            "hedge_wins": self.hedge_wins,
+        }
+
+
+class RpcPool:
+    """
+    JSON-RPC over several endpoints of the same chain.
+
+    Reads go to the healthy endpoint with the best latency/error score, and
+    fail over to the next one on transport errors (timeouts, refused
+    connections, HTTP errors). JSON-RPC error replies such as reverts are
+    answers, not endpoint failures. send() does the same for a raw payload,
+    e.g. a JSON-RPC batch. With hedge_after set, a read still
+    running after that many seconds is also sent to the second-best endpoint
+    and the first answer wins. Writes stick to one endpoint, which keeps our
+    pending transactions and nonces on a single mempool, until it fails.
+    """
+
+    def __init__(self, urls: Sequence[str], hedge_after: Optional[float] = None, timeout: Optional[float] = None):
+        if not urls:
+            raise ValueError("RpcPool needs at least one URL")
+        self.endpoints = [RpcEndpoint(url) for url in dict.fromkeys(urls)]
+        self.hedge_after = hedge_after
+        self.timeout = timeout
+        self._write_endpoint: Optional[RpcEndpoint] = None
+        self._ids = itertools.count(1)
+        self._reads = itertools.count()
+        self._lock = threading.Lock()
+        self._hedge_executor: Optional[ThreadPoolExecutor] = None
+
+    @property
+    def primary_url(self) -> str:
+        return self.endpoints[0].url
+
+    def __str__(self) -> str:
+        return f"RpcPool({', '.join(endpoint.url for endpoint in self.endpoints)})"
+
+    @staticmethod
+    def _describe(payload: Union[Dict[str, Any], List[Dict[str, Any]]]) -> str:
+        return payload["method"] if isinstance(payload, dict) else f"batch of {len(payload)} calls"
+
+    def _ranked(self) -> List[RpcEndpoint]:
+        now = time.time()
+        healthy = [endpoint for endpoint in self.endpoints if endpoint.healthy(now)]
+        # With every endpoint cooling down, the one that recovers first is the best bet
+        if not healthy:
+            return sorted(self.endpoints, key=lambda endpoint: endpoint.cooldown_until)
+        ranked = sorted(healthy, key=RpcEndpoint.score)
+        if len(ranked) > 1 and next(self._reads) % EXPLORE_EVERY == EXPLORE_EVERY - 1:
+            ranked.insert(0, ranked.pop(1 + next(self._reads) % (len(ranked) - 1)))
+        return ranked
+
+    def _send(self, endpoint: RpcEndpoint, payload: Union[Dict[str, Any], List[Dict[str, Any]]]) -> Any:
+        start = time.perf_counter()
+        try:
+            kwargs = {"timeout": self.timeout} if self.timeout else {}
+            response = http_transport.post(endpoint.url, json=payload, **kwargs)
+            response.raise_for_status()
+            reply = response.json()
+        except Exception:
+            with self._lock:
+                endpoint.record_failure(time.time())
+            raise
+        with self._lock:
+            endpoint.record_success(time.perf_counter() - start)
+        return reply
+
+    def _send_with_failover(self, endpoints: List[RpcEndpoint], payload: Any) -> Tuple[RpcEndpoint, Any]:
+        last_error: Optional[Exception] = None
+        for endpoint in endpoints:
+            try:
+                return endpoint, self._send(endpoint, payload)
+            except Exception as e:
+                logger.warning(f"RPC {self._describe(payload)} failed on {endpoint.url}: {e}")
+                last_error = e
+        raise RpcPoolError(f"All RPC endpoints failed for {self._describe(payload)}: {last_error}")
+
+    def _hedged(self, ranked: List[RpcEndpoint], payload: Any) -> Any:
+        if self._hedge_executor is None:
+            with self._lock:
+                if self._hedge_executor is None:
+                    self._hedge_executor = ThreadPoolExecutor(max_workers=HEDGE_WORKERS, thread_name_prefix="rpc-hedge")
+        first = self._hedge_executor.submit(self._send_with_failover, ranked, payload)
+        done, _ = wait([first], timeout=self.hedge_after)
+        if done:
+            return first.result()[1]
+        second = self._hedge_executor.submit(self._send_with_failover, ranked[1:] + ranked[:1], payload)
+        pending = {first, second}
+        last_error: Optional[Exception] = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                try:
+                    endpoint, reply = future.result()
+                except Exception as e:
+                    last_error = e
+                    continue
+                if future is second:
+                    endpoint.hedge_wins += 1
+                return reply
+        raise last_error
+
+    def request(self, method: str, params: Any) -> Dict[str, Any]:
+        """Send one JSON-RPC call and return the reply ({"result": ...} or {"error": ...})"""
+        payload = {"jsonrpc": "2.0", "id": next(self._ids), "method": method, "params": params}
+        is_write = method in WRITE_METHODS or (
+            method == "eth_getTransactionCount" and len(params) > 1 and params[1] == "pending"
+        )
+        if is_write:
+            return self._request_write(payload)
+        return self.send(payload)
+
+    def send(self, payload: Union[Dict[str, Any], List[Dict[str, Any]]]) -> Any:
+        """Send a read-only JSON-RPC payload (one request or a batch) and return the decoded reply"""
+        ranked = self._ranked()
+        if self.hedge_after is not None and len(ranked) > 1:
+            return self._hedged(ranked, payload)
+        return self._send_with_failover(ranked, payload)[1]
+
+    def _request_write(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        endpoint = self._write_endpoint
+        if endpoint is None or not endpoint.healthy(time.time()):
+            endpoint = self._ranked()[0]
+            self._write_endpoint = endpoint
+        try:
+            return self._send(endpoint, payload)
+        except Exception as e:
+            # Move writes elsewhere; the nonce manager resyncs against the new node
+            self._write_endpoint = None
+            raise RpcPoolError(f"RPC {payload['method']} failed on {endpoint.url}: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        now = time.time()
+        return {
+            "write_endpoint": self._write_endpoint.url if self._write_endpoint else None,
+            "hedge_after": self.hedge_after,
+            "endpoints": [endpoint.stats(now) for endpoint in self.endpoints],
+        }
+
+
+class PooledHTTPProvider(JSONBaseProvider):
+    """web3 provider that sends every call through an RpcPool"""
+
+    def __init__(self, pool: RpcPool):
+        super().__init__()
+        self.pool = pool
+
+    def make_request(self, method, params) -> Dict[str, Any]:
+        return self.pool.request(method, params)
+
+    def __str__(self) -> str:
+        return f"PooledHTTPProvider({', '.join(endpoint.url for endpoint in self.pool.endpoints)})"
+
+
+_pools: Dict[Tuple[str, ...], RpcPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_rpc_pool(urls: Sequence[str], hedge_after: Optional[float] = None) -> RpcPool:
+    """
+    The process-wide pool of a list of RPC URLs, so every agent on the same
+    network shares one view of endpoint health
+    """
+    key = tuple(dict.fromkeys(urls))
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = RpcPool(key, hedge_after=hedge_after)
+            _pools[key] = pool
+        elif hedge_after is not None:
+            pool.hedge_after = hedge_after
+        return pool
+
+
+def rpc_pool_stats() -> Dict[str, Any]:
+    """Per-endpoint stats of every pool, keyed by primary URL"""
+    with _pools_lock:
+        return {pool.primary_url: pool.stats() for pool in _pools.values()}
@@ -9,7 +9,8 @@ from src.types import JupiterTokenData
 
 from solders.keypair import Keypair  # type: ignore
 from solders.pubkey import Pubkey  # type: ignore
-import requests
+from src.helpers.http_transport import http_transport
+from src.helpers.token_index import get_token_index, rank_by_fdv
 
 from spl.token.async_client import AsyncToken
 from spl.token.instructions import get_associated_token_address
@@ -58,7 +59,7 @@ class SolanaReadHelper:
         url = f"https://api.jup.ag/price/v2?ids={token_address}"
 
         try:
-            with requests.get(url) as response:
+            with http_transport.get(url) as response:
                 response.raise_for_status()
                 data = response.json()
                 price = data.get("data", {}).get(token_address, {}).get("price")
@@ -74,43 +75,14 @@ class SolanaReadHelper:
     def get_token_by_ticker(
         ticker: str,
     ) -> str:
-        try:
-            response = requests.get(
-                f"https://api.dexscreener.com/latest/dex/search?q={ticker}"
-            )
-            response.raise_for_status()
-
-            data = response.json()
-            if not data.get("pairs"):
-                return None
-
-            solana_pairs = [
-                pair for pair in data["pairs"] if pair.get("chainId") == "solana"
-            ]
-            solana_pairs.sort(key=lambda x: x.get("fdv", 0), reverse=True)
-
-            solana_pairs = [
-                pair
-                for pair in solana_pairs
-                if pair.get("baseToken", {}).get("symbol", "").lower() == ticker.lower()
-            ]
-
-            if solana_pairs:
-                return solana_pairs[0].get("baseToken", {}).get("address")
-            return None
-        except Exception as error:
-            logger.error(
-                f"Error fetching token address from DexScreener: {str(error)}",
-                exc_info=True,
-            )
-            return None
+        return get_token_index("solana", rank=rank_by_fdv).lookup(ticker)
 
     @staticmethod
     def get_token_by_address(
         address: str,
     ) -> str:
         try:
-            response = requests.get(
+            response = http_transport.get(
                 "https://tokens.jup.ag/tokens?tags=verified",
                 headers={"Content-Type": "application/json"},
             )
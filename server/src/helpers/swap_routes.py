@@ -0,0 +1,203 @@
+import json
+import logging
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from src.helpers.http_transport import http_transport
+
+logger = logging.getLogger("helpers.swap_routes")
+
+# How long a route (and the calldata built from it) is reused
+ROUTE_TTL = 20
+# Hot pairs are refreshed at this interval, so a swap always finds a live route
+PREFETCH_INTERVAL = ROUTE_TTL / 2
+# Deadline given to built swaps, in seconds
+SWAP_DEADLINE = 1200
+
+RouteKey = Tuple[str, str, int]
+BuildKey = Tuple[str, str, str, int]
+HotPairKey = Tuple[str, str, int, Optional[str], float]
+
+
+class SwapRouteError(Exception):
+    """Raised when the aggregator rejects a route or build request"""
+    pass
+
+
+class SwapRouter:
+    """
+    Kyberswap routes and built swap calldata for one aggregator endpoint (chain).
+
+    Routes are cached per (token_in, token_out, raw amount) for ROUTE_TTL
+    seconds; a route summary carries its exact amountIn, so it cannot serve a
+    different amount. Built calldata is cached per (route, sender, recipient,
+    slippage) for the same window. Hot pairs registered with add_hot_pair()
+    are re-routed and re-built in the background every PREFETCH_INTERVAL
+    seconds, so swapping them only costs signing and submission. A hot pair
+    registered by several connections is prefetched once, and it stays until
+    every one of them has removed it. All calls go through the pooled
+    http_transport session.
+    """
+
+    def __init__(self, aggregator_api: str, client_id: str = "zerepy", ttl: float = ROUTE_TTL):
+        self.aggregator_api = aggregator_api
+        self.client_id = client_id
+        self.ttl = ttl
+        self._routes: Dict[RouteKey, Tuple[Dict[str, Any], float]] = {}
+        self._builds: Dict[BuildKey, Tuple[Dict[str, Any], float]] = {}
+        # Hot pair -> number of connections that registered it
+        self._hot_pairs: Dict[HotPairKey, int] = {}
+        self._lock = threading.Lock()
+        self._prefetcher: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._counters = {"route_hits": 0, "route_fetches": 0, "build_hits": 0, "build_fetches": 0, "prefetches": 0}
+
+    @staticmethod
+    def _route_key(token_in: str, token_out: str, amount_raw: int) -> RouteKey:
+        return (token_in.lower(), token_out.lower(), int(amount_raw))
+
+    @staticmethod
+    def _summary_id(route_data: Dict[str, Any]) -> str:
+        summary = route_data["routeSummary"]
+        return summary.get("checksum") or json.dumps(summary, sort_keys=True)
+
+    def _check(self, response) -> Dict[str, Any]:
+        response.raise_for_status()
+        data = response.json()
+        if data.get("code") != 0:
+            raise SwapRouteError(f"API error: {data.get('message')}")
+        return data["data"]
+
+    def _fetch_route(self, token_in: str, token_out: str, amount_raw: int, sender: Optional[str]) -> Dict[str, Any]:
+        self._counters["route_fetches"] += 1
+        params = {
+            "tokenIn": token_in,
+            "tokenOut": token_out,
+            "amountIn": str(amount_raw),
+            "gasInclude": "true",
+        }
+        if sender:
+            params["to"] = sender
+        response = http_transport.get(
+            f"{self.aggregator_api}/routes", headers={"x-client-id": self.client_id}, params=params
+        )
+        return self._check(response)
+
+    def route(self, token_in: str, token_out: str, amount_raw: int, sender: Optional[str] = None) -> Dict[str, Any]:
+        """Route data ({"routeSummary", "routerAddress", ...}) for swapping amount_raw of token_in"""
+        key = self._route_key(token_in, token_out, amount_raw)
+        cached = self._routes.get(key)
+        if cached and cached[1] > time.time():
+            self._counters["route_hits"] += 1
+            return cached[0]
+        route_data = self._fetch_route(token_in, token_out, amount_raw, sender)
+        now = time.time()
+        with self._lock:
+            self._routes[key] = (route_data, now + self.ttl)
+            self._evict(now)
+        return route_data
+
+    def build(self, route_data: Dict[str, Any], sender: str, recipient: str, slippage: float) -> Dict[str, Any]:
+        """Built swap ({"data", "routerAddress", ...}) for a route returned by route()"""
+        slippage_bps = int(slippage * 100)
+        key = (self._summary_id(route_data), sender.lower(), recipient.lower(), slippage_bps)
+        cached = self._builds.get(key)
+        if cached and cached[1] > time.time():
+            self._counters["build_hits"] += 1
+            return cached[0]
+        self._counters["build_fetches"] += 1
+        payload = {
+            "routeSummary": route_data["routeSummary"],
+            "sender": sender,
+            "recipient": recipient,
+            "slippageTolerance": slippage_bps,
+            "deadline": int(time.time() + SWAP_DEADLINE),
+            "source": self.client_id,
+        }
+        response = http_transport.post(
+            f"{self.aggregator_api}/route/build", headers={"x-client-id": self.client_id}, json=payload
+        )
+        build_data = self._check(response)
+        now = time.time()
+        with self._lock:
+            self._builds[key] = (build_data, now + self.ttl)
+            self._evict(now)
+        return build_data
+
+    def _evict(self, now: float) -> None:
+        for cache in (self._routes, self._builds):
+            for key in [key for key, (_, expires_at) in cache.items() if expires_at <= now]:
+                del cache[key]
+
+    def add_hot_pair(
+        self, token_in: str, token_out: str, amount_raw: int, sender: Optional[str] = None, slippage: float = 0.5
+    ) -> HotPairKey:
+        """
+        Keep a route (and, given a sender, its calldata) for this swap ready
+        until remove_hot_pair() is called with the returned key
+        """
+        key = (token_in.lower(), token_out.lower(), int(amount_raw), sender.lower() if sender else None, float(slippage))
+        with self._lock:
+            self._hot_pairs[key] = self._hot_pairs.get(key, 0) + 1
+            if self._prefetcher is None:
+                self._prefetcher = threading.Thread(
+                    target=self._prefetch_loop, name=f"swap-routes-{self.aggregator_api}", daemon=True
+                )
+                self._prefetcher.start()
+        return key
+
+    def remove_hot_pair(self, key: HotPairKey) -> None:
+        with self._lock:
+            count = self._hot_pairs.get(key, 0)
+            if count > 1:
+                self._hot_pairs[key] = count - 1
+            else:
+                self._hot_pairs.pop(key, None)
+
+    def prefetch(self) -> None:
+        """Refresh the routes and builds of every hot pair once"""
+        with self._lock:
+            hot_pairs = list(self._hot_pairs)
+        for token_in, token_out, amount_raw, sender, slippage in hot_pairs:
+            try:
+                route_data = self._fetch_route(token_in, token_out, amount_raw, sender)
+                with self._lock:
+                    self._routes[self._route_key(token_in, token_out, amount_raw)] = (route_data, time.time() + self.ttl)
+                if sender:
+                    self.build(route_data, sender, sender, slippage)
+                self._counters["prefetches"] += 1
+            except Exception as e:
+                logger.warning(f"Route prefetch for {token_in} -> {token_out} failed: {e}")
+
+    def _prefetch_loop(self) -> None:
+        while True:
+            self.prefetch()
+            if self._stop.wait(min(PREFETCH_INTERVAL, self.ttl / 2)):
+                return
+
+    def close(self) -> None:
+        self._stop.set()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "aggregator_api": self.aggregator_api,
+            "cached_routes": len(self._routes),
+            "cached_builds": len(self._builds),
+            "hot_pairs": len(self._hot_pairs),
+            **self._counters,
+        }
+
+
+_routers: Dict[str, SwapRouter] = {}
+_routers_lock = threading.Lock()
+
+
+def get_swap_router(aggregator_api: str, client_id: str = "zerepy") -> SwapRouter:
+    """The process-wide route cache of an aggregator endpoint, shared by every connection"""
+    with _routers_lock:
+        router = _routers.get(aggregator_api)
+        if router is None:
+            router = SwapRouter(aggregator_api, client_id=client_id)
+            _routers[aggregator_api] = router
+        return router
@@ -0,0 +1,182 @@
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+from src.helpers.http_transport import http_transport
+
+logger = logging.getLogger("helpers.token_index")
+
+DEXSCREENER_SEARCH_URL = "https://api.dexscreener.com/latest/dex/search"
+# How long a resolved ticker is trusted
+DEFAULT_TTL = 3600
+# How long "no such ticker on this chain" is remembered
+DEFAULT_NEGATIVE_TTL = 300
+# Seconds between background refreshes of recently used tickers
+DEFAULT_REFRESH_INTERVAL = 900
+# How long a lookup waits for a fetch already running for the same ticker
+COALESCE_TIMEOUT = 30
+
+
+def rank_by_fdv(pair: Dict[str, Any]) -> float:
+    return float(pair.get("fdv") or 0)
+
+
+def rank_by_liquidity_volume(pair: Dict[str, Any]) -> float:
+    return float((pair.get("liquidity") or {}).get("usd") or 0) * float((pair.get("volume") or {}).get("h24") or 0)
+
+
+class TokenIndex:
+    """
+    In-process ticker -> token address index for one DexScreener chain.
+
+    Lookups are answered from memory. A miss (or an expired entry) is resolved
+    with one DexScreener search, and concurrent lookups of the same ticker wait
+    for that single request instead of sending their own. Only the searched
+    ticker is indexed: other symbols in the results were matched on unrelated
+    text and may be impostors, so they get their own search when looked up.
+    Tickers that do not exist on the chain are cached for negative_ttl.
+    Recently used tickers are refreshed in a background thread before they
+    expire, so hot lookups never wait on the network.
+    """
+
+    def __init__(
+        self,
+        chain: str,
+        rank: Callable[[Dict[str, Any]], float] = rank_by_liquidity_volume,
+        ttl: float = DEFAULT_TTL,
+        negative_ttl: float = DEFAULT_NEGATIVE_TTL,
+        refresh_interval: Optional[float] = DEFAULT_REFRESH_INTERVAL,
+    ):
+        self.chain = chain.lower()
+        self.rank = rank
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.refresh_interval = refresh_interval
+        # ticker -> (address or None, rank, expires_at)
+        self._entries: Dict[str, Tuple[Optional[str], float, float]] = {}
+        self._inflight: Dict[str, threading.Event] = {}
+        self._used: set = set()
+        self._lock = threading.Lock()
+        self._counters = {"hits": 0, "negative_hits": 0, "misses": 0, "fetches": 0, "coalesced": 0, "errors": 0}
+        self._refresh_stop = threading.Event()
+        self._refresh_thread: Optional[threading.Thread] = None
+
+    def _fresh(self, key: str, now: float) -> Optional[Tuple[Optional[str], float, float]]:
+        entry = self._entries.get(key)
+        return entry if entry is not None and entry[2] > now else None
+
+    def lookup(self, ticker: str) -> Optional[str]:
+        """Address of the best-ranked token with this ticker on the chain, or None"""
+        key = ticker.strip().lstrip("$").lower()
+        now = time.time()
+        with self._lock:
+            self._used.add(key)
+            entry = self._fresh(key, now)
+            if entry is not None:
+                self._counters["hits" if entry[0] else "negative_hits"] += 1
+                return entry[0]
+            self._counters["misses"] += 1
+            pending = self._inflight.get(key)
+            owner = pending is None
+            if owner:
+                pending = threading.Event()
+                self._inflight[key] = pending
+            else:
+                self._counters["coalesced"] += 1
+
+        if owner:
+            try:
+                self._fetch(key)
+            finally:
+                with self._lock:
+                    del self._inflight[key]
+                pending.set()
+            self._start_refresh()
+        else:
+            pending.wait(COALESCE_TIMEOUT)
+
+        # After a failed fetch a stale entry is still better than nothing
+        entry = self._entries.get(key)
+        return entry[0] if entry else None
+
+    def prewarm(self, tickers: Iterable[str]) -> None:
+        """Resolve tickers ahead of the first lookup"""
+        for ticker in tickers:
+            self.lookup(ticker)
+
+    def _fetch(self, key: str) -> None:
+        self._counters["fetches"] += 1
+        try:
+            response = http_transport.get(DEXSCREENER_SEARCH_URL, params={"q": key})
+            response.raise_for_status()
+            pairs = response.json().get("pairs") or []
+        except Exception as e:
+            self._counters["errors"] += 1
+            logger.error(f"Error fetching token address from DexScreener: {e}")
+            return
+
+        # Best-ranked pair of this chain whose base token is the searched ticker
+        best: Optional[Tuple[str, float]] = None
+        for pair in pairs:
+            if (pair.get("chainId") or "").lower() != self.chain:
+                continue
+            base_token = pair.get("baseToken") or {}
+            symbol, address = (base_token.get("symbol") or "").lower(), base_token.get("address")
+            if symbol != key or not address:
+                continue
+            score = self.rank(pair)
+            if best is None or score > best[1]:
+                best = (address, score)
+
+        now = time.time()
+        with self._lock:
+            if best is None:
+                self._entries[key] = (None, 0.0, now + self.negative_ttl)
+            else:
+                self._entries[key] = (best[0], best[1], now + self.ttl)
+
+    def _start_refresh(self) -> None:
+        if not self.refresh_interval or self._refresh_thread is not None:
+            return
+        with self._lock:
+            if self._refresh_thread is not None:
+                return
+            self._refresh_thread = threading.Thread(
+                target=self._refresh_loop, name=f"token-index-{self.chain}", daemon=True
+            )
+            self._refresh_thread.start()
+
+    def _refresh_loop(self) -> None:
+        while not self._refresh_stop.wait(self.refresh_interval):
+            with self._lock:
+                used, self._used = self._used, set()
+                # Re-resolve tickers used since the last pass that expire before the next one
+                horizon = time.time() + self.refresh_interval
+                due = [key for key in used if key in self._entries and self._entries[key][2] <= horizon]
+            for key in due:
+                if self._refresh_stop.is_set():
+                    return
+                self._fetch(key)
+
+    def close(self) -> None:
+        """Stop the background refresh"""
+        self._refresh_stop.set()
+
+    def stats(self) -> Dict[str, Any]:
+        return {"chain": self.chain, "entries": len(self._entries), **self._counters}
+
+
+_indexes: Dict[str, TokenIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_token_index(chain: str, rank: Callable[[Dict[str, Any]], float] = rank_by_liquidity_volume) -> TokenIndex:
+    """The process-wide token index of a DexScreener chain id (e.g. "sonic", "ethereum", "solana")"""
+    key = chain.lower()
+    with _indexes_lock:
+        index = _indexes.get(key)
+        if index is None:
+            index = TokenIndex(key, rank=rank)
+            _indexes[key] = index
+        return index
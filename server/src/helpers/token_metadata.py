@@ -0,0 +1,176 @@
+import json
+import logging
+import os
+import threading
+import weakref
+from typing import Any, Dict, Iterable, Optional, Tuple, Union
+
+from eth_utils import to_checksum_address
+
+from src.constants.abi import ERC20_ABI
+from src.helpers.evm_batch import DECIMALS, SYMBOL, Call, RpcTarget, decode_symbol, decode_uint, execute_calls
+
+logger = logging.getLogger("helpers.token_metadata")
+
+TOKEN_METADATA_CACHE_DIR = os.path.join(".cache", "token_metadata")
+
+TokenInfo = Tuple[Optional[str], int]
+
+
+class TokenMetadataError(Exception):
+    """Raised when a token's metadata cannot be read from the chain"""
+    pass
+
+
+class TokenMetadataStore:
+    """
+    symbol() and decimals() of the ERC-20 tokens of one chain.
+
+    Both values are immutable, so once read (or prewarmed from a token list)
+    an entry is kept forever: in memory, and in a JSON file under
+    .cache/token_metadata/ so restarts do not read them again. Entries are
+    keyed by checksummed address. The store also hands out cached web3
+    contract objects, one per (web3 instance, token).
+    """
+
+    def __init__(self, chain_id: Union[int, str], cache_dir: Optional[str] = TOKEN_METADATA_CACHE_DIR):
+        self.chain_id = chain_id
+        self.path = os.path.join(cache_dir, f"{chain_id}.json") if cache_dir else None
+        self._tokens: Dict[str, TokenInfo] = {}
+        self._contracts: "weakref.WeakKeyDictionary[Any, Dict[str, Any]]" = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self) -> None:
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r") as f:
+                data = json.load(f)
+            self._tokens = {address: (symbol, decimals) for address, (symbol, decimals) in data.items()}
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable token metadata cache {self.path}: {e}")
+
+    def _save(self) -> None:
+        if not self.path:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(self._tokens, f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.warning(f"Could not persist token metadata to {self.path}: {e}")
+
+    def get(self, address: str) -> Optional[TokenInfo]:
+        """Cached (symbol, decimals), or None if the token was never seen"""
+        return self._tokens.get(to_checksum_address(address))
+
+    def set_many(self, tokens: Dict[str, TokenInfo]) -> None:
+        with self._lock:
+            self._tokens.update({to_checksum_address(address): info for address, info in tokens.items()})
+            self._save()
+
+    def set(self, address: str, symbol: Optional[str], decimals: int) -> None:
+        self.set_many({address: (symbol, decimals)})
+
+    def remember(self, snapshot: Dict[str, Any]) -> None:
+        """Store the token metadata read as part of an evm_batch.get_portfolio snapshot"""
+        found = {
+            entry["token"]: (entry["symbol"], entry["decimals"])
+            for entry in snapshot.get("balances", [])
+            if entry["decimals"] is not None and entry["token"] not in self._tokens
+        }
+        if found:
+            self.set_many(found)
+
+    def as_dict(self) -> Dict[str, TokenInfo]:
+        return dict(self._tokens)
+
+    def __contains__(self, address: str) -> bool:
+        return address in self._tokens
+
+    def __getitem__(self, address: str) -> TokenInfo:
+        return self._tokens[address]
+
+    def __len__(self) -> int:
+        return len(self._tokens)
+
+    def prewarm_from_token_list(self, token_list: Union[str, Dict[str, Any]]) -> int:
+        """
+        Load entries for this chain from a token list (the Uniswap format:
+        {"tokens": [{"chainId", "address", "symbol", "decimals"}, ...]}), given
+        as a parsed dict or a file path. Returns the number of tokens added.
+        """
+        if isinstance(token_list, str):
+            with open(token_list, "r") as f:
+                token_list = json.load(f)
+        tokens = {
+            token["address"]: (token.get("symbol"), int(token["decimals"]))
+            for token in token_list.get("tokens", [])
+            if str(token.get("chainId")) == str(self.chain_id) and "decimals" in token
+        }
+        self.set_many(tokens)
+        return len(tokens)
+
+    def prewarm(self, rpc: RpcTarget, addresses: Iterable[str]) -> int:
+        """Read the metadata of every uncached token in one batched request"""
+        return len(self.fetch(rpc, addresses))
+
+    def fetch(self, rpc: RpcTarget, addresses: Iterable[str]) -> Dict[str, TokenInfo]:
+        """Metadata of the given tokens, reading only the uncached ones (in one round-trip)"""
+        addresses = [to_checksum_address(address) for address in addresses]
+        missing = [address for address in dict.fromkeys(addresses) if address not in self._tokens]
+        if missing:
+            calls = []
+            for address in missing:
+                calls.append(Call(address, SYMBOL, decode_symbol))
+                calls.append(Call(address, DECIMALS, decode_uint))
+            results = execute_calls(rpc, calls)
+            found = {}
+            for i, address in enumerate(missing):
+                (symbol_ok, symbol), (decimals_ok, decimals) = results[2 * i], results[2 * i + 1]
+                # Without decimals nothing can be converted; don't cache the failure
+                if decimals_ok:
+                    found[address] = (symbol if symbol_ok else None, decimals)
+            if found:
+                self.set_many(found)
+        return {address: self._tokens[address] for address in addresses if address in self._tokens}
+
+    def decimals(self, rpc: RpcTarget, address: str) -> int:
+        """decimals() of a token, from the cache when possible"""
+        info = self.fetch(rpc, [address]).get(to_checksum_address(address))
+        if info is None:
+            raise TokenMetadataError(f"Could not read decimals of {address} on chain {self.chain_id}")
+        return info[1]
+
+    def symbol(self, rpc: RpcTarget, address: str) -> Optional[str]:
+        info = self.fetch(rpc, [address]).get(to_checksum_address(address))
+        return info[0] if info else None
+
+    def contract(self, web3, address: str):
+        """A cached ERC-20 web3 contract object for the token"""
+        address = to_checksum_address(address)
+        with self._lock:
+            contracts = self._contracts.setdefault(web3, {})
+            contract = contracts.get(address)
+            if contract is None:
+                contract = web3.eth.contract(address=address, abi=ERC20_ABI)
+                contracts[address] = contract
+            return contract
+
+
+_stores: Dict[str, TokenMetadataStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_token_metadata_store(chain_id: Union[int, str]) -> TokenMetadataStore:
+    """The process-wide metadata store of a chain, shared by every connection"""
+    key = str(chain_id)
+    with _stores_lock:
+        store = _stores.get(key)
+        if store is None:
+            store = TokenMetadataStore(chain_id)
+            _stores[key] = store
+        return store
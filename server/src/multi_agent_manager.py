@@ -1,18 +1,18 @@
 import json
 import logging
-import threading
-import time
 from pathlib import Path
 from typing import Dict, List
 from src.agent import ZerePyAgent
+from src.agent_runtime import get_runtime
+from src.helpers.async_executor import get_blocking_executor
 
 logger = logging.getLogger("multi_agent_manager")
 
 class MultiAgentManager:
     def __init__(self):
         self.agents: Dict[str, ZerePyAgent] = {}
-        self.agent_threads: Dict[str, threading.Thread] = {}
-        self.stop_events: Dict[str, threading.Event] = {}
+        # Every agent runs as a task on one event loop instead of its own thread
+        self.runtime = get_runtime()
         
     def load_agents_from_file(self, file_path: str) -> List[str]:
         """Load multiple agents from a JSON file containing agent definitions"""
@@ -24,75 +24,81 @@ class MultiAgentManager:
             if "agents" not in data:
                 raise KeyError("File does not contain an 'agents' array")
                 
-            loaded_agents = []
-            for agent_data in data["agents"]:
-                # Create a temporary file for each agent
-                temp_agent_path = Path("agents") / f"temp_{agent_data['name'].lower()}.json"
-                try:
-                    # Write agent data to temporary file
-                    with open(temp_agent_path, "w") as f:
-                        json.dump(agent_data, f, indent=2)
-                    
-                    # Load agent from temporary file
-                    agent = ZerePyAgent(f"temp_{agent_data['name'].lower()}")
-                    self.agents[agent.name] = agent
-                    loaded_agents.append(agent.name)
-                    
-                finally:
-                    # Clean up temporary file
-                    if temp_agent_path.exists():
-                        temp_agent_path.unlink()
-                        
+            loaded_agents = self.load_agents(data["agents"])
             return loaded_agents
             
         except Exception as e:
             logger.error(f"Error loading agents from file: {e}")
             raise e
             
+    def load_agent_data(self, agent_data: dict) -> ZerePyAgent:
+        """Load a single agent from its definition"""
+        agent = ZerePyAgent.from_dict(agent_data)
+        self.agents[agent.name] = agent
+        return agent
+
+    def load_agents(self, agents: List[dict]) -> List[str]:
+        """Construct agents (and their connections) in parallel, keeping the input order"""
+        constructed = list(get_blocking_executor().map(ZerePyAgent.from_dict, agents))
+        for agent in constructed:
+            self.agents[agent.name] = agent
+        return [agent.name for agent in constructed]
+
+    def add_agent(self, agent_data: dict) -> ZerePyAgent:
+        """Build and register one new agent without touching the others"""
+        if agent_data.get("name") in self.agents:
+            raise ValueError(f"Agent {agent_data['name']} already exists")
+        return self.load_agent_data(agent_data)
+
+    def update_agent(self, agent_data: dict) -> ZerePyAgent:
+        """
+        Replace one agent with a new definition.
+
+        The new agent is built before the old one is torn down, so a bad
+        definition leaves the running agent untouched. An agent that was running
+        is restarted with the new definition.
+        """
+        agent_name = agent_data.get("name")
+        if agent_name not in self.agents:
+            raise ValueError(f"Agent {agent_name} not found")
+
+        agent = ZerePyAgent.from_dict(agent_data)
+        was_running = agent_name in self.runtime.running_agents()
+        self._release_agent(agent_name)
+        self.agents[agent_name] = agent
+        if was_running:
+            self.start_agent(agent_name)
+        return agent
+
+    def remove_agent(self, agent_name: str) -> None:
+        """Stop an agent (if running) and release its connections"""
+        if agent_name not in self.agents:
+            raise ValueError(f"Agent {agent_name} not found")
+        self._release_agent(agent_name)
+
+    def _release_agent(self, agent_name: str) -> None:
+        agent = self.agents.pop(agent_name)
+        self.stop_agent(agent_name)
+        agent.stop_system_prompt_refresh()
+        agent.connection_manager.close()
+
     def start_agent(self, agent_name: str) -> None:
-        """Start a single agent's loop in a separate thread"""
+        """Start a single agent's loop as a task on the shared agent runtime"""
         if agent_name not in self.agents:
             raise ValueError(f"Agent {agent_name} not found")
             
-        if agent_name in self.agent_threads and self.agent_threads[agent_name].is_alive():
-            raise ValueError(f"Agent {agent_name} is already running")
-            
-        stop_event = threading.Event()
-        self.stop_events[agent_name] = stop_event
-        
-        def agent_loop():
-            agent = self.agents[agent_name]
-            logger.info(f"\n🚀 Starting agent: {agent_name}")
-            
-            try:
-                while not stop_event.is_set():
-                    try:
-                        agent.loop()
-                    except Exception as e:
-                        logger.error(f"Error in agent {agent_name} loop: {e}")
-                        if stop_event.wait(timeout=60):  # Wait 1 minute before retrying
-                            break
-            except Exception as e:
-                logger.error(f"Fatal error in agent {agent_name}: {e}")
-            finally:
-                logger.info(f"\n🛑 Agent {agent_name} stopped")
-                
-        thread = threading.Thread(target=agent_loop, name=f"agent_{agent_name}")
-        self.agent_threads[agent_name] = thread
-        thread.start()
+        self.runtime.start_agent(self.agents[agent_name])
         
     def start_all_agents(self) -> None:
         """Start all loaded agents in parallel"""
+        running = set(self.runtime.running_agents())
         for agent_name in self.agents.keys():
-            if agent_name not in self.agent_threads or not self.agent_threads[agent_name].is_alive():
+            if agent_name not in running:
                 self.start_agent(agent_name)
                 
     def stop_agent(self, agent_name: str) -> None:
         """Stop a single agent"""
-        if agent_name in self.stop_events:
-            self.stop_events[agent_name].set()
-            if agent_name in self.agent_threads:
-                self.agent_threads[agent_name].join(timeout=5)
+        self.runtime.stop_agent(agent_name)
                 
     def stop_all_agents(self) -> None:
         """Stop all running agents"""
@@ -101,7 +107,7 @@ class MultiAgentManager:
             
     def get_running_agents(self) -> List[str]:
         """Get list of currently running agents"""
-        return [name for name, thread in self.agent_threads.items() if thread.is_alive()]
+        return [name for name in self.runtime.running_agents() if name in self.agents]
         
     def get_loaded_agents(self) -> List[str]:
         """Get list of all loaded agents"""
@@ -124,14 +124,24 @@ class ZerePyServer:
             try:
                 connections = {}
                 for name, conn in self.state.cli.agent.connection_manager.connections.items():
+                    readiness = conn.readiness_state()
                     connections[name] = {
-                        "configured": conn.is_configured(),
+                        "configured": readiness["ready"],
+                        "readiness": readiness,
                         "is_llm_provider": conn.is_llm_provider
                     }
                 return {"connections": connections}
             except Exception as e:
                 raise HTTPException(status_code=500, detail=str(e))
 
+        @self.app.get("/agent/llm-cache")
+        async def llm_cache_stats():
+            """Hit/miss counters of the agent's generate-text cache"""
+            if not self.state.cli.agent:
+                raise HTTPException(status_code=400, detail="No agent loaded")
+            stats = self.state.cli.agent.connection_manager.get_response_cache_stats()
+            return {"enabled": stats is not None, "stats": stats}
+
         @self.app.post("/agent/action")
         async def agent_action(action_request: ActionRequest):
             """Execute a single agent action"""
@@ -182,6 +192,7 @@ class ZerePyServer:
                     raise HTTPException(status_code=404, detail=f"Connection {name} not found")
                 
                 success = connection.configure(**config.params)
+                connection.invalidate_readiness()
                 if success:
                     return {"status": "success", "message": f"Connection {name} configured successfully"}
                 else:
@@ -201,9 +212,12 @@ class ZerePyServer:
                 if not connection:
                     raise HTTPException(status_code=404, detail=f"Connection {name} not found")
                     
+                # Explicit status requests always run a live probe and refresh the cache
+                configured = connection.is_ready(verbose=True, force=True)
                 return {
                     "name": name,
-                    "configured": connection.is_configured(verbose=True),
+                    "configured": configured,
+                    "readiness": connection.readiness_state(),
                     "is_llm_provider": connection.is_llm_provider
                 }
                 
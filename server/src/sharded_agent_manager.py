@@ -0,0 +1,379 @@
+import heapq
+import itertools
+import json
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger("sharded_agent_manager")
+
+# Number of worker processes used when none is given
+DEFAULT_SHARDS = int(os.getenv("AGENT_SHARDS", "0")) or os.cpu_count() or 1
+# Seconds between supervisor health checks of the workers
+DEFAULT_MONITOR_INTERVAL = 2.0
+# Seconds to wait for a worker to answer a command
+DEFAULT_COMMAND_TIMEOUT = 60.0
+# A worker that keeps crashing is restarted at most this often (seconds)
+MAX_RESTART_BACKOFF = 60.0
+
+# Interval-gated tasks -> (connection config name, interval key, default seconds),
+# mirroring how ZerePyAgent reads these intervals from its config
+TASK_INTERVAL_CONFIG = {
+    "post-cast": ("farcaster", "cast_interval", 900),
+    "post-tweet": ("twitter", "tweet_interval", 900),
+    "post-echochambers": ("echochambers", "message_interval", 60),
+}
+
+
+def estimate_agent_load(agent_data: dict) -> float:
+    """
+    Expected task runs per hour for an agent definition, used to balance shards.
+
+    Interval-gated tasks run at most once per interval, other tasks once per
+    loop_delay. An explicit "shard_weight" in the agent JSON overrides the
+    estimate.
+    """
+    if "shard_weight" in agent_data:
+        return float(agent_data["shard_weight"])
+
+    config_by_name = {config.get("name"): config for config in agent_data.get("config", [])}
+
+    loop_delay = max(float(agent_data.get("loop_delay", 60)), 1.0)
+    load = 0.0
+    for task in agent_data.get("tasks", []):
+        if task.get("weight", 0) <= 0:
+            continue
+        name = task["name"]
+        if name in TASK_INTERVAL_CONFIG:
+            connection, key, default = TASK_INTERVAL_CONFIG[name]
+            interval = max(float(config_by_name.get(connection, {}).get(key, default)), 1.0)
+            load += 3600 / interval
+        else:
+            load += 3600 / loop_delay
+    return max(load, 1.0)
+
+
+def balance_shards(agents: List[dict], shard_loads: List[float]) -> List[int]:
+    """
+    Assign agents to shards, heaviest first, each onto the least loaded shard.
+
+    shard_loads holds the current load of every shard and is updated in place.
+    Returns the shard index chosen for each agent, in input order.
+    """
+    heap = [(load, index) for index, load in enumerate(shard_loads)]
+    heapq.heapify(heap)
+    assignment = [0] * len(agents)
+    order = sorted(range(len(agents)), key=lambda i: -estimate_agent_load(agents[i]))
+    for i in order:
+        load, index = heapq.heappop(heap)
+        load += estimate_agent_load(agents[i])
+        shard_loads[index] = load
+        assignment[i] = index
+        heapq.heappush(heap, (load, index))
+    return assignment
+
+
+def _worker_main(shard_id: int, conn) -> None:
+    """Entry point of a shard process: hosts a MultiAgentManager and serves commands"""
+    logging.basicConfig(level=logging.INFO, format=f"[shard {shard_id}] %(message)s")
+    # Imported in the child so the supervisor process never loads the agent stack
+    from src.multi_agent_manager import MultiAgentManager
+
+    manager = MultiAgentManager()
+    handlers = {
+        "load": lambda agent_data: manager.load_agent_data(agent_data).name,
+        "update": lambda agent_data: manager.update_agent(agent_data).name,
+        "remove": manager.remove_agent,
+        "start": manager.start_agent,
+        "stop": manager.stop_agent,
+        "running": manager.get_running_agents,
+        "loaded": manager.get_loaded_agents,
+    }
+
+    while True:
+        try:
+            request_id, command, args = conn.recv()
+        except (EOFError, KeyboardInterrupt):
+            break
+        if command == "shutdown":
+            manager.stop_all_agents()
+            conn.send((request_id, "ok", None))
+            break
+        try:
+            conn.send((request_id, "ok", handlers[command](*args)))
+        except Exception as e:
+            conn.send((request_id, "error", f"{type(e).__name__}: {e}"))
+
+
+class ShardWorker:
+    """Supervisor-side handle of one shard process"""
+
+    def __init__(self, shard_id: int, context):
+        self.shard_id = shard_id
+        self._context = context
+        self.process = None
+        self.conn = None
+        self.agents: Dict[str, dict] = {}
+        self.running: set = set()
+        self.load = 0.0
+        self.restarts = 0
+        self.last_start = 0.0
+        # Held by every command and by a restart, so a command never reaches a
+        # half-restarted shard; reentrant because a restart reloads agents with call()
+        self.lock = threading.RLock()
+        self._request_ids = itertools.count(1)
+
+    def spawn(self) -> None:
+        parent_conn, child_conn = self._context.Pipe()
+        process = self._context.Process(
+            target=_worker_main,
+            args=(self.shard_id, child_conn),
+            name=f"agent-shard-{self.shard_id}",
+            daemon=True,
+        )
+        process.start()
+        child_conn.close()
+        self.process, self.conn = process, parent_conn
+        self.last_start = time.monotonic()
+
+    def is_alive(self) -> bool:
+        return self.process is not None and self.process.is_alive()
+
+    def call(self, command: str, *args, timeout: float = DEFAULT_COMMAND_TIMEOUT) -> Any:
+        with self.lock:
+            request_id = next(self._request_ids)
+            self.conn.send((request_id, command, args))
+            deadline = time.monotonic() + timeout
+            while True:
+                if not self.conn.poll(max(deadline - time.monotonic(), 0)):
+                    raise TimeoutError(f"Shard {self.shard_id} did not answer '{command}' within {timeout}s")
+                reply_id, status, result = self.conn.recv()
+                # Late answer to a call that already timed out
+                if reply_id == request_id:
+                    break
+                logger.debug(f"Shard {self.shard_id}: dropping stale reply to request {reply_id}")
+        if status == "error":
+            raise RuntimeError(f"Shard {self.shard_id}: {result}")
+        return result
+
+    def terminate(self) -> None:
+        if self.process is not None and self.process.is_alive():
+            self.process.terminate()
+            self.process.join(timeout=5)
+        if self.conn is not None:
+            self.conn.close()
+
+
+class ShardedAgentManager:
+    """
+    Runs agents across a pool of worker processes to use every core.
+
+    Each shard process hosts an ordinary MultiAgentManager (and thus its own
+    agent runtime). The supervisor in this process assigns agents to the least
+    loaded shard, routes start/stop commands to the owning shard, aggregates
+    get_running_agents across shards, and restarts crashed workers with the
+    agents (and running state) they owned.
+    """
+
+    def __init__(
+        self,
+        shards: Optional[int] = None,
+        monitor_interval: float = DEFAULT_MONITOR_INTERVAL,
+        start_method: str = "spawn",
+    ):
+        context = multiprocessing.get_context(start_method)
+        self.workers = [ShardWorker(i, context) for i in range(shards or DEFAULT_SHARDS)]
+        self.agent_shards: Dict[str, int] = {}
+        self.monitor_interval = monitor_interval
+        self._lock = threading.Lock()
+        self._stopping = threading.Event()
+        for worker in self.workers:
+            worker.spawn()
+        self._monitor = threading.Thread(target=self._monitor_loop, name="shard-supervisor", daemon=True)
+        self._monitor.start()
+
+    def load_agents_from_file(self, file_path: str) -> List[str]:
+        """Load the agents of a multi-agent file, spread across shards by estimated load"""
+        agent_path = Path("agents") / f"{file_path}.json"
+        with open(agent_path, "r") as f:
+            data = json.load(f)
+        if "agents" not in data:
+            raise KeyError("File does not contain an 'agents' array")
+        return self.load_agents(data["agents"])
+
+    def load_agents(self, agents: List[dict]) -> List[str]:
+        """Load agent definitions onto the least loaded shards"""
+        with self._lock:
+            shard_loads = [worker.load for worker in self.workers]
+            assignment = balance_shards(agents, shard_loads)
+
+        by_shard: Dict[int, List[dict]] = {}
+        for agent_data, shard_id in zip(agents, assignment):
+            by_shard.setdefault(shard_id, []).append(agent_data)
+
+        loaded = []
+        errors = []
+
+        def load_on(shard_id: int, shard_agents: List[dict]) -> None:
+            worker = self.workers[shard_id]
+            for agent_data in shard_agents:
+                with worker.lock:
+                    try:
+                        name = worker.call("load", agent_data)
+                    except Exception as e:
+                        errors.append(e)
+                        logger.error(f"Failed to load agent {agent_data.get('name')} on shard {shard_id}: {e}")
+                        continue
+                    with self._lock:
+                        worker.agents[name] = agent_data
+                        worker.load += estimate_agent_load(agent_data)
+                        self.agent_shards[name] = shard_id
+                loaded.append(name)
+
+        # Shards construct their agents in parallel
+        threads = [
+            threading.Thread(target=load_on, args=(shard_id, shard_agents))
+            for shard_id, shard_agents in by_shard.items()
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        if errors and not loaded:
+            raise errors[0]
+        return loaded
+
+    def add_agent(self, agent_data: dict) -> str:
+        """Load one new agent onto the least loaded shard"""
+        if agent_data.get("name") in self.agent_shards:
+            raise ValueError(f"Agent {agent_data['name']} already exists")
+        return self.load_agents([agent_data])[0]
+
+    def update_agent(self, agent_data: dict) -> str:
+        """Replace an agent's definition on the shard that owns it"""
+        worker = self._worker_for(agent_data.get("name"))
+        with worker.lock:
+            name = worker.call("update", agent_data)
+            with self._lock:
+                worker.load += estimate_agent_load(agent_data) - estimate_agent_load(worker.agents[name])
+                worker.agents[name] = agent_data
+        return name
+
+    def remove_agent(self, agent_name: str) -> None:
+        """Stop and unload an agent from its shard"""
+        worker = self._worker_for(agent_name)
+        with worker.lock:
+            if worker.is_alive():
+                worker.call("remove", agent_name)
+            with self._lock:
+                agent_data = worker.agents.pop(agent_name)
+                worker.load -= estimate_agent_load(agent_data)
+                worker.running.discard(agent_name)
+                del self.agent_shards[agent_name]
+
+    def _worker_for(self, agent_name: str) -> ShardWorker:
+        shard_id = self.agent_shards.get(agent_name)
+        if shard_id is None:
+            raise ValueError(f"Agent {agent_name} not found")
+        return self.workers[shard_id]
+
+    def start_agent(self, agent_name: str) -> None:
+        worker = self._worker_for(agent_name)
+        with worker.lock:
+            worker.call("start", agent_name)
+            worker.running.add(agent_name)
+
+    def start_all_agents(self) -> None:
+        for agent_name in list(self.agent_shards):
+            if agent_name not in self.workers[self.agent_shards[agent_name]].running:
+                self.start_agent(agent_name)
+
+    def stop_agent(self, agent_name: str) -> None:
+        worker = self._worker_for(agent_name)
+        with worker.lock:
+            worker.running.discard(agent_name)
+            if worker.is_alive():
+                worker.call("stop", agent_name)
+
+    def stop_all_agents(self) -> None:
+        for agent_name in list(self.agent_shards):
+            self.stop_agent(agent_name)
+
+    def get_running_agents(self) -> List[str]:
+        """Running agents across every live shard"""
+        running = []
+        for worker in self.workers:
+            if not worker.is_alive():
+                continue
+            try:
+                running.extend(worker.call("running", timeout=10))
+            except Exception as e:
+                logger.error(f"Could not query shard {worker.shard_id}: {e}")
+        return running
+
+    def get_loaded_agents(self) -> List[str]:
+        return list(self.agent_shards)
+
+    def shard_stats(self) -> List[Dict[str, Any]]:
+        """Per-shard agent count, estimated load, pid and restart count"""
+        return [
+            {
+                "shard": worker.shard_id,
+                "pid": worker.process.pid if worker.process else None,
+                "alive": worker.is_alive(),
+                "agents": len(worker.agents),
+                "running": len(worker.running),
+                "load": worker.load,
+                "restarts": worker.restarts,
+            }
+            for worker in self.workers
+        ]
+
+    def _restart(self, worker: ShardWorker) -> None:
+        # Commands wait until the shard is back with its agents restored
+        with worker.lock:
+            if worker.is_alive():
+                return
+            # Crash loops back off exponentially instead of spinning
+            backoff = min(2 ** worker.restarts, MAX_RESTART_BACKOFF)
+            if time.monotonic() - worker.last_start < backoff:
+                return
+            exitcode = worker.process.exitcode if worker.process else None
+            logger.warning(f"Shard {worker.shard_id} died (exit code {exitcode}), restarting with {len(worker.agents)} agents")
+            worker.terminate()
+            worker.restarts += 1
+            worker.spawn()
+            for name, agent_data in list(worker.agents.items()):
+                try:
+                    worker.call("load", agent_data)
+                    if name in worker.running:
+                        worker.call("start", name)
+                except Exception as e:
+                    logger.error(f"Failed to restore agent {name} on shard {worker.shard_id}: {e}")
+
+    def _monitor_loop(self) -> None:
+        while not self._stopping.wait(self.monitor_interval):
+            for worker in self.workers:
+                if self._stopping.is_set():
+                    return
+                if not worker.is_alive():
+                    try:
+                        self._restart(worker)
+                    except Exception as e:
+                        logger.error(f"Failed to restart shard {worker.shard_id}: {e}")
+
+    def shutdown(self) -> None:
+        """Stop every agent and worker process"""
+        self._stopping.set()
+        for worker in self.workers:
+            try:
+                if worker.is_alive():
+                    worker.call("shutdown", timeout=10)
+            except Exception as e:
+                logger.debug(f"Shard {worker.shard_id} did not shut down cleanly: {e}")
+            worker.terminate()
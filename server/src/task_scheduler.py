@@ -0,0 +1,73 @@
+import time
+from typing import Dict, List, Optional
+
+# Tasks gated by a posting interval: task name -> (agent.state key of the last
+# post, agent attribute holding the interval in seconds)
+INTERVAL_TASKS = {
+    "post-cast": ("last_cast_time", "cast_interval"),
+    "post-tweet": ("last_tweet_time", "tweet_interval"),
+    "post-echochambers": ("echochambers_last_message", "echochambers_message_interval"),
+}
+
+# How long a task that failed (or had nothing to do) waits before it is retried
+DEFAULT_FAILURE_DELAY = 60
+
+
+class TaskScheduler:
+    """
+    Tracks when each of an agent's tasks is next allowed to run.
+
+    Interval-gated tasks (see INTERVAL_TASKS) become eligible once their
+    configured interval has elapsed since the last successful post, read from
+    the same agent.state keys the actions update. Every other task waits
+    loop_delay after a successful run. Any task that fails is retried after
+    failure_delay.
+    """
+
+    def __init__(self, agent, failure_delay: float = DEFAULT_FAILURE_DELAY):
+        self.agent = agent
+        self.failure_delay = failure_delay
+        self._not_before: Dict[str, float] = {}
+
+    def _interval_ready_at(self, task_name: str) -> Optional[float]:
+        state_key, interval_attr = INTERVAL_TASKS.get(task_name, (None, None))
+        interval = getattr(self.agent, interval_attr, None) if interval_attr else None
+        if interval is None:
+            return None
+        return self.agent.state.get(state_key, 0) + interval
+
+    def next_eligible_at(self, task_name: str) -> float:
+        """Earliest time at which the task may run again"""
+        ready_at = self._not_before.get(task_name, 0.0)
+        interval_ready_at = self._interval_ready_at(task_name)
+        if interval_ready_at is not None:
+            ready_at = max(ready_at, interval_ready_at)
+        return ready_at
+
+    def eligible_tasks(self, now: Optional[float] = None) -> List[dict]:
+        """Tasks with a positive weight that may run now"""
+        now = time.time() if now is None else now
+        return [
+            task for task, weight in zip(self.agent.tasks, self.agent.task_weights)
+            if weight > 0 and self.next_eligible_at(task["name"]) <= now
+        ]
+
+    def next_wakeup(self) -> Optional[float]:
+        """When the next task becomes eligible, or None if no task can ever run"""
+        times = [
+            self.next_eligible_at(task["name"])
+            for task, weight in zip(self.agent.tasks, self.agent.task_weights)
+            if weight > 0
+        ]
+        return min(times) if times else None
+
+    def record(self, task_name: str, success: bool, finished_at: Optional[float] = None) -> None:
+        """Record the outcome of a run so the task's next eligible time moves forward"""
+        finished_at = time.time() if finished_at is None else finished_at
+        if not success:
+            self._not_before[task_name] = finished_at + self.failure_delay
+        elif task_name in INTERVAL_TASKS and self._interval_ready_at(task_name) is not None:
+            # The action itself stamped its last post time into agent.state
+            self._not_before.pop(task_name, None)
+        else:
+            self._not_before[task_name] = finished_at + self.agent.loop_delay
@@ -0,0 +1,52 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from src.agent_runtime import AgentRuntime
+
+
+@pytest.fixture
+def runtime():
+    runtime = AgentRuntime(name="test-runtime")
+    yield runtime
+    runtime.shutdown()
+
+
+def test_periodic_job_runs_until_cancelled(runtime):
+    calls = []
+    task = runtime.schedule_periodic("test-job", lambda: calls.append(time.time()), interval=0.02)
+    while len(calls) < 3:
+        time.sleep(0.01)
+    runtime.cancel(task)
+    time.sleep(0.05)
+    count = len(calls)
+    time.sleep(0.05)
+    assert len(calls) == count
+
+
+def test_periodic_job_survives_failures(runtime):
+    calls = []
+
+    def flaky():
+        calls.append(1)
+        raise RuntimeError("boom")
+
+    task = runtime.schedule_periodic("flaky-job", flaky, interval=0.01)
+    while len(calls) < 3:
+        time.sleep(0.01)
+    runtime.cancel(task)
+
+
+def test_listener_is_started_once(runtime):
+    started = threading.Event()
+
+    async def listen():
+        started.set()
+        await asyncio.sleep(3600)
+
+    assert runtime.ensure_listener("agent", "mentions", listen)
+    assert started.wait(1)
+    assert not runtime.ensure_listener("agent", "mentions", listen)
+    assert runtime.listeners() == [("agent", "mentions")]
@@ -0,0 +1,75 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from src.agent import ZerePyAgent
+from src.agent_runtime import AgentRuntime
+from src.helpers import async_executor
+
+
+class FakeConnectionManager:
+    connections = {"twitter": object()}
+
+    def perform_action(self, connection_name, action_name, params):
+        time.sleep(0.02)
+        return [{"text": f"tweet by {params[0]}"}]
+
+
+def make_agent(name):
+    agent = ZerePyAgent.__new__(ZerePyAgent)
+    agent.name = name
+    agent.bio = [f"I am {name}"]
+    agent.traits = []
+    agent.examples = []
+    agent.example_accounts = ["alice", "bob", "carol"]
+    agent.connection_manager = FakeConnectionManager()
+    agent.saved = []
+    agent._save_system_prompt = agent.saved.append
+    return agent
+
+
+@pytest.fixture
+def small_executor(monkeypatch):
+    executor = ThreadPoolExecutor(max_workers=2)
+    monkeypatch.setattr(async_executor, "_executor", executor)
+    yield executor
+    executor.shutdown(wait=False)
+
+
+def test_concurrent_refreshes_do_not_exhaust_the_executor(small_executor):
+    agents = [make_agent(f"agent-{i}") for i in range(6)]
+
+    async def refresh_all():
+        return await asyncio.wait_for(asyncio.gather(*(agent.arefresh_system_prompt() for agent in agents)), timeout=5)
+
+    prompts = asyncio.run(refresh_all())
+    for agent, prompt in zip(agents, prompts):
+        assert "- tweet by carol" in prompt
+        assert agent.saved == [prompt]
+
+
+def test_periodic_refresh_jobs_share_the_executor(small_executor):
+    runtime = AgentRuntime(name="test-runtime")
+    agents = [make_agent(f"agent-{i}") for i in range(6)]
+    try:
+        tasks = [
+            runtime.schedule_periodic(agent.name, agent.arefresh_system_prompt, interval=3600)
+            for agent in agents
+        ]
+        deadline = time.time() + 5
+        while not all(agent.saved for agent in agents) and time.time() < deadline:
+            time.sleep(0.01)
+        assert all(agent.saved for agent in agents)
+        # The executor is still free for everyone else
+        assert small_executor.submit(lambda: "ok").result(timeout=1) == "ok"
+        for task in tasks:
+            runtime.cancel(task)
+    finally:
+        runtime.shutdown()
+
+
+def test_sync_refresh_fetches_serially():
+    agent = make_agent("solo")
+    assert agent.refresh_system_prompt().count("- tweet by") == 3
@@ -0,0 +1,62 @@
+import asyncio
+import threading
+
+import pytest
+
+from src.helpers.async_executor import iterate_in_thread
+
+
+class BlockingStream:
+    """Yields a few items, then blocks like an idle HTTP stream until closed"""
+
+    def __init__(self, items):
+        self.items = items
+        self.closed = threading.Event()
+
+    def __iter__(self):
+        yield from self.items
+        self.closed.wait()
+        raise ConnectionError("stream closed")
+
+    def close(self):
+        self.closed.set()
+
+
+def test_yields_items_then_finishes():
+    async def consume():
+        return [item async for item in iterate_in_thread(iter([1, 2, 3]), "test-stream")]
+
+    assert asyncio.run(consume()) == [1, 2, 3]
+
+
+def test_iterable_errors_reach_the_consumer():
+    def failing():
+        yield 1
+        raise ValueError("boom")
+
+    async def consume():
+        return [item async for item in iterate_in_thread(failing(), "test-stream")]
+
+    with pytest.raises(ValueError):
+        asyncio.run(consume())
+
+
+def test_cancellation_closes_the_stream():
+    stream = BlockingStream([1, 2])
+    received = []
+
+    async def listen():
+        async for item in iterate_in_thread(stream, "test-stream", stream.close):
+            received.append(item)
+
+    async def main():
+        task = asyncio.create_task(listen())
+        while len(received) < 2:
+            await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(main())
+    assert received == [1, 2]
+    assert stream.closed.is_set()
@@ -0,0 +1,88 @@
+import pytest
+from eth_abi import encode
+
+from src.helpers import evm_batch, rpc_pool
+from src.helpers.evm_batch import BALANCE_OF, DECIMALS, NATIVE_TOKEN, SYMBOL, get_portfolio
+from src.helpers.rpc_pool import RpcPool
+from src.helpers.token_metadata import TokenMetadataStore
+
+PRIMARY, BACKUP = "https://primary.test", "https://backup.test"
+WALLET = "0x" + "aa" * 20
+TOKEN = "0x" + "bb" * 20
+
+
+def answer(request):
+    method, params = request["method"], request["params"]
+    if method == "eth_blockNumber":
+        result = hex(1234)
+    elif method == "eth_getBalance":
+        result = hex(2 * 10 ** 18)
+    else:
+        selector = bytes.fromhex(params[0]["data"][2:10])
+        if selector == DECIMALS:
+            data = encode(["uint256"], [6])
+        elif selector == SYMBOL:
+            data = encode(["string"], ["USDC"])
+        elif selector == BALANCE_OF:
+            data = encode(["uint256"], [5 * 10 ** 6])
+        else:
+            return {"jsonrpc": "2.0", "id": request["id"], "error": {"code": -32000, "message": "execution reverted"}}
+        result = "0x" + data.hex()
+    return {"jsonrpc": "2.0", "id": request["id"], "result": result}
+
+
+class FakeResponse:
+    def __init__(self, body):
+        self.body = body
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self.body
+
+
+class FakeNodes:
+    """JSON-RPC nodes without Multicall3; URLs in down refuse connections"""
+
+    def __init__(self, down=()):
+        self.down = set(down)
+        self.calls = []
+
+    def post(self, url, json=None, **kwargs):
+        self.calls.append(url)
+        if url in self.down:
+            raise ConnectionError(f"{url} refused the connection")
+        if isinstance(json, list):
+            return FakeResponse([answer(request) for request in json])
+        return FakeResponse(answer(json))
+
+
+@pytest.fixture
+def nodes(monkeypatch):
+    fake = FakeNodes(down={PRIMARY})
+    monkeypatch.setattr(evm_batch, "http_transport", fake)
+    monkeypatch.setattr(rpc_pool, "http_transport", fake)
+    return fake
+
+
+def test_portfolio_is_read_while_the_primary_is_down(nodes):
+    pool = RpcPool([PRIMARY, BACKUP])
+    snapshot = get_portfolio(pool, [(WALLET, None), (WALLET, TOKEN)], native_symbol="S", use_multicall=False)
+    assert snapshot["block_number"] == 1234
+    native, token = snapshot["balances"]
+    assert (native["token"], native["symbol"], native["balance"]) == (NATIVE_TOKEN, "S", 2.0)
+    assert (token["symbol"], token["decimals"], token["balance"]) == ("USDC", 6, 5.0)
+    assert PRIMARY in nodes.calls and nodes.calls[-1] == BACKUP
+    assert pool.stats()["endpoints"][0]["errors"] >= 1
+
+
+def test_single_url_has_no_failover(nodes):
+    with pytest.raises(ConnectionError):
+        get_portfolio(PRIMARY, [(WALLET, None)], use_multicall=False)
+
+
+def test_token_metadata_is_read_through_the_pool(nodes):
+    store = TokenMetadataStore(146, cache_dir=None)
+    assert store.decimals(RpcPool([PRIMARY, BACKUP]), TOKEN) == 6
+    assert store.symbol(PRIMARY, TOKEN) == "USDC"
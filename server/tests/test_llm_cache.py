@@ -0,0 +1,114 @@
+import pytest
+
+from src.helpers import llm_cache
+from src.helpers.llm_cache import (
+    MemoryResponseCache,
+    ResponseCache,
+    SQLiteResponseCache,
+    get_response_cache,
+    make_cache_key,
+)
+
+
+class Clock:
+    """Stands in for time.time() so TTL expiry needs no sleeping"""
+
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(llm_cache.time, "time", clock)
+    return clock
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def make_cache(request, tmp_path):
+    def make(**options):
+        if request.param == "memory":
+            return MemoryResponseCache(**options)
+        return SQLiteResponseCache(path=str(tmp_path / "responses.sqlite3"), **options)
+    return make
+
+
+def test_response_cache_is_abstract():
+    with pytest.raises(TypeError):
+        ResponseCache()
+
+
+def test_cache_key_depends_on_every_part():
+    key = make_cache_key("openai", "gpt-4", "system", "prompt")
+    assert len(key) == 64
+    assert key != make_cache_key("openai", "gpt-4", "system", "other prompt")
+    assert key != make_cache_key("openai", None, "system", "prompt")
+    assert make_cache_key("openai", "gpt-4", "system", "prompt", hashed=False) == '["openai", "gpt-4", "system", "prompt"]'
+
+
+def test_get_and_set(make_cache):
+    cache = make_cache()
+    assert cache.get("a") is None
+    cache.set("a", "reply")
+    assert cache.get("a") == "reply"
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["sets"], stats["entries"]) == (1, 1, 1, 1)
+    cache.clear()
+    assert len(cache) == 0
+
+
+def test_entries_expire_after_ttl(make_cache, clock):
+    cache = make_cache(ttl=60)
+    cache.set("a", "reply")
+    clock.now += 59
+    assert cache.get("a") == "reply"
+    clock.now += 2
+    assert cache.get("a") is None
+    assert len(cache) == 0
+    assert cache.stats()["evictions"] == 1
+
+
+def test_no_ttl_never_expires(make_cache, clock):
+    cache = make_cache(ttl=None)
+    cache.set("a", "reply")
+    clock.now += 10 ** 9
+    assert cache.get("a") == "reply"
+
+
+def test_memory_cache_evicts_least_recently_used():
+    cache = MemoryResponseCache(max_entries=2)
+    cache.set("a", "1")
+    cache.set("b", "2")
+    cache.get("a")
+    cache.set("c", "3")
+    assert cache.get("b") is None
+    assert cache.get("a") == "1"
+    assert cache.get("c") == "3"
+    assert cache.stats()["evictions"] == 1
+
+
+def test_sqlite_cache_prunes_oldest_and_survives_reopen(tmp_path, clock):
+    path = str(tmp_path / "responses.sqlite3")
+    cache = SQLiteResponseCache(path=path, max_entries=2)
+    for key in ("a", "b", "c"):
+        cache.set(key, key.upper())
+        clock.now += 1
+    assert cache.get("a") is None
+    assert SQLiteResponseCache(path=path).get("c") == "C"
+
+
+def test_shared_cache_per_config(monkeypatch):
+    monkeypatch.setattr(llm_cache, "_shared_caches", {})
+    config = {"backend": "memory", "max_entries": 10, "ttl": 30}
+    cache = get_response_cache(config)
+    assert isinstance(cache, MemoryResponseCache)
+    assert get_response_cache(dict(config)) is cache
+    assert get_response_cache({**config, "ttl": 60}) is not cache
+    assert get_response_cache({**config, "enabled": False}) is None
+    assert get_response_cache(None) is None
+    assert get_response_cache({"backend": "memory", "key": "exact"}).hashed_keys is False
+    with pytest.raises(ValueError):
+        get_response_cache({"backend": "redis"})
@@ -0,0 +1,116 @@
+import threading
+
+import pytest
+from eth_account import Account
+from web3 import Web3
+
+from src.helpers.nonce_manager import NonceManager, TransactionPipeline
+
+RECIPIENT = "0x70997970C51812dc3A010C7d01b50e0d17dc79C8"
+
+
+class FakeEth:
+    """Node side of a single wallet: the pending count and the transactions it accepted"""
+
+    def __init__(self, pending=0):
+        self.pending = pending
+        self.sent = []
+        self.errors = []
+        self.lock = threading.Lock()
+
+    def get_transaction_count(self, address, block_identifier="latest"):
+        return self.pending
+
+    def send_raw_transaction(self, raw):
+        with self.lock:
+            if self.errors:
+                raise self.errors.pop(0)
+            tx_hash = Web3.keccak(raw)
+            self.sent.append(tx_hash)
+            self.pending += 1
+            return tx_hash
+
+    def get_transaction_receipt(self, tx_hash):
+        return {"transactionHash": tx_hash, "status": 1}
+
+
+class FakeWeb3:
+    def __init__(self, pending=0):
+        self.eth = FakeEth(pending)
+
+
+def transfer():
+    return {"to": RECIPIENT, "value": 1, "gas": 21000, "gasPrice": 1, "chainId": 1}
+
+
+def test_allocates_from_the_node_count_then_locally():
+    nonces = NonceManager(FakeWeb3(pending=7), RECIPIENT)
+    assert [nonces.allocate() for _ in range(3)] == [7, 8, 9]
+
+
+def test_released_nonce_is_reused_first():
+    nonces = NonceManager(FakeWeb3(), RECIPIENT)
+    first, second = nonces.allocate(), nonces.allocate()
+    nonces.release(first)
+    assert nonces.allocate() == first
+    assert nonces.allocate() == second + 1
+
+
+def test_resync_does_not_move_back_under_unsent_nonces():
+    web3 = FakeWeb3(pending=0)
+    nonces = NonceManager(web3, RECIPIENT)
+    allocated = [nonces.allocate() for _ in range(3)]
+    # Nothing broadcast yet: the node still reports 0, but 0..2 are reserved by other senders
+    nonces.resync()
+    assert nonces.allocate() not in allocated
+
+
+def test_resync_fills_a_gap_once_nothing_is_in_flight():
+    web3 = FakeWeb3(pending=0)
+    nonces = NonceManager(web3, RECIPIENT)
+    for _ in range(3):
+        nonces.mark_sent(nonces.allocate())
+    # Nonce 1 and 2 were dropped by the node
+    web3.eth.pending = 1
+    assert nonces.resync() == 1
+    assert nonces.allocate() == 1
+
+
+def test_resync_skips_nonces_used_elsewhere():
+    web3 = FakeWeb3(pending=0)
+    nonces = NonceManager(web3, RECIPIENT)
+    nonces.mark_sent(nonces.allocate())
+    web3.eth.pending = 5
+    assert nonces.resync() == 5
+
+
+def test_pipeline_retries_a_rejected_nonce():
+    web3 = FakeWeb3(pending=0)
+    pipeline = TransactionPipeline(web3, Account.create(), poll_interval=0.01)
+    web3.eth.errors.append(ValueError("nonce too low"))
+    web3.eth.pending = 1
+    pending = pipeline.submit(transfer())
+    assert pending.nonce == 1
+    assert pending.receipt(timeout=2)["status"] == 1
+    assert pipeline.stats()["send_errors"] == 1
+
+
+def test_pipeline_reuses_the_nonce_of_a_failed_send():
+    web3 = FakeWeb3(pending=0)
+    pipeline = TransactionPipeline(web3, Account.create(), poll_interval=0.01)
+    web3.eth.errors.append(ConnectionError("connection reset"))
+    with pytest.raises(ConnectionError):
+        pipeline.submit(transfer())
+    assert pipeline.submit(transfer()).nonce == 0
+
+
+def test_concurrent_submits_get_distinct_nonces():
+    web3 = FakeWeb3(pending=0)
+    pipeline = TransactionPipeline(web3, Account.create(), poll_interval=0.01)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(pipeline.submit(transfer()).nonce)) for _ in range(20)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert sorted(results) == list(range(20))
@@ -0,0 +1,38 @@
+from routing import DEFAULT_AGENT, RoutingIndex
+
+
+def test_agent_is_resolved_by_name_or_alias():
+    index = RoutingIndex()
+    index.add_agent("Doge", aliases=["dogebot"])
+    assert index.route("doge!! hello").agent == "Doge"
+    assert index.route("  DogeBot !! hello").agent == "Doge"
+    assert index.route("doge!!  hello there ").text == "hello there"
+
+
+def test_unknown_or_missing_agent_uses_default():
+    index = RoutingIndex()
+    assert index.route("nobody!! hi").agent == DEFAULT_AGENT
+    assert index.route("just a cast").agent == DEFAULT_AGENT
+    assert index.route("just a cast").text == "just a cast"
+
+
+def test_keywords_pick_the_intent():
+    index = RoutingIndex()
+    assert index.route("MemeForge!! sonic swap 1 S").intent == "sonic"
+    assert index.route("MemeForge!! tell me a joke").intent == "chat"
+
+
+def test_longest_keyword_wins():
+    index = RoutingIndex(keywords={"swap": "trade", "swap quote": "quote"})
+    assert index.route("swap quote for 1 S").intent == "quote"
+
+
+def test_removed_agent_and_replaced_aliases_stop_resolving():
+    index = RoutingIndex()
+    index.add_agent("Doge", aliases=["dogebot"])
+    index.add_agent("Doge", aliases=["shiba"])
+    assert index.route("dogebot!! hi").agent == DEFAULT_AGENT
+    assert index.route("shiba!! hi").agent == "Doge"
+    index.remove_agent("Doge")
+    assert index.route("doge!! hi").agent == DEFAULT_AGENT
+    assert index.agents() == []
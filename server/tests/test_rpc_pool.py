@@ -0,0 +1,139 @@
+import time
+
+import pytest
+
+from src.helpers import rpc_pool
+from src.helpers.rpc_pool import FAILURES_BEFORE_COOLDOWN, RpcEndpoint, RpcPool, RpcPoolError
+
+FAST, SLOW, DOWN = "https://fast.test", "https://slow.test", "https://down.test"
+
+
+class FakeResponse:
+    def __init__(self, url, payload):
+        self.url = url
+        self.payload = payload
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return {"jsonrpc": "2.0", "id": self.payload["id"], "result": self.url}
+
+
+class FakeNodes:
+    """Answers every call with the URL that served it, after a per-URL delay"""
+
+    def __init__(self, delays=None, down=()):
+        self.delays = delays or {}
+        self.down = set(down)
+        self.calls = []
+
+    def post(self, url, json=None, **kwargs):
+        self.calls.append((url, json["method"]))
+        time.sleep(self.delays.get(url, 0))
+        if url in self.down:
+            raise ConnectionError(f"{url} refused the connection")
+        return FakeResponse(url, json)
+
+
+@pytest.fixture
+def nodes(monkeypatch):
+    fake = FakeNodes()
+    monkeypatch.setattr(rpc_pool, "http_transport", fake)
+    return fake
+
+
+def warm_up(pool, latencies):
+    for endpoint in pool.endpoints:
+        endpoint.record_success(latencies[endpoint.url])
+
+
+def test_score_prefers_low_latency_and_few_errors():
+    fast, slow = RpcEndpoint(FAST), RpcEndpoint(SLOW)
+    fast.record_success(0.05)
+    slow.record_success(0.2)
+    assert fast.score() < slow.score()
+    for _ in range(3):
+        fast.record_failure(time.time())
+    fast.record_success(0.05)
+    assert fast.score() > slow.score()
+
+
+def test_untried_endpoints_are_tried_first():
+    endpoint = RpcEndpoint(FAST)
+    measured = RpcEndpoint(SLOW)
+    measured.record_success(0.01)
+    assert endpoint.score() < measured.score()
+
+
+def test_repeated_failures_cool_an_endpoint_down():
+    endpoint = RpcEndpoint(DOWN)
+    now = time.time()
+    for _ in range(FAILURES_BEFORE_COOLDOWN - 1):
+        endpoint.record_failure(now)
+    assert endpoint.healthy(now)
+    endpoint.record_failure(now)
+    assert not endpoint.healthy(now)
+    assert endpoint.healthy(now + rpc_pool.BASE_COOLDOWN)
+
+
+def test_reads_go_to_the_best_endpoint(nodes):
+    pool = RpcPool([SLOW, FAST])
+    warm_up(pool, {SLOW: 0.2, FAST: 0.01})
+    assert pool.request("eth_blockNumber", [])["result"] == FAST
+
+
+def test_reads_fail_over(nodes):
+    nodes.down.add(DOWN)
+    pool = RpcPool([DOWN, FAST])
+    warm_up(pool, {DOWN: 0.001, FAST: 0.01})
+    assert pool.request("eth_blockNumber", [])["result"] == FAST
+    assert pool.stats()["endpoints"][0]["errors"] == 1
+
+
+def test_all_endpoints_down_raises(nodes):
+    nodes.down.update({DOWN, FAST})
+    with pytest.raises(RpcPoolError):
+        RpcPool([DOWN, FAST]).request("eth_blockNumber", [])
+
+
+def test_writes_stick_to_one_endpoint(nodes):
+    pool = RpcPool([SLOW, FAST])
+    warm_up(pool, {SLOW: 0.01, FAST: 0.2})
+    assert pool.request("eth_sendRawTransaction", ["0x01"])["result"] == SLOW
+    # FAST becomes the better endpoint for reads, writes stay on the node holding our pending transactions
+    for _ in range(30):
+        pool.endpoints[0].record_success(1.0)
+    assert pool.request("eth_blockNumber", [])["result"] == FAST
+    assert pool.request("eth_getTransactionCount", ["0xabc", "pending"])["result"] == SLOW
+    assert pool.request("eth_sendRawTransaction", ["0x02"])["result"] == SLOW
+
+
+def test_failed_write_moves_writes_elsewhere(nodes):
+    pool = RpcPool([DOWN, FAST])
+    warm_up(pool, {DOWN: 0.001, FAST: 0.01})
+    nodes.down.add(DOWN)
+    with pytest.raises(RpcPoolError):
+        pool.request("eth_sendRawTransaction", ["0x01"])
+    for _ in range(FAILURES_BEFORE_COOLDOWN):
+        pool.endpoints[0].record_failure(time.time())
+    assert pool.request("eth_sendRawTransaction", ["0x01"])["result"] == FAST
+
+
+def test_slow_read_is_hedged(nodes):
+    nodes.delays[SLOW] = 0.5
+    pool = RpcPool([SLOW, FAST], hedge_after=0.05)
+    warm_up(pool, {SLOW: 0.001, FAST: 0.01})
+    start = time.perf_counter()
+    assert pool.request("eth_call", [{}, "latest"])["result"] == FAST
+    assert time.perf_counter() - start < 0.4
+    assert pool.stats()["endpoints"][1]["hedge_wins"] == 1
+
+
+def test_pools_are_shared_per_url_list(monkeypatch):
+    monkeypatch.setattr(rpc_pool, "_pools", {})
+    pool = rpc_pool.get_rpc_pool([FAST, SLOW, FAST])
+    assert [endpoint.url for endpoint in pool.endpoints] == [FAST, SLOW]
+    assert rpc_pool.get_rpc_pool([FAST, SLOW]) is pool
+    assert rpc_pool.get_rpc_pool([SLOW, FAST]) is not pool
+    assert set(rpc_pool.rpc_pool_stats()) == {FAST, SLOW}
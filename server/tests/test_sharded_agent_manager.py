@@ -0,0 +1,100 @@
+import multiprocessing
+import threading
+import time
+
+import pytest
+
+from src.sharded_agent_manager import ShardedAgentManager, ShardWorker, balance_shards
+
+
+def fake_worker(conn, delays):
+    """Answers each command with its own name, after the delay configured for it"""
+    while True:
+        try:
+            request_id, command, args = conn.recv()
+        except EOFError:
+            return
+        time.sleep(delays.get(command, 0))
+        conn.send((request_id, "ok", command))
+
+
+def test_late_reply_is_not_taken_for_the_next_answer():
+    worker = ShardWorker(0, multiprocessing.get_context("spawn"))
+    worker.conn, child_conn = multiprocessing.Pipe()
+    threading.Thread(target=fake_worker, args=(child_conn, {"load": 0.3}), daemon=True).start()
+
+    with pytest.raises(TimeoutError):
+        worker.call("load", timeout=0.05)
+    assert worker.call("running", timeout=2) == "running"
+    assert worker.call("loaded", timeout=2) == "loaded"
+
+
+class FakeProcess:
+    def __init__(self, alive):
+        self.alive = alive
+        self.exitcode = None if alive else 1
+        self.pid = None
+
+    def is_alive(self):
+        return self.alive
+
+    def terminate(self):
+        self.alive = False
+
+    def join(self, timeout=None):
+        pass
+
+
+def recording_worker(conn, received, delays):
+    """Records (command, agent name) and answers like fake_worker"""
+    while True:
+        try:
+            request_id, command, args = conn.recv()
+        except EOFError:
+            return
+        received.append((command, args[0]["name"] if isinstance(args[0], dict) else args[0]))
+        time.sleep(delays.get(command, 0))
+        conn.send((request_id, "ok", received[-1][1]))
+
+
+def test_commands_wait_for_a_restart_to_finish():
+    worker = ShardWorker(0, multiprocessing.get_context("spawn"))
+    worker.process = FakeProcess(alive=False)
+    worker.conn, dead_end = multiprocessing.Pipe()
+    dead_end.close()
+    worker.agents = {"a": {"name": "a"}, "b": {"name": "b"}}
+    worker.running = {"a"}
+
+    received = []
+    spawned = threading.Event()
+
+    def spawn():
+        worker.conn, child_conn = multiprocessing.Pipe()
+        threading.Thread(target=recording_worker, args=(child_conn, received, {"load": 0.1}), daemon=True).start()
+        worker.process, worker.last_start = FakeProcess(alive=True), time.monotonic()
+        spawned.set()
+
+    worker.spawn = spawn
+    manager = ShardedAgentManager.__new__(ShardedAgentManager)
+    manager.workers = [worker]
+    manager.agent_shards = {"a": 0, "b": 0}
+    manager._lock = threading.Lock()
+
+    restart = threading.Thread(target=manager._restart, args=(worker,))
+    restart.start()
+    assert spawned.wait(2)
+    # Issued mid-restart: must reach the new process after the agents are restored
+    manager.start_agent("b")
+    restart.join()
+
+    assert received == [("load", "a"), ("start", "a"), ("load", "b"), ("start", "b")]
+    assert worker.running == {"a", "b"}
+    assert worker.restarts == 1
+
+
+def test_balance_shards_spreads_load():
+    agents = [{"name": name, "shard_weight": weight} for name, weight in (("a", 5), ("b", 3), ("c", 3), ("d", 1))]
+    loads = [0.0, 0.0]
+    assignment = balance_shards(agents, loads)
+    assert sorted(loads) == [6.0, 6.0]
+    assert assignment[0] == assignment[3] != assignment[1] == assignment[2]
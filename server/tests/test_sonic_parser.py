@@ -0,0 +1,82 @@
+import pytest
+
+from sonic_parser import MIN_CONFIDENCE, NATIVE_TOKEN_ADDRESS, normalize_command, parse_sonic_command
+
+ADDRESS = "0x" + "ab" * 20
+OTHER_ADDRESS = "0x" + "cd" * 20
+
+
+def test_swap_native_to_address():
+    command = parse_sonic_command(f"sonic swap 10 S to {ADDRESS} with 1% slippage")
+    assert command.action == "swap"
+    assert command.params == {"token_in": NATIVE_TOKEN_ADDRESS, "token_out": ADDRESS, "amount": 10.0, "slippage": 1.0}
+    assert command.confidence >= MIN_CONFIDENCE
+
+
+def test_swap_keeps_the_whole_amount():
+    command = parse_sonic_command(f"sonic swap 10.25 {ADDRESS} for {OTHER_ADDRESS}")
+    assert command.params["amount"] == 10.25
+    assert command.params["token_in"] == ADDRESS
+
+
+@pytest.mark.parametrize("text", ["sonic swap 10 to USDC", "sonic swap 10 0.5 to USDC", f"send 10 0 to {ADDRESS}"])
+def test_amount_is_never_split_into_a_token(text):
+    command = parse_sonic_command(text)
+    assert command is None or command.confidence < MIN_CONFIDENCE
+
+
+def test_swap_with_ticker_is_left_to_the_llm():
+    command = parse_sonic_command("sonic swap 10 S to USDC")
+    assert command.action == "swap"
+    assert command.params["token_in"] == NATIVE_TOKEN_ADDRESS
+    assert command.confidence < MIN_CONFIDENCE
+
+
+def test_transfer_native():
+    command = parse_sonic_command(f"MemeForge!! send 5 S to {ADDRESS}")
+    assert command.action == "transfer"
+    assert command.params == {"to_address": ADDRESS, "amount": 5.0}
+    assert command.confidence >= MIN_CONFIDENCE
+
+
+def test_transfer_without_token():
+    command = parse_sonic_command(f"sonic send 10 to {ADDRESS}")
+    assert command.params == {"to_address": ADDRESS, "amount": 10.0}
+
+
+def test_transfer_with_ticker_is_left_to_the_llm():
+    command = parse_sonic_command(f"sonic send 10 USDC to {ADDRESS}")
+    assert command.confidence < MIN_CONFIDENCE
+
+
+def test_balance():
+    command = parse_sonic_command(f"@bot sonic, please check balance of {ADDRESS}")
+    assert command.action == "get-balance"
+    assert command.params == {"address": ADDRESS}
+    assert command.confidence >= MIN_CONFIDENCE
+
+
+def test_ticker_lookup():
+    command = parse_sonic_command("get token by ticker WOOF")
+    assert command.action == "get-token-by-ticker"
+    assert command.params == {"ticker": "WOOF"}
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "is sonic a good project? whats the balance between risk",
+        "sonic dont swap 10 S to USDC",
+        "sonic do not send 5 S to " + ADDRESS,
+        "should I swap 10 S to USDC",
+        "sonic swap 10 S to USDC?",
+        "I love sonic, what a project",
+        "the balance of power on sonic",
+    ],
+)
+def test_questions_negations_and_chatter_are_not_commands(text):
+    assert parse_sonic_command(text) is None
+
+
+def test_normalize_command():
+    assert normalize_command("MemeForge!!  Sonic   Swap 10 S") == "sonic swap 10 s"
@@ -0,0 +1,84 @@
+import pytest
+
+from src.helpers import swap_routes
+from src.helpers.swap_routes import SwapRouter
+
+TOKEN_IN = "0x" + "aa" * 20
+TOKEN_OUT = "0x" + "bb" * 20
+SENDER = "0x" + "cc" * 20
+
+
+class FakeResponse:
+    def __init__(self, data):
+        self.data = data
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return {"code": 0, "data": self.data}
+
+
+class FakeTransport:
+    def __init__(self):
+        self.routes = 0
+        self.builds = 0
+
+    def get(self, url, headers=None, params=None):
+        self.routes += 1
+        return FakeResponse({"routeSummary": {"checksum": f"route-{self.routes}", "amountIn": params["amountIn"]}})
+
+    def post(self, url, headers=None, json=None):
+        self.builds += 1
+        return FakeResponse({"data": "0xdeadbeef", "routerAddress": "0xrouter"})
+
+
+@pytest.fixture
+def transport(monkeypatch):
+    fake = FakeTransport()
+    monkeypatch.setattr(swap_routes, "http_transport", fake)
+    return fake
+
+
+@pytest.fixture
+def router():
+    router = SwapRouter("https://aggregator.test/api/v1", ttl=60)
+    # Prefetches are driven by the tests, not by the background loop
+    router._prefetcher = object()
+    yield router
+    router.close()
+
+
+def test_route_is_cached_per_amount(transport, router):
+    router.route(TOKEN_IN, TOKEN_OUT, 100)
+    router.route("0x" + "AA" * 20, TOKEN_OUT, 100)
+    router.route(TOKEN_IN, TOKEN_OUT, 200)
+    assert transport.routes == 2
+    assert router.stats()["route_hits"] == 1
+
+
+def test_build_is_cached(transport, router):
+    route = router.route(TOKEN_IN, TOKEN_OUT, 100)
+    router.build(route, SENDER, SENDER, 0.5)
+    router.build(route, SENDER, SENDER, 0.5)
+    router.build(route, SENDER, SENDER, 1.0)
+    assert transport.builds == 2
+
+
+def test_identical_hot_pairs_are_prefetched_once(transport, router):
+    keys = [router.add_hot_pair(TOKEN_IN, TOKEN_OUT, 100, SENDER) for _ in range(3)]
+    assert len(set(keys)) == 1
+    router.prefetch()
+    assert transport.routes == 1
+    assert router.stats()["hot_pairs"] == 1
+
+
+def test_hot_pair_stays_until_every_holder_removes_it(transport, router):
+    first = router.add_hot_pair(TOKEN_IN, TOKEN_OUT, 100)
+    second = router.add_hot_pair(TOKEN_IN, TOKEN_OUT, 100)
+    router.remove_hot_pair(first)
+    assert router.stats()["hot_pairs"] == 1
+    router.remove_hot_pair(second)
+    assert router.stats()["hot_pairs"] == 0
+    router.prefetch()
+    assert transport.routes == 0
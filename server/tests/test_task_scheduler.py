@@ -0,0 +1,60 @@
+from types import SimpleNamespace
+
+from src.task_scheduler import TaskScheduler
+
+
+def make_agent(**attributes):
+    agent = SimpleNamespace(
+        tasks=[{"name": "post-tweet"}, {"name": "reply-to-tweet"}, {"name": "disabled"}],
+        task_weights=[1, 1, 0],
+        loop_delay=30,
+        tweet_interval=900,
+        state={},
+    )
+    for name, value in attributes.items():
+        setattr(agent, name, value)
+    return agent
+
+
+def names(tasks):
+    return [task["name"] for task in tasks]
+
+
+def test_every_weighted_task_is_eligible_at_first():
+    scheduler = TaskScheduler(make_agent())
+    assert names(scheduler.eligible_tasks(now=1000)) == ["post-tweet", "reply-to-tweet"]
+
+
+def test_interval_task_waits_for_its_interval():
+    agent = make_agent()
+    scheduler = TaskScheduler(agent)
+    agent.state["last_tweet_time"] = 1000
+    scheduler.record("post-tweet", True, finished_at=1000)
+    assert "post-tweet" not in names(scheduler.eligible_tasks(now=1899))
+    assert "post-tweet" in names(scheduler.eligible_tasks(now=1900))
+
+
+def test_other_tasks_wait_loop_delay_after_success():
+    scheduler = TaskScheduler(make_agent())
+    scheduler.record("reply-to-tweet", True, finished_at=1000)
+    assert scheduler.next_eligible_at("reply-to-tweet") == 1030
+
+
+def test_failed_task_waits_failure_delay():
+    scheduler = TaskScheduler(make_agent(), failure_delay=60)
+    scheduler.record("reply-to-tweet", False, finished_at=1000)
+    assert scheduler.next_eligible_at("reply-to-tweet") == 1060
+
+
+def test_next_wakeup_is_the_earliest_weighted_task():
+    agent = make_agent()
+    scheduler = TaskScheduler(agent)
+    agent.state["last_tweet_time"] = 1000
+    scheduler.record("post-tweet", True, finished_at=1000)
+    scheduler.record("reply-to-tweet", True, finished_at=1000)
+    assert scheduler.next_wakeup() == 1030
+
+
+def test_no_weighted_task_never_wakes_up():
+    scheduler = TaskScheduler(make_agent(task_weights=[0, 0, 0]))
+    assert scheduler.next_wakeup() is None
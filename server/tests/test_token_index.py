@@ -0,0 +1,123 @@
+import threading
+import time
+
+import pytest
+
+from src.helpers import token_index
+from src.helpers.token_index import TokenIndex, rank_by_fdv, rank_by_liquidity_volume
+
+WOOF_ADDRESS = "0x" + "11" * 20
+WOOF_SCAM_ADDRESS = "0x" + "22" * 20
+BONE_ADDRESS = "0x" + "33" * 20
+
+
+def pair(symbol, address, chain="sonic", liquidity=0, volume=0, fdv=0):
+    return {
+        "chainId": chain,
+        "baseToken": {"symbol": symbol, "address": address},
+        "liquidity": {"usd": liquidity},
+        "volume": {"h24": volume},
+        "fdv": fdv,
+    }
+
+
+class FakeResponse:
+    def __init__(self, pairs):
+        self.pairs = pairs
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return {"pairs": self.pairs}
+
+
+class FakeDexScreener:
+    def __init__(self, pairs, gate=None):
+        self.pairs = pairs
+        self.gate = gate
+        self.queries = []
+
+    def get(self, url, params=None):
+        self.queries.append(params["q"])
+        if self.gate is not None:
+            self.gate.wait(2)
+        return FakeResponse(self.pairs)
+
+
+@pytest.fixture
+def dexscreener(monkeypatch):
+    fake = FakeDexScreener([
+        pair("WOOF", WOOF_ADDRESS, liquidity=100_000, volume=50_000, fdv=1_000),
+        pair("WOOF", WOOF_SCAM_ADDRESS, liquidity=10, volume=10, fdv=1_000_000),
+        pair("BONE", BONE_ADDRESS, liquidity=5_000, volume=1_000),
+        pair("WOOF", "0x" + "44" * 20, chain="base", liquidity=10 ** 9, volume=10 ** 9),
+    ])
+    monkeypatch.setattr(token_index, "http_transport", fake)
+    return fake
+
+
+def make_index(**options):
+    return TokenIndex("sonic", refresh_interval=None, **options)
+
+
+def test_best_ranked_token_of_the_chain_wins(dexscreener):
+    assert make_index().lookup("woof") == WOOF_ADDRESS
+    assert make_index(rank=rank_by_fdv).lookup("$WOOF") == WOOF_SCAM_ADDRESS
+
+
+def test_other_symbols_in_a_search_are_not_trusted(dexscreener):
+    index = make_index()
+    index.lookup("WOOF")
+    # BONE was in the WOOF results, but only a search for BONE itself may resolve it
+    assert index.lookup("BONE") == BONE_ADDRESS
+    assert dexscreener.queries == ["woof", "bone"]
+
+
+def test_repeated_lookup_is_served_from_memory(dexscreener):
+    index = make_index()
+    index.lookup("WOOF")
+    index.lookup("woof")
+    assert dexscreener.queries == ["woof"]
+    assert index.stats()["hits"] == 1
+
+
+def test_missing_ticker_is_cached_as_negative(dexscreener):
+    index = make_index()
+    assert index.lookup("NOPE") is None
+    assert index.lookup("nope") is None
+    assert dexscreener.queries == ["nope"]
+    assert index.stats()["negative_hits"] == 1
+
+
+def test_expired_entries_are_fetched_again(dexscreener, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(token_index.time, "time", lambda: now[0])
+    index = make_index(ttl=60)
+    index.lookup("WOOF")
+    now[0] += 61
+    index.lookup("WOOF")
+    assert dexscreener.queries == ["woof", "woof"]
+
+
+def test_concurrent_lookups_share_one_request(dexscreener):
+    gate = threading.Event()
+    dexscreener.gate = gate
+    index = make_index()
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(index.lookup("WOOF"))) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    while index.stats()["misses"] < 5:
+        time.sleep(0.001)
+    gate.set()
+    for thread in threads:
+        thread.join()
+    assert results == [WOOF_ADDRESS] * 5
+    assert dexscreener.queries == ["woof"]
+    assert index.stats()["coalesced"] == 4
+
+
+def test_rank_by_liquidity_volume_handles_missing_fields():
+    assert rank_by_liquidity_volume({}) == 0
+    assert rank_by_liquidity_volume({"liquidity": {"usd": 2}, "volume": {"h24": 3}}) == 6
@@ -0,0 +1,91 @@
+import asyncio
+import json
+import queue
+
+import pytest
+
+import src.connection_manager as connection_manager
+from src.connection_manager import ConnectionManager
+from src.connections.twitter_connection import TwitterConnection
+from src.helpers.async_executor import iterate_in_thread
+
+TWITTER_CONFIG = {"name": "twitter", "timeline_read_count": 10, "tweet_interval": 900}
+
+
+class FakeStreamResponse:
+    """An open streaming response: lines are pushed by the test, close() ends it"""
+
+    status_code = 200
+
+    def __init__(self):
+        self.lines = queue.Queue()
+        self.closed = False
+
+    def push(self, tweet_id):
+        self.lines.put(json.dumps({"data": {"id": tweet_id, "text": "gm"}}).encode())
+
+    def iter_lines(self):
+        while True:
+            line = self.lines.get()
+            if line is None:
+                raise ConnectionError("response closed")
+            yield line
+
+    def close(self):
+        self.closed = True
+        self.lines.put(None)
+
+
+@pytest.fixture
+def responses(monkeypatch):
+    monkeypatch.setattr(connection_manager, "_connection_pool", {})
+    monkeypatch.setattr(connection_manager, "_connection_refcounts", {})
+    opened = []
+
+    def make_request(self, method, endpoint, use_bearer=False, stream=False, **kwargs):
+        assert stream
+        opened.append(FakeStreamResponse())
+        return opened[-1]
+
+    monkeypatch.setattr(TwitterConnection, "_make_request", make_request)
+    monkeypatch.setattr(TwitterConnection, "_get_rules", lambda self: [])
+    monkeypatch.setattr(TwitterConnection, "_delete_rules", lambda self, rules: None)
+    monkeypatch.setattr(TwitterConnection, "_build_rule", lambda self, filter_string: None)
+    return opened
+
+
+def test_cancelling_one_listener_keeps_the_other_stream_open(responses):
+    first, second = ConnectionManager([TWITTER_CONFIG]), ConnectionManager([TWITTER_CONFIG])
+    twitter = first.connections["twitter"]
+    assert second.connections["twitter"] is twitter
+
+    async def listen(manager, name, received):
+        stream = manager.connections["twitter"].stream_tweets(f"@{name}")
+        async for tweet in iterate_in_thread(stream, f"twitter-stream-{name}", stream.close):
+            received.put_nowait(tweet["id"])
+
+    async def scenario():
+        first_received, second_received = asyncio.Queue(), asyncio.Queue()
+        first_task = asyncio.create_task(listen(first, "first", first_received))
+        second_task = asyncio.create_task(listen(second, "second", second_received))
+        while len(responses) < 2:
+            await asyncio.sleep(0.01)
+
+        first_task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first_task
+        assert sorted(response.closed for response in responses) == [False, True]
+
+        open_response = next(response for response in responses if not response.closed)
+        open_response.push("1")
+        assert await asyncio.wait_for(second_received.get(), 2) == "1"
+        assert not second_task.done()
+
+        # The pooled connection closes the remaining stream with its last holder
+        first.close()
+        assert not open_response.closed
+        second.close()
+        await asyncio.wait_for(second_task, 2)
+
+    asyncio.run(scenario())
+    assert all(response.closed for response in responses)
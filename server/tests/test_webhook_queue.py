@@ -0,0 +1,86 @@
+import asyncio
+
+import pytest
+
+from webhook_queue import DedupIndex, QueueFullError, WebhookQueue
+
+
+def event(cast_hash, agent):
+    return {"data": {"hash": cast_hash, "agent": agent}}
+
+
+def agent_for(hook_data):
+    return hook_data["data"]["agent"]
+
+
+def test_burst_for_one_agent_does_not_stall_others():
+    async def main():
+        release = asyncio.Event()
+        order = []
+        running = {"viral": 0}
+        peak = {"viral": 0}
+
+        async def handler(hook_data):
+            agent = agent_for(hook_data)
+            order.append(hook_data["data"]["hash"])
+            if agent == "viral":
+                running["viral"] += 1
+                peak["viral"] = max(peak["viral"], running["viral"])
+                await release.wait()
+                running["viral"] -= 1
+
+        queue = WebhookQueue(handler, agent_for, workers=4, per_agent_concurrency=2)
+        await queue.start()
+        for i in range(20):
+            queue.submit(event(f"viral-{i}", "viral"))
+        queue.submit(event("quiet", "quiet"))
+        for _ in range(50):
+            await asyncio.sleep(0.01)
+            if "quiet" in order:
+                break
+        assert "quiet" in order
+        assert queue.stats()["parked"] == 18
+
+        release.set()
+        await queue._queue.join()
+        while queue.stats()["processed"] < 21:
+            await asyncio.sleep(0.01)
+        await queue.stop()
+        assert peak["viral"] == 2
+        viral = [cast_hash for cast_hash in order if cast_hash.startswith("viral")]
+        assert viral[2:] == [f"viral-{i}" for i in range(2, 20)]
+
+    asyncio.run(main())
+
+
+def test_duplicates_and_capacity():
+    async def main():
+        blocker = asyncio.Event()
+
+        async def handler(hook_data):
+            await blocker.wait()
+
+        queue = WebhookQueue(handler, agent_for, workers=1, max_queue_size=2, per_agent_concurrency=1)
+        await queue.start()
+        assert queue.submit(event("a", "x"))
+        assert not queue.submit(event("a", "x"))
+        await asyncio.sleep(0.01)
+        assert queue.submit(event("b", "x"))
+        await asyncio.sleep(0.01)
+        assert queue.submit(event("c", "x"))
+        # "b" is parked and "c" is queued: the parked event counts against capacity
+        with pytest.raises(QueueFullError):
+            queue.submit(event("d", "x"))
+        blocker.set()
+        await queue.stop()
+
+    asyncio.run(main())
+
+
+def test_dedup_index_window():
+    index = DedupIndex(window=0, max_entries=10)
+    assert index.add("a")
+    index.window = 600
+    assert not index.add("a")
+    index.discard("a")
+    assert index.add("a")
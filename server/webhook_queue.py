@@ -0,0 +1,215 @@
+import asyncio
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional, Tuple
+
+logger = logging.getLogger("farcaster_bot")
+
+# Worker tasks draining the queue
+DEFAULT_WORKERS = int(os.getenv("WEBHOOK_WORKERS", "8"))
+# Events waiting beyond this are rejected so the sender retries later
+DEFAULT_MAX_QUEUE_SIZE = int(os.getenv("WEBHOOK_QUEUE_SIZE", "1000"))
+# Events handled at the same time for a single agent
+DEFAULT_PER_AGENT_CONCURRENCY = int(os.getenv("WEBHOOK_PER_AGENT_CONCURRENCY", "2"))
+# A cast hash seen within this many seconds is treated as a duplicate delivery
+DEFAULT_DEDUP_WINDOW = 600
+DEFAULT_DEDUP_MAX_ENTRIES = 100_000
+# Latency samples kept for the percentiles in stats()
+LATENCY_SAMPLES = 1000
+
+
+class DedupIndex:
+    """Cast hashes seen recently, bounded both by age and by count"""
+
+    def __init__(self, window: float = DEFAULT_DEDUP_WINDOW, max_entries: int = DEFAULT_DEDUP_MAX_ENTRIES):
+        self.window = window
+        self.max_entries = max_entries
+        self._seen: "OrderedDict[str, float]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _prune(self, now: float) -> None:
+        while self._seen:
+            key, seen_at = next(iter(self._seen.items()))
+            if now - seen_at <= self.window and len(self._seen) <= self.max_entries:
+                break
+            del self._seen[key]
+
+    def add(self, key: str) -> bool:
+        """Record a key; returns False if it was already seen within the window"""
+        now = time.monotonic()
+        with self._lock:
+            self._prune(now)
+            if key in self._seen:
+                return False
+            self._seen[key] = now
+            return True
+
+    def discard(self, key: str) -> None:
+        with self._lock:
+            self._seen.pop(key, None)
+
+    def __len__(self) -> int:
+        return len(self._seen)
+
+
+class QueueFullError(Exception):
+    """Raised when the ingestion queue cannot take more events"""
+    pass
+
+
+def _percentile(samples, q: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(int(q * len(ordered)), len(ordered) - 1)]
+
+
+class WebhookQueue:
+    """
+    Acknowledge-then-process ingestion of webhook events.
+
+    submit() dedupes an event by its cast hash and enqueues it, or raises
+    QueueFullError when the queue is full so the webhook can answer with a
+    retryable status instead of timing out. A fixed pool of worker tasks runs
+    the handler, never more than per_agent_concurrency at once for the agent
+    an event is routed to (agent_for returns that agent's name). An event for
+    an agent already at its limit is parked behind that agent's running
+    events, and the worker moves on to the next one. A burst for one agent
+    therefore ties up at most per_agent_concurrency workers.
+    """
+
+    def __init__(
+        self,
+        handler: Callable[[dict], Awaitable[Any]],
+        agent_for: Callable[[dict], Optional[str]],
+        workers: int = DEFAULT_WORKERS,
+        max_queue_size: int = DEFAULT_MAX_QUEUE_SIZE,
+        per_agent_concurrency: int = DEFAULT_PER_AGENT_CONCURRENCY,
+        dedup: Optional[DedupIndex] = None,
+    ):
+        self.handler = handler
+        self.agent_for = agent_for
+        self.workers = workers
+        self.max_queue_size = max_queue_size
+        self.per_agent_concurrency = per_agent_concurrency
+        self.dedup = dedup or DedupIndex()
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks = []
+        self._active: Dict[Optional[str], int] = {}
+        self._parked: Dict[Optional[str], Deque[Tuple[float, dict]]] = {}
+        self._in_flight = 0
+        self._counters = {"received": 0, "duplicates": 0, "rejected": 0, "processed": 0, "failed": 0}
+        self._wait_times: deque = deque(maxlen=LATENCY_SAMPLES)
+        self._process_times: deque = deque(maxlen=LATENCY_SAMPLES)
+
+    async def start(self) -> None:
+        """Start the worker tasks on the running loop"""
+        if self._tasks:
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_queue_size)
+        self._tasks = [
+            asyncio.create_task(self._worker(), name=f"webhook-worker-{i}")
+            for i in range(self.workers)
+        ]
+
+    async def stop(self) -> None:
+        """Cancel the workers; queued events are dropped"""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._active.clear()
+        self._parked.clear()
+
+    def _backlog(self) -> int:
+        return self._queue.qsize() + sum(len(parked) for parked in self._parked.values())
+
+    def submit(self, hook_data: dict) -> bool:
+        """
+        Enqueue an event. Returns False for a duplicate delivery.
+
+        Raises QueueFullError when the queue is at capacity; the event is then
+        not recorded as seen, so a retried delivery is accepted later.
+        """
+        if self._queue is None:
+            raise RuntimeError("Webhook queue is not started")
+        self._counters["received"] += 1
+        cast_hash = hook_data.get("data", {}).get("hash")
+        if cast_hash and not self.dedup.add(cast_hash):
+            self._counters["duplicates"] += 1
+            return False
+        try:
+            # Parked events still count against the capacity
+            if self._backlog() >= self.max_queue_size:
+                raise asyncio.QueueFull
+            self._queue.put_nowait((time.perf_counter(), hook_data))
+        except asyncio.QueueFull:
+            if cast_hash:
+                self.dedup.discard(cast_hash)
+            self._counters["rejected"] += 1
+            raise QueueFullError(f"Webhook queue is full ({self.max_queue_size} events)")
+        return True
+
+    async def _process(self, enqueued_at: float, hook_data: dict) -> None:
+        started = time.perf_counter()
+        self._wait_times.append(started - enqueued_at)
+        self._in_flight += 1
+        try:
+            await self.handler(hook_data)
+            self._counters["processed"] += 1
+        except Exception as e:
+            self._counters["failed"] += 1
+            logger.error(f"Error processing webhook event: {e}")
+        finally:
+            self._in_flight -= 1
+            self._process_times.append(time.perf_counter() - started)
+
+    async def _worker(self) -> None:
+        while True:
+            enqueued_at, hook_data = await self._queue.get()
+            try:
+                try:
+                    agent_name = self.agent_for(hook_data)
+                except Exception:
+                    agent_name = None
+                # No await between the check and the claim, so no other worker can interleave
+                if self._active.get(agent_name, 0) >= self.per_agent_concurrency:
+                    self._parked.setdefault(agent_name, deque()).append((enqueued_at, hook_data))
+                    continue
+                self._active[agent_name] = self._active.get(agent_name, 0) + 1
+                try:
+                    await self._process(enqueued_at, hook_data)
+                    # Keep the slot for events parked for this agent in the meantime, oldest first
+                    parked = self._parked.get(agent_name)
+                    while parked:
+                        await self._process(*parked.popleft())
+                finally:
+                    self._active[agent_name] -= 1
+                    if not self._active[agent_name]:
+                        del self._active[agent_name]
+                        self._parked.pop(agent_name, None)
+            finally:
+                self._queue.task_done()
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue depth, counters and queue-wait / processing latency percentiles (ms)"""
+        return {
+            "queue_depth": self._queue.qsize() if self._queue else 0,
+            "parked": sum(len(parked) for parked in self._parked.values()),
+            "max_queue_size": self.max_queue_size,
+            "in_flight": self._in_flight,
+            "workers": len(self._tasks),
+            "dedup_entries": len(self.dedup),
+            **self._counters,
+            "wait_ms": {
+                "p50": _percentile(self._wait_times, 0.5) * 1000,
+                "p95": _percentile(self._wait_times, 0.95) * 1000,
+            },
+            "processing_ms": {
+                "p50": _percentile(self._process_times, 0.5) * 1000,
+                "p95": _percentile(self._process_times, 0.95) * 1000,
+            },
+        }